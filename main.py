@@ -28,10 +28,19 @@ def parse_args():
         'A sample of class SmartMenu presenting a few of its uses.'
     )
     help_texteditor = (
-        'A text editor with basic functionality.'
+        'A text editor with basic functionality, which opens each PATH given.'
     )
     help_liveplot = (
-        'To display matplotlib plots live, using the terminal for input.'
+        'To display matplotlib plots live, using the terminal for input.  '
+        'BACKEND may be braille or halfblock to plot in the terminal instead.'
+    )
+    help_stream = (
+        'Plots records streamed from SOURCE in LivePlot: `stdin`, the path of '
+        'a CSV/TSV file to follow, `unix:PATH` or `tcp:HOST:PORT`.'
+    )
+    help_export = (
+        'Plots EXPRESSION of x over [-1, 1] with LivePlot, without a display, '
+        'and writes it to each PATH (.png, .svg, .pdf, .txt, .csv, .npy, ...).'
     )
     help_mohrcircle = (
         'Creates a user modifiable stress tensor with a self-updating Mohr '
@@ -62,10 +71,20 @@ def parse_args():
         '--smartmenu', action='store_true', help = help_smartmenu
     )
     parser.add_argument(
-        '--texteditor', action='store_true', help = help_texteditor
+        '--texteditor', nargs = '*', default = None,
+        metavar = 'PATH', help = help_texteditor
+    )
+    parser.add_argument(
+        '--liveplot', nargs = '?', const = 'matplotlib', default = None,
+        choices = ('matplotlib', 'braille', 'halfblock'), metavar = 'BACKEND',
+        help = help_liveplot
     )
     parser.add_argument(
-        '--liveplot', action='store_true', help = help_liveplot
+        '--stream', default = None, metavar = 'SOURCE', help = help_stream
+    )
+    parser.add_argument(
+        '--export', nargs = '+', default = None,
+        metavar = ('EXPRESSION', 'PATH'), help = help_export
     )
     parser.add_argument(
         '--mohrcircle', action='store_true', help = help_mohrcircle
@@ -120,10 +139,6 @@ def procedure_livemenu():
 
 def procedure_smartmenu():
 
-    # btn1 = Button(0, 0, 6, 3, 'Hey how are ya doing?', background = 'red')
-    # print(btn1._text)
-
-    w1 = Widget(10, 10, 15, 50, background = 'white', foreground = 'black')
     text = (
         "We're no strangers to love\n"
         "You know the rules and so do I\n"
@@ -183,24 +198,54 @@ def procedure_smartmenu():
         "Never gonna make you cry"
     )
 
-    w1(text)
-    from time import sleep
-    for i in range(20):
-        w1.write(ellipsis = True)
-        w1.scroll_down()
-        sleep(0.1)
+    smart_menu = SmartMenu(escape_hits = 1)
+    lyrics = smart_menu.new_widget(
+        10, 10, 50, 15, text, background = 'white', foreground = 'black'
+    )
+    status = smart_menu.new_display(10, 17, 50, 19, 'Click a button')
+
+    def scroll(button, btn):
+        if button.text == 'Up':
+            lyrics.scroll_up()
+        else:
+            lyrics.scroll_down()
+        status(f'Clicked `{button.text}`')
 
+    smart_menu.new_button(10, 7, 20, 8, 'Up', on_click = scroll)
+    smart_menu.new_button(22, 7, 32, 8, 'Down', on_click = scroll)
+    smart_menu.start()
+    smart_menu.stop()
 
-def procedure_texteditor():
-    text_editor = TextEditor()
+def procedure_texteditor(paths = None):
+    text_editor = TextEditor(paths)
     text_editor.start()
     text_editor.stop()
 
-def procedure_liveplot():
-    live_plot = LivePlot()
+def stream_source(spec):
+    if spec is None:
+        return None
+    elif spec == 'stdin':
+        return StdinSource()
+    elif spec.startswith('unix:'):
+        return SocketSource(spec[5:])
+    elif spec.startswith('tcp:'):
+        host, port = spec[4:].rsplit(':', 1)
+        return SocketSource((host, int(port)))
+    else:
+        return FileSource(spec)
+
+def procedure_liveplot(backend, source):
+    live_plot = LivePlot(backend = backend, source = source)
     live_plot.start()
     live_plot.stop()
 
+def procedure_export(eqn, paths):
+    live_plot = LivePlot()
+    live_plot.plot(eqn)
+    with PlotExporter() as exporter:
+        for path in paths:
+            live_plot.export(path, exporter)
+
 def procedure_mohrcircle():
     mohr_circle = MohrCircle()
     stress = [
@@ -291,11 +336,14 @@ if args.livemenu is True:
 if args.smartmenu is True:
     procedure_smartmenu()
 
-if args.texteditor is True:
-    procedure_texteditor()
+if args.texteditor is not None:
+    procedure_texteditor(args.texteditor)
+
+if args.liveplot is not None:
+    procedure_liveplot(args.liveplot, stream_source(args.stream))
 
-if args.liveplot is True:
-    procedure_liveplot()
+if args.export is not None:
+    procedure_export(args.export[0], args.export[1:])
 
 if args.mohrcircle is True:
     procedure_mohrcircle()
@@ -1,26 +1,188 @@
 from string import ascii_letters, digits
+from typing import Sequence, Tuple, Union
 import threading
+import re
 import time
 
+from matplotlib.backend_bases import FigureCanvasBase
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+from termutils.utils.expression import compile_expression, free_variables
+from termutils.utils import decimate, raster
 from termutils.obj.LiveMenu import LiveMenu
+from termutils.obj.Blitter import Blitter
+from termutils.obj.Channel import Channel
+from termutils.obj.DataSource import DataSource
+from termutils.obj.PlotExporter import PlotExporter
+from termutils.obj.ParameterSweep import ParameterSweep
 from termutils.obj.String import String
 
+class _Series:
+
+    '''
+        A named series of points plotted by LivePlot, with the subplot it is
+        drawn on, and its data decimated for the views it was drawn in.
+    '''
+
+    __slots__ = (
+        'name', 'subplot', 'points', 'version', 'decimated',
+        'decimated_version'
+    )
+
+    def __init__(self, name:str, subplot:int) -> None:
+        self.name = name
+        self.subplot = subplot
+        # The data, replaced as a whole by `set_points` and never modified in
+        # place, and a counter incremented with each replacement
+        self.points = (np.zeros(0), np.zeros(0))
+        self.version = 0
+        # Decimated data for version `decimated_version` of `points`, by view
+        self.decimated = {}
+        self.decimated_version = None
+
+    def set_points(self, x:np.ndarray, y:np.ndarray) -> None:
+        # Both arrays are replaced at once, so the plot never sees a mix of
+        # old and new data, and then the plot is told that they changed.
+        self.points = (x, y)
+        self.version += 1
+
+    def limits(self) -> Union[Tuple[Tuple[float]], None]:
+        '''
+            Returns the range of x and the range of the finite values of y, or
+            None if there are no such values.
+        '''
+        return raster.data_limits(*self.points)
 
 class LivePlot(LiveMenu):
 
+    # First terminal row (counted from 1) of the plot drawn by the terminal
+    # backends, below the title, buttons and input prompt
+    _terminal_top = 8
+    _terminal_colors = raster.line_colors
+
+    # The series that the function typed in is plotted as
+    _function_series = 'f(x)'
+
+    # Decimation functions by name, and the number of points per pixel column
+    # each is asked for
+    _decimators = {
+        'minmax':(decimate.minmax, 1), 'lttb':(decimate.lttb, 2), None:None
+    }
+
+    # The start, stop and number of values of a free parameter of the
+    # function, such as `a` in `sin(a*x)`, until its range is set with
+    # [animate], the frames per second of animations, and the memory for the
+    # frames of the function (see `obj.ParameterSweep`)
+    _parameter_range = (0, 1, 101)
+    _animation_fps = 30
+    _sweep_memory = 2**27
+    # A range typed into [animate], such as `a from 0 to 2*pi in 50`
+    _range_pattern = re.compile(
+        r'([A-Za-z_]\w*)\s+from\s+(.+?)\s+to\s+(.+?)(?:\s+in\s+(.+))?'
+    )
+
     def __init__(
-    self, rows:int = None, cols:int = None, dt:float = 0.01,
-    tab_len:int = 4) -> None:
+    self, rows:int = None, cols:int = None, dt:float = 0.05,
+    tab_len:int = 4, blit:bool = True,
+    decimation:str = 'minmax', backend:str = 'matplotlib',
+    source:DataSource = None, window:float = 10.0,
+    subplots:Sequence[int] = (1, 1)) -> None:
         '''
-            Creates an instance of LivePlot.
+            Creates an instance of LivePlot.  If `blit` is True, changes to the
+            data that leave the axis limits unchanged only redraw the line (see
+            `obj.Blitter`).
+
+            `decimation` selects how the data is reduced to the points visible
+            at the width of the plot before it is drawn: 'minmax' (which does
+            not change how the line looks), 'lttb', or None to draw every point
+            (see `utils.decimate`).
+
+            `backend` is 'matplotlib' to plot in a figure window, or 'braille'
+            or 'halfblock' to plot in the terminal, below the buttons, with the
+            characters of that name (see `utils.raster`).
+
+            If a `source` is given, it is started and stopped with the plot,
+            which shows the points it streamed in the last `window` seconds
+            (or all the points it holds if `window` is None) in place of the
+            function typed in.
+
+            `subplots` is the number of rows and columns of subplots.  Series
+            are added to them with `add_series`, and the function typed in is
+            plotted as series 'f(x)' on the first.
+
+            Neither the input thread nor the plot thread poll for changes:
+            each sleeps until the other, a data source or a call to `set_data`
+            wakes it (see `obj.Channel`), and functions are evaluated on a
+            worker thread.  While it waits, the plot thread only wakes every
+            `dt` seconds to process the events of the figure window, such as
+            zooming or resizing it.
         '''
+        if decimation not in self._decimators:
+            msg = (
+                f'\n\nArgument `decimation` in the instantiation of <class '
+                f'\'LivePlot\'> must be one of: '
+                f'{", ".join(map(str, self._decimators))}; got `{decimation}`.'
+            )
+            raise ValueError(msg)
+        if backend not in ('matplotlib',) + tuple(raster.cell_shapes):
+            msg = (
+                f'\n\nArgument `backend` in the instantiation of <class '
+                f'\'LivePlot\'> must be one of: matplotlib, '
+                f'{", ".join(raster.cell_shapes)}; got `{backend}`.'
+            )
+            raise ValueError(msg)
+        if len(subplots) != 2 or min(subplots) < 1:
+            msg = (
+                f'\n\nArgument `subplots` in the instantiation of <class '
+                f'\'LivePlot\'> must be a pair of positive integers.'
+            )
+            raise ValueError(msg)
         self._dt = dt
-        self._x_points = []
-        self._y_points = []
+        self._backend = backend
+        self._source = source
+        self._window = window
+        self._source_version = None
+        # The labels, and the data versions of each subplot, last drawn by the
+        # terminal backend
+        self._terminal_labels = None
+        self._terminal_state = {}
+        self._blit = blit
+        self._decimation = decimation
+        self._subplots = tuple(subplots)
+        # Series by name, replaced as a whole when one is added or removed so
+        # that it can be iterated over from any thread, and a counter
+        # incremented with each replacement
+        self._series = {}
+        self._series_version = 0
+        # The series and labels for the plot thread, commands for the input
+        # thread (which draws the terminal backends), and jobs for the worker
+        # thread, see `_publish`, `_apply` and `_submit`
+        self._state = Channel()
+        self._input = Channel()
+        self._jobs = Channel()
+        self._worker = None
+        # The number of the latest evaluation submitted and applied, and the
+        # sweep and frame last plotted or requested from the worker
+        self._evaluation = 0
+        self._evaluated = 0
+        self._shown = None
+        self._requested = None
+        # The values of each free parameter of the function, their names in
+        # the order of the axes of the grid, the function evaluated over all
+        # of them, the index of the value of each that is
+        # plotted, the parameter moved by the arrow keys, and the parameter
+        # animated, if any, since `_animation_start`
+        self._parameters = {}
+        self._axes = ()
+        self._sweep = None
+        self._frame = {}
+        self._selected = None
+        self._animated = None
+        self._animation_start = 0.0
+        # The parameters and their values last printed
+        self._parameter_status = None
         self._marker = '-'
         self._active_plot = False
         self._grid = True
@@ -28,8 +190,106 @@ class LivePlot(LiveMenu):
         self._ylabel = ''
         self._title = ''
         self._tab_len = 4
+        self.add_series(self._function_series)
+        if source is not None:
+            source.set_callback(self._input.notify)
         super().__init__(rows, cols)
 
+    @property
+    def series(self) -> Tuple[str]:
+        '''
+            Returns the names of the plotted series.
+        '''
+        return tuple(self._series)
+
+    def add_series(self, name:str, subplot:int = 0) -> None:
+        '''
+            Adds an empty series called `name`, drawn on the given subplot
+            (counted row by row from 0).  Its data is set with `set_data`.
+        '''
+        if name in self._series:
+            msg = f'\n\nLivePlot already has a series called `{name}`.'
+            raise ValueError(msg)
+        if not 0 <= subplot < self._subplots[0]*self._subplots[1]:
+            msg = (
+                f'\n\nArgument `subplot` in method `add_series` must be '
+                f'between 0 and {self._subplots[0]*self._subplots[1] - 1}.'
+            )
+            raise ValueError(msg)
+        self._series = {**self._series, name:_Series(name, subplot)}
+        self._series_version += 1
+        self._changed()
+
+    def remove_series(self, name:str) -> None:
+        '''
+            Removes the series called `name`.
+        '''
+        if name not in self._series:
+            msg = f'\n\nLivePlot has no series called `{name}`.'
+            raise ValueError(msg)
+        series = dict(self._series)
+        del series[name]
+        self._series = series
+        self._series_version += 1
+        self._changed()
+
+    def set_data(self, name:str, x:np.ndarray, y:np.ndarray) -> None:
+        '''
+            Replaces the data of the series called `name` with arrays `x` and
+            `y`, which are not copied, and must not be modified afterwards.
+            May be called from any thread; changes made between two frames
+            are drawn together.
+        '''
+        if name not in self._series:
+            msg = f'\n\nLivePlot has no series called `{name}`.'
+            raise ValueError(msg)
+        x = np.asarray(x, dtype = np.float64)
+        y = np.asarray(y, dtype = np.float64)
+        if x.shape != y.shape or x.ndim != 1:
+            msg = (
+                f'\n\nArguments `x` and `y` in method `set_data` must be '
+                f'one-dimensional arrays of the same length.'
+            )
+            raise ValueError(msg)
+        self._series[name].set_points(x, y)
+        self._changed()
+
+    def plot(
+    self, eqn:str, domain:Sequence[float] = (-1, 1), steps:int = 1000,
+    name:str = None) -> None:
+        '''
+            Plots expression `eqn` of `x` over `steps` points spanning
+            `domain`, as series `name` (the function series if None).  Like
+            `set_data` and `export`, works without `start`, so that plots can
+            be made and exported without a display.
+        '''
+        x = np.linspace(*domain, int(steps))
+        y = compile_expression(eqn)(x)
+        self.set_data(self._function_series if name is None else name, x, y)
+
+    def export(self, path:str, exporter:PlotExporter = None) -> None:
+        '''
+            Writes every series that has data to `path`, with the labels, grid
+            and subplots of the plot (see `obj.PlotExporter` for the formats).
+            Unless an `exporter` is given, a new one is made and waited for;
+            to export many frames, pass the same exporter to each call, which
+            reuses its figure and writes files in the background.
+        '''
+        if exporter is None:
+            if self._backend == 'matplotlib':
+                mode = 'braille'
+            else:
+                mode = self._backend
+            exporter = PlotExporter(subplots = self._subplots, text_mode = mode)
+            with exporter:
+                self.export(path, exporter)
+            return
+        exporter.set_labels(self._title, self._xlabel, self._ylabel, self._grid)
+        exporter.export(path, {
+            name:(*entry.points, entry.subplot)
+            for name, entry in self._series.items() if len(entry.points[0])
+        })
+
     def __call__(self) -> None:
         '''
             Creates a matplotlib plot that can be modified live, by accepting
@@ -57,6 +317,7 @@ class LivePlot(LiveMenu):
         btn_5_text = '[xlabel]'
         btn_6_text = '[ylabel]'
         btn_7_text = '[grid]'
+        btn_8_text = '[animate]'
 
         color_b = 'white'
         color_0 = 'dark slate gray'
@@ -67,6 +328,7 @@ class LivePlot(LiveMenu):
         color_5 = 'space cadet'
         color_6 = 'navy blue'
         color_7 = 'midnight blue'
+        color_8 = 'dark slate blue'
 
         btn_1_pos = (1, len(btn_1_text) + 2)
         btn_2_pos = (
@@ -85,6 +347,9 @@ class LivePlot(LiveMenu):
         btn_7_pos = (
             btn_6_pos[1], btn_6_pos[1] + len(btn_7_text) + 2
         )
+        btn_8_pos = (
+            btn_7_pos[1], btn_7_pos[1] + len(btn_8_text) + 2
+        )
 
         btn_1_out = String(
             f' {btn_1_text} ', foreground = color_b, background = color_1,
@@ -114,10 +379,14 @@ class LivePlot(LiveMenu):
             f' {btn_7_text} ', foreground = color_b, background = color_7,
             style = 'bold'
         )
+        btn_8_out = String(
+            f' {btn_8_text} ', foreground = color_b, background = color_8,
+            style = 'bold'
+        )
 
         btn_list = [
             str(btn_1_out), str(btn_2_out), str(btn_3_out), str(btn_5_out),
-            str(btn_6_out), str(btn_7_out)
+            str(btn_6_out), str(btn_7_out), str(btn_8_out)
         ]
 
         title = String(
@@ -149,11 +418,15 @@ class LivePlot(LiveMenu):
         btn_7_out_down = String(
             f' {btn_7_text} ', foreground = color_7, background = color_b,
         )
+        btn_8_out_down = String(
+            f' {btn_8_text} ', foreground = color_8, background = color_b,
+        )
 
         btn_4_spaces = self._dims[1] - 1 - sum(
             (
                 len(btn_1_out), len(btn_2_out), len(btn_3_out), len(btn_4_out),
-                len(btn_5_out), len(btn_6_out), len(btn_7_out)
+                len(btn_5_out), len(btn_6_out), len(btn_7_out),
+                len(btn_8_out)
             )
         )
 
@@ -161,6 +434,7 @@ class LivePlot(LiveMenu):
         valid_inputs_1 = list(ascii_letters + digits) + oper
         valid_inputs_2 = list(digits) + [',', '.', '-', '+', 'E', 'e', 'Space']
         valid_inputs_3 = list(digits) + ['.', '-', '+', 'E', 'e']
+        valid_inputs_7 = valid_inputs_1 + [',']
         disp_str = (
             f'{title}{"".join(btn_list)}'
         )
@@ -171,8 +445,11 @@ class LivePlot(LiveMenu):
 
         eqn = ''
         lims = f'{x[0]:g}, {x[-1]:g}'
+        animation = ''
+        # True when the screen was cleared, and the plot must be drawn again
+        printed = True
 
-        while active:
+        while active and not self._kill:
 
             if key_idx <= len(self._key_history) - 1 or \
                btn_idx <= len(self._btn_history) - 1:
@@ -185,6 +462,10 @@ class LivePlot(LiveMenu):
                         self._kill = True
                         active = False
                         break
+                    elif key in ('Left', 'Right') and self._axes:
+                        self._step_parameter(1 if key == 'Right' else -1)
+                    elif key in ('Up', 'Down') and self._axes:
+                        self._select_parameter(1 if key == 'Down' else -1)
                     elif mode == 1:
                         str_in, limval, steps, eqn, x =\
                         self._mode_1(
@@ -192,16 +473,16 @@ class LivePlot(LiveMenu):
                         )
 
                     elif mode == 2:
-                        str_in, limval, steps, eqn =\
+                        str_in, limval, lims, steps, eqn, x =\
                         self._mode_2(
-                            key, valid_inputs_2, str_in, limval, steps, eqn
+                            key, valid_inputs_2, str_in, limval, lims, steps,
+                            eqn, x
                         )
 
                     elif mode == 3:
-                        str_in, limval, lims, steps, eqn, x, y =\
+                        str_in, limval, steps, eqn, x =\
                         self._mode_3(
-                            key, valid_inputs_3, str_in, limval, lims, steps,
-                            eqn, self._x_points, self._y_points
+                            key, valid_inputs_3, str_in, limval, steps, eqn, x
                         )
 
                     elif mode == 5:
@@ -212,6 +493,12 @@ class LivePlot(LiveMenu):
                         str_in, ylabel =\
                         self._mode_6(key, str_in, ylabel)
 
+                    elif mode == 7:
+                        str_in, animation =\
+                        self._mode_7(
+                            key, valid_inputs_7, str_in, animation, eqn, x
+                        )
+
                     key_idx += 1
 
                 while btn_idx <= len(self._btn_history) - 1:
@@ -294,10 +581,22 @@ class LivePlot(LiveMenu):
                             )
                             self._grid = not self._grid
 
+                        elif btn_8_pos[0] <= btn["x"] <= btn_8_pos[1]:
+                            btn_list[6] = str(btn_8_out_down)
+                            disp_str = (
+                                f'{title}{"".join(btn_list)}{" "*btn_4_spaces}'
+                                f'{str(btn_4_out)}'
+                            )
+                            mode = 7
+                            str_in = list(animation)
+                            print('\033[?25h', end = '', flush = True)
+                            print('\033[5 q', end = '', flush = True)
+
                     elif btn["action"] == 'MouseUp':
                         btn_list = [
                             str(btn_1_out), str(btn_2_out), str(btn_3_out),
-                            str(btn_5_out), str(btn_6_out), str(btn_7_out)
+                            str(btn_5_out), str(btn_6_out), str(btn_7_out),
+                            str(btn_8_out)
                         ]
                         disp_str = (
                             f'{title}{"".join(btn_list)}'
@@ -356,10 +655,42 @@ class LivePlot(LiveMenu):
                     text_str = (
                         f'\033[2J\033[3J\033[f{disp_str}\n\n\r {msg}\b\b'
                     )
+                elif mode == 7:
+                    msg = String(
+                        ' animate: ' + "".join(str_in) + ' ',
+                        foreground = color_b, background = color_8,
+                        style = 'bold'
+                    )
+                    text_str = (
+                        f'\033[2J\033[3J\033[f{disp_str}\n\n\r {msg}\b'
+                    )
                 print(text_str, end = '', flush = True)
+                printed = True
+
+            if self._source is not None:
+                self._poll_source()
 
-            time.sleep(self._dt)
+            if self._animated is not None:
+                self._animate()
+            self._draw_parameters(printed)
 
+            if self._backend != 'matplotlib':
+                self._draw_terminal(printed)
+            printed = False
+            self._publish()
+
+            # Sleeps until there is input, data from the source, a result from
+            # the worker or a new series, or the next frame of an animation
+            if key_idx == len(self._key_history) and \
+               btn_idx == len(self._btn_history):
+                self._input.wait(self._frame_delay())
+            for command in self._input.receive():
+                self._apply(*command)
+
+        # Lets the plot and worker threads see that the session ended
+        self._kill = True
+        self._state.notify()
+        self._jobs.notify()
         print('\033[?25h', end = '', flush = True)
         print('\033[1 q', end = '', flush = True)
 
@@ -367,6 +698,23 @@ class LivePlot(LiveMenu):
         '''
             Activates the LiveMenu session.
         '''
+        if self._source is not None:
+            self._source.start()
+        try:
+            self._start()
+        finally:
+            if self._source is not None:
+                self._source.stop()
+
+    def _start(self) -> None:
+        '''
+            Runs the session for `start`, with the source already started.
+        '''
+        if self._backend != 'matplotlib':
+            # The plot is drawn by the writer thread, see `_draw_terminal`
+            LiveMenu.start(self)
+            return
+
         sns.set_theme()
 
         if self.__class__._active:
@@ -386,20 +734,34 @@ class LivePlot(LiveMenu):
         self._raw(True)
 
         fig = plt.figure()
-        fignum = fig.number
-        ax = fig.add_subplot(111)
-        line, = ax.plot(self._x_points, self._y_points)
-        active = True
+        n_rows, n_cols = self._subplots
+        axes = [
+            fig.add_subplot(n_rows, n_cols, n + 1)
+            for n in range(n_rows*n_cols)
+        ]
+        blitter = Blitter(fig, []) if self._blit else None
         self._active_plot = True
         fig.canvas.mpl_connect('close_event', self._inactivate_plot)
-        fig.canvas.draw()
-
-        x_points = self._x_points.copy()
-        y_points = self._y_points.copy()
-        xlabel = self._xlabel
-        ylabel = self._ylabel
-        title = self._title
-        grid = self._grid
+        # Zooming, panning and resizing change what must be drawn
+        fig.canvas.mpl_connect('resize_event', self._wake_plot)
+        for ax in axes:
+            ax.callbacks.connect('xlim_changed', self._wake_plot)
+        # Canvases that do not process events, such as Agg's, need no waking
+        # up to do so
+        if type(fig.canvas).flush_events is FigureCanvasBase.flush_events:
+            interval = None
+        else:
+            interval = self._dt
+        plt.show(block = False)
+
+        # What was last drawn: the line of each series, the version of the
+        # list of series, the data version of each series, the view of each
+        # axes (see `_view`), and the labels
+        lines = {}
+        series_version = None
+        versions = {}
+        views = [None]*len(axes)
+        labels = None
 
         try:
             print(f'\033[2J\033[3J\033[f', end = '', flush = True)
@@ -407,32 +769,66 @@ class LivePlot(LiveMenu):
             t_writer.start()
 
             while self._active_plot and not self._kill:
-                if x_points != self._x_points or y_points != self._y_points:
-
-                    x_points = self._x_points.copy()
-                    y_points = self._y_points.copy()
-
-                    line.set_data(x_points, y_points)
-
-                    ax.relim()
-                    ax.set_xlim(np.min(self._x_points), np.max(self._x_points))
-                    ax.autoscale_view(True,True,True)
+                # Every change since the last frame is drawn at once, with a
+                # full draw only if the limits, labels or series changed
+                full = False
+                blit = False
+                changed = set()
+                series, new_series_version, new_labels = self._state.snapshot
+
+                if series_version != new_series_version:
+                    series_version = new_series_version
+                    self._sync_lines(axes, lines, series, blitter)
+                    changed.update(range(len(axes)))
+                    full = True
+
+                for name, entry in series.items():
+                    if versions.get(name) != entry.version:
+                        versions[name] = entry.version
+                        changed.add(entry.subplot)
+
+                for index, ax in enumerate(axes):
+                    if index in changed:
+                        limits = self._update_axes(ax, index, lines, series)
+                        views[index] = limits[0]
+                        full = full or limits[1]
+                        blit = True
+                    elif self._decimation is not None and \
+                    views[index] is not None and \
+                    views[index] != self._view(ax, ax.get_xlim()):
+                        # Zoomed, panned or resized from the figure window
+                        views[index] = self._view(ax, ax.get_xlim())
+                        for entry in series.values():
+                            if entry.subplot == index:
+                                lines[entry.name].set_data(
+                                    *self._decimate(entry, views[index])
+                                )
+                        blit = True
+
+                if labels != new_labels:
+                    labels = new_labels
+                    xlabel, ylabel, title, grid = labels
+                    for ax in axes:
+                        ax.grid(grid)
+                        ax.set_xlabel(xlabel)
+                        ax.set_ylabel(ylabel)
+                    if len(axes) == 1:
+                        axes[0].set_title(title)
+                    else:
+                        fig.suptitle(title)
+                    full = True
+
+                if full or (blit and blitter is None):
                     fig.canvas.draw()
-
-                if xlabel != self._xlabel or ylabel != self._ylabel or \
-                title != self._title or grid != self._grid:
-
-                    xlabel = self._xlabel
-                    ylabel = self._ylabel
-                    title = self._title
-                    grid = self._grid
-                    ax.grid(grid)
-                    ax.set_xlabel(xlabel)
-                    ax.set_ylabel(ylabel)
-                    ax.set_title(title)
-                    fig.canvas.draw()
-
-                plt.pause(self._dt)
+                elif blit:
+                    blitter.update()
+
+                # Sleeps until the state changes, processing the events of
+                # the figure every `interval` seconds.  Unlike `plt.pause`,
+                # this does not redraw a stale figure, so that blitted updates
+                # are not followed by a full redraw
+                self._state.wait(interval)
+                fig.canvas.flush_events()
             t_listener.join()
             t_writer.join()
         except Exception as e:
@@ -446,9 +842,482 @@ class LivePlot(LiveMenu):
         except:
             pass
 
-    def _inactivate_plot(self):
+    def _inactivate_plot(self, event = None):
         self._active_plot = False
         self._kill = True
+        self._input.notify()
+        self._state.notify()
+
+    def _wake_plot(self, event = None) -> None:
+        '''
+            Wakes the plot thread, to redraw after an event of the figure.
+        '''
+        self._state.notify()
+
+    def _on_input(self) -> None:
+        '''
+            Wakes the input thread when a key or button is pressed.
+        '''
+        self._input.notify()
+
+    def _publish(self) -> None:
+        '''
+            Publishes the series and labels to the plot thread as a single
+            snapshot, which it draws without reading them one at a time while
+            they may change.
+        '''
+        labels = (self._xlabel, self._ylabel, self._title, self._grid)
+        self._state.publish((self._series, self._series_version, labels))
+
+    def _changed(self) -> None:
+        '''
+            Publishes the series to the plot thread, and wakes the input
+            thread, which draws them with the terminal backends.
+        '''
+        self._publish()
+        self._input.notify()
+
+    def _submit(self, kind:str, tag, job) -> None:
+        '''
+            Runs `job` on the worker thread, in place of any job of the same
+            `kind` that has not started yet, and sends (`kind`, `tag`, result)
+            to the input thread, where it is passed to `_apply`.  The result
+            is the exception raised, if `job` fails.
+        '''
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target = self._work, daemon = True)
+            self._worker.start()
+        self._jobs.send((kind, tag, job))
+
+    def _work(self) -> None:
+        '''
+            Runs the jobs of `_submit` until the session ends.
+        '''
+        while not self._kill:
+            self._jobs.wait()
+            # Only the latest job of each kind is run, in submission order
+            jobs = {}
+            for kind, tag, job in self._jobs.receive():
+                jobs.pop(kind, None)
+                jobs[kind] = (tag, job)
+            for kind, (tag, job) in jobs.items():
+                try:
+                    result = job()
+                except Exception as e:
+                    result = e
+                self._input.send((kind, tag, result))
+
+    def _apply(self, kind:str, tag, result) -> None:
+        '''
+            Plots the `result` of a job of the worker, unless it is outdated.
+        '''
+        if kind == 'evaluate':
+            if tag != self._evaluation:
+                return
+            self._evaluated = tag
+            if isinstance(result, Exception):
+                return
+            x, y, sweep = result
+            self._sweep = sweep
+            self._shown = None
+            if sweep is None:
+                self._set_points(x, y)
+            else:
+                self._show_frame()
+        elif kind == 'frame':
+            if tag == self._requested:
+                self._requested = None
+            if isinstance(result, Exception):
+                return
+            if tag[0] is self._sweep:
+                self._set_points(tag[0].x, result)
+                self._shown = tag
+            self._show_frame()
+
+    def _frame_delay(self) -> Union[float, None]:
+        '''
+            Returns the time until the next frame of the animation, or None if
+            no parameter is animated.
+        '''
+        if self._animated is None or self._animated not in self._axes:
+            return None
+        period = 1/self._animation_fps
+        return period - (time.monotonic() - self._animation_start) % period
+
+    def _set_points(self, x:np.ndarray, y:np.ndarray) -> None:
+        '''
+            Replaces the data of the function series with arrays `x` and `y`,
+            which are not copied, and must not be modified afterwards.
+        '''
+        self._series[self._function_series].set_points(x, y)
+
+    def _sync_lines(self, axes, lines, series, blitter) -> None:
+        '''
+            Adds a line to `lines` for each new series in `series`, removes the
+            lines of removed series, and shows a legend on every axes that has
+            more than one series.
+        '''
+        for name in [name for name in lines if name not in series]:
+            line = lines.pop(name)
+            if blitter is not None:
+                blitter.remove(line)
+            line.remove()
+        for name, entry in series.items():
+            if name not in lines:
+                lines[name], = axes[entry.subplot].plot([], [], label = name)
+                if blitter is not None:
+                    blitter.add(lines[name])
+        for index, ax in enumerate(axes):
+            if ax.get_legend() is not None:
+                ax.get_legend().remove()
+            if sum(entry.subplot == index for entry in series.values()) > 1:
+                ax.legend()
+
+    def _update_axes(self, ax, index, lines, series) -> tuple:
+        '''
+            Draws the current data of the series on subplot `index` into their
+            lines, and fits the limits of `ax` to it.  Returns the view the
+            data was decimated for, and whether the limits changed.
+        '''
+        members = [entry for entry in series.values() if entry.subplot == index]
+        limits = [entry.limits() for entry in members]
+        limits = [limit for limit in limits if limit is not None]
+        if not limits:
+            for entry in members:
+                lines[entry.name].set_data(*entry.points)
+            return None, False
+        xlim = (
+            min(limit[0][0] for limit in limits),
+            max(limit[0][1] for limit in limits)
+        )
+
+        view = self._view(ax, xlim)
+        for entry in members:
+            lines[entry.name].set_data(*self._decimate(entry, view))
+
+        before = (ax.get_xlim(), ax.get_ylim())
+        ax.relim()
+        ax.set_xlim(*xlim)
+        ax.autoscale_view(True,True,True)
+        return view, before != (ax.get_xlim(), ax.get_ylim())
+
+    def _view(self, ax, xlim) -> tuple:
+        '''
+            Returns the x-range `xlim` and the width in pixels of `ax`, which
+            together decide how the data is decimated.
+        '''
+        width = ax.get_window_extent().width*ax.figure.canvas.device_pixel_ratio
+        return tuple(float(i) for i in xlim), max(int(width), 1)
+
+    def _decimate(self, series:_Series, view:tuple) -> tuple:
+        '''
+            Returns the data of `series` to draw for `view` (see `_view`),
+            reduced to the points that can be told apart at its width.  Results
+            are cached by view until the data is replaced, so returning to an
+            earlier zoom level costs nothing.
+        '''
+        # The version is read first, so that if the data is replaced in
+        # between, the result is cached under the older version
+        version = series.version
+        x_points, y_points = series.points
+        if self._decimation is None:
+            return x_points, y_points
+        if series.decimated_version != version:
+            series.decimated = {}
+            series.decimated_version = version
+        if view not in series.decimated:
+            if len(series.decimated) >= 16:
+                del series.decimated[next(iter(series.decimated))]
+            function, per_pixel = self._decimators[self._decimation]
+            xlim, width = view
+            series.decimated[view] = \
+            function(x_points, y_points, xlim, per_pixel*width)
+        return series.decimated[view]
+
+    def _poll_source(self) -> None:
+        '''
+            Plots the latest points of the source, if it has appended any
+            since it was last polled.
+        '''
+        buffer = self._source.buffer
+        version = buffer.version
+        if version != self._source_version:
+            self._source_version = version
+            x, y = buffer.window(self._window)
+            if len(x):
+                self._set_points(x, y)
+
+    def _draw_terminal(self, redraw:bool) -> None:
+        '''
+            Draws the plot in the terminal below the input prompt.  Only the
+            subplots whose data changed since they were last drawn are drawn
+            again, unless the labels, grid or series changed, or `redraw` is
+            True because the screen was cleared.  The cursor is left where it
+            was, so that input is unaffected.
+        '''
+        top = self._terminal_top
+        rows = self.rows - top + 1
+        series = self._series
+        labels = (
+            self._xlabel, self._ylabel, self._title, self._grid, self._dims,
+            self._series_version
+        )
+        out = []
+        if redraw or labels != self._terminal_labels:
+            self._terminal_labels = labels
+            self._terminal_state = {}
+            out.append(f'\033[{top};1H\033[J')
+
+        n_rows, n_cols = self._subplots
+        title = self._title
+        if n_rows*n_cols > 1 and title:
+            # Shown once above every subplot, like `fig.suptitle`
+            if not self._terminal_state:
+                title = title[:self.cols].center(self.cols)
+                out.append(f'\033[{top};1H{title}')
+            title = ''
+            top += 1
+            rows -= 1
+        height = rows//n_rows
+        width = self.cols//n_cols
+
+        if height >= 4 and width >= 8:
+            colors = {
+                name:self._terminal_colors[n % len(self._terminal_colors)]
+                for n, name in enumerate(series)
+            }
+            for index in range(n_rows*n_cols):
+                members = [
+                    entry for entry in series.values() if entry.subplot == index
+                ]
+                state = tuple(entry.version for entry in members)
+                if self._terminal_state.get(index) == state:
+                    continue
+                self._terminal_state[index] = state
+                lines = self._render_subplot(
+                    members, colors, height, width, title
+                )
+                row = top + (index//n_cols)*height
+                col = 1 + (index % n_cols)*width
+                out.extend(
+                    f'\033[{row+n};{col}H{line}' for n, line in enumerate(lines)
+                )
+
+        if out:
+            # Saves and restores the cursor, which may be in the input prompt
+            print(f'\0337{"".join(out)}\0338', end = '', flush = True)
+
+    def _render_subplot(
+    self, members:Sequence[_Series], colors:dict, rows:int, cols:int,
+    title:str) -> list:
+        '''
+            Returns the lines of text that display the series in `members` on
+            the terminal, in `rows` rows of `cols` columns.
+        '''
+        limits = [entry.limits() for entry in members]
+        limits = raster.autoscale([limit for limit in limits if limit])
+        if limits is None:
+            return [' '*cols]*rows
+        xlim, ylim = limits
+
+        width = raster.plot_area(
+            rows, cols, ylim, title, self._xlabel, self._ylabel
+        )[3]
+        sub_cols = raster.cell_shapes[self._backend][0]*max(width, 1)
+        view = (raster.subpixel_range(xlim, sub_cols), sub_cols)
+        data = [
+            (*self._decimate(entry, view), colors[entry.name])
+            for entry in members
+        ]
+        return raster.render(
+            data, xlim, ylim, rows, cols, mode = self._backend, title = title,
+            xlabel = self._xlabel, ylabel = self._ylabel, grid = self._grid
+        )
+
+    def _evaluate(self, eqn:str, x:np.ndarray) -> None:
+        '''
+            Plots expression `eqn` over the points `x`.  The expression is only
+            compiled the first time it is seen (see `compile_expression`), so
+            changing the domain or steps reuses it.
+
+            If `eqn` has free parameters, it is evaluated for all of their
+            values at once (see `obj.ParameterSweep`), and the frame for the
+            values selected is plotted, so that moving or animating the
+            parameters only indexes the frames.
+
+            The expression is checked here, raising a ValueError if it is not
+            valid, but evaluated on the worker thread, so that neither the
+            input nor the plot wait for it.
+        '''
+        if not eqn:
+            return
+        names = free_variables(eqn)
+        # The animated parameter is the last axis of the grid, so that its
+        # frames are adjacent in memory
+        axes = tuple(sorted(names, key = lambda name: name == self._animated))
+        function = compile_expression(eqn, ('x',) + axes)
+
+        for name in names:
+            if name not in self._parameters:
+                start, stop, steps = self._parameter_range
+                self._parameters[name] = np.linspace(start, stop, steps)
+            values = self._parameters[name]
+            if self._frame.get(name, len(values)) >= len(values):
+                # The value closest to 1, so that `sin(a*x)` starts as sin(x)
+                self._frame[name] = int(np.argmin(np.abs(values - 1)))
+        self._axes = axes
+        if self._selected not in names:
+            self._selected = names[0] if names else None
+
+        if not names:
+            job = lambda: (x, function(x), None)
+        else:
+            parameters = {name:self._parameters[name] for name in axes}
+            index = [self._frame[name] for name in axes]
+            memory = self._sweep_memory
+            def job():
+                sweep = ParameterSweep(eqn, x, parameters, memory)
+                # Evaluates the frames around the selected values
+                sweep.frame(index)
+                return x, None, sweep
+        self._evaluation += 1
+        self._submit('evaluate', self._evaluation, job)
+
+    def _show_frame(self) -> None:
+        '''
+            Plots the frame of the function for the selected parameter values,
+            or has the worker evaluate it if it is not yet.
+        '''
+        sweep = self._sweep
+        if sweep is None or self._evaluated != self._evaluation:
+            return
+        tag = (sweep, tuple(self._frame[name] for name in sweep.values))
+        if self._shown == tag:
+            return
+        if sweep.ready(tag[1]):
+            self._set_points(sweep.x, sweep.frame(tag[1]))
+            self._shown = tag
+        elif self._requested is None:
+            self._requested = tag
+            self._submit('frame', tag, lambda: sweep.frame(tag[1]))
+
+    def _step_parameter(self, step:int) -> None:
+        '''
+            Moves the selected parameter `step` values along its range, and
+            stops animating it.
+        '''
+        name = self._selected
+        if name == self._animated:
+            self._animated = None
+        last = len(self._parameters[name]) - 1
+        self._frame[name] = min(max(self._frame[name] + step, 0), last)
+        self._show_frame()
+
+    def _select_parameter(self, step:int) -> None:
+        '''
+            Selects the parameter `step` places after the selected one.
+        '''
+        index = self._axes.index(self._selected) + step
+        self._selected = self._axes[index % len(self._axes)]
+
+    def _animate(self) -> None:
+        '''
+            Plots the frame that the animated parameter has reached, cycling
+            through its values at `_animation_fps` frames per second.
+        '''
+        name = self._animated
+        if name not in self._axes:
+            return
+        elapsed = time.monotonic() - self._animation_start
+        index = int(elapsed*self._animation_fps) % len(self._parameters[name])
+        if index != self._frame[name]:
+            self._frame[name] = index
+            self._show_frame()
+
+    def _set_animation(self, text:str, eqn:str, x:np.ndarray) -> None:
+        '''
+            Sets the ranges of the parameters in `text`, separated by commas,
+            such as `a from 0 to 10` or `a from 0 to 2*pi in 50`, evaluates
+            `eqn` over them, and animates the first.  Stops the animation if
+            `text` is empty.
+        '''
+        ranges = {}
+        for clause in text.split(','):
+            if not clause.strip():
+                continue
+            match = self._range_pattern.fullmatch(clause.strip())
+            if match is None:
+                msg = (
+                    f'\n\nExpected `NAME from START to STOP` or `NAME from '
+                    f'START to STOP in STEPS`; got `{clause.strip()}`.'
+                )
+                raise ValueError(msg)
+            name, start, stop, steps = match.groups()
+            if steps is None:
+                steps = self._parameter_range[2]
+            else:
+                steps = self._constant(steps)
+                if int(steps) != steps or steps < 2:
+                    msg = (
+                        f'\n\nThe number of values of parameter `{name}` '
+                        f'must be an integer greater than 1.'
+                    )
+                    raise ValueError(msg)
+            ranges[name] = np.linspace(
+                self._constant(start), self._constant(stop), int(steps)
+            )
+        if not ranges:
+            self._animated = None
+            return
+
+        state = dict(self._parameters), dict(self._frame), self._animated
+        self._parameters.update(ranges)
+        for name in ranges:
+            self._frame.pop(name, None)
+        self._animated = next(iter(ranges))
+        try:
+            self._evaluate(eqn, x)
+        except Exception:
+            self._parameters, self._frame, self._animated = state
+            raise
+        self._selected = self._animated
+        self._animation_start = time.monotonic()
+
+    def _draw_parameters(self, redraw:bool) -> None:
+        '''
+            Prints the values of the parameters of the function on the line
+            above the plot, when they change or if `redraw` is True.
+        '''
+        status = None
+        if self._axes:
+            status = tuple(
+                (name, self._frame[name]) for name in self._axes
+            ) + (self._selected, self._animated)
+        if status == self._parameter_status and not redraw:
+            return
+        self._parameter_status = status
+
+        out = []
+        if status is not None:
+            for name in self._axes:
+                value = self._parameters[name][self._frame[name]]
+                text = f' {name} = {value:.6g} '
+                if name == self._animated:
+                    text += '▶ '
+                if name == self._selected:
+                    text = str(String(text, style = 'bold'))
+                out.append(text)
+        line = self._terminal_top - 1
+        print(
+            f'\0337\033[{line};1H\033[2K{"".join(out)}\0338', end = '',
+            flush = True
+        )
+
+    def _constant(self, text:str) -> float:
+        '''
+            Evaluates an expression containing no variables, such as `2*pi`.
+        '''
+        return compile_expression(text, ())()
 
     def _mode_1(self, key, valid_inputs, str_in, limval, steps, eqn, x):
         if key in valid_inputs:
@@ -458,14 +1327,7 @@ class LivePlot(LiveMenu):
         elif key == 'Enter':
             try:
                 temp_eqn = ''.join(str_in)
-                y = list(eval(temp_eqn, {'np':np}, {'x':x}))
-                if isinstance(y, (int, float)):
-                    y = [y,]
-                elif isinstance(y, np.ndarray):
-                    y = list(y)
-                if len(y) == len(x):
-                    self._x_points, self._y_points =\
-                    list(x), y.copy()
+                self._evaluate(temp_eqn, x)
                 eqn = temp_eqn
             except Exception as e:
                 pass
@@ -474,7 +1336,7 @@ class LivePlot(LiveMenu):
                 str_in = str_in[:-1]
         return str_in, limval, steps, eqn, x
 
-    def _mode_2(self, key, valid_inputs, str_in, limval, steps, eqn):
+    def _mode_2(self, key, valid_inputs, str_in, limval, lims, steps, eqn, x):
         if key in valid_inputs:
             if key == 'Space':
                 key = ' '
@@ -482,27 +1344,22 @@ class LivePlot(LiveMenu):
         elif key == 'Enter':
             try:
                 temp_lims = ''.join(str_in)
-                limval = eval(f'({temp_lims})', {'np':np}, {})
-                assert isinstance(limval, tuple)
-                assert len(limval) == 2
-                assert isinstance(limval[0], (int, float))
-                assert isinstance(limval[1], (int, float))
-                stepval = eval(steps, {'np':np}, {})
-                x = np.linspace(limval[0], limval[1], int(stepval))
-                y = list(eval(eqn, {'np':np}, {'x':x}))
-                if len(y) == len(x):
-                    self._x_points, self._y_points =\
-                    list(x), y.copy()
-                lims = temp_lims
+                temp_limval = tuple(
+                    self._constant(i) for i in temp_lims.split(',')
+                )
+                assert len(temp_limval) == 2
+                stepval = self._constant(steps)
+                temp_x = np.linspace(*temp_limval, int(stepval))
+                self._evaluate(eqn, temp_x)
+                limval, lims, x = temp_limval, temp_lims, temp_x
             except Exception as e:
                 pass
         elif key == 'Backspace':
             if str_in:
                 str_in = str_in[:-1]
-        return str_in, limval, steps, eqn
+        return str_in, limval, lims, steps, eqn, x
 
-    def _mode_3(
-    self, key, valid_inputs, str_in, limval, lims, steps, eqn, x, y):
+    def _mode_3(self, key, valid_inputs, str_in, limval, steps, eqn, x):
         if key in valid_inputs:
             if key == 'Space':
                 key = ' '
@@ -510,25 +1367,18 @@ class LivePlot(LiveMenu):
         elif key == 'Enter':
             try:
                 temp_steps = ''.join(str_in)
-                stepval = eval(temp_steps, {'np':np}, {})
-                assert isinstance(stepval, (int, float))
+                stepval = self._constant(temp_steps)
                 assert int(stepval) == stepval
                 assert stepval > 1
-                limval = eval(f'({lims})', {'np':np}, {})
-                x = np.linspace(
-                    limval[0], limval[1], int(stepval)
-                )
-                y = list(eval(eqn, {'np':np}, {'x':x}))
-                if len(y) == len(x):
-                    self._x_points, self._y_points =\
-                    list(x), y.copy()
-                steps = temp_steps
+                temp_x = np.linspace(*limval, int(stepval))
+                self._evaluate(eqn, temp_x)
+                steps, x = temp_steps, temp_x
             except Exception as e:
                 pass
         elif key == 'Backspace':
             if str_in:
                 str_in = str_in[:-1]
-        return str_in, limval, lims, steps, eqn, x, y
+        return str_in, limval, steps, eqn, x
 
     def _mode_5(self, key, str_in, xlabel):
         if len(repr(key)) == 3:
@@ -565,3 +1415,20 @@ class LivePlot(LiveMenu):
             if str_in:
                 str_in = str_in[:-1]
         return str_in, ylabel
+
+    def _mode_7(self, key, valid_inputs, str_in, animation, eqn, x):
+        if key in valid_inputs:
+            if key == 'Space':
+                key = ' '
+            str_in.append(key)
+        elif key == 'Enter':
+            try:
+                temp_animation = ''.join(str_in)
+                self._set_animation(temp_animation, eqn, x)
+                animation = temp_animation
+            except Exception as e:
+                pass
+        elif key == 'Backspace':
+            if str_in:
+                str_in = str_in[:-1]
+        return str_in, animation
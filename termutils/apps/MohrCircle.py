@@ -8,16 +8,21 @@ import seaborn as sns
 import numpy as np
 
 from termutils.obj.LiveMenu import LiveMenu
+from termutils.obj.Blitter import Blitter
 from termutils.obj.String import String
 
 class MohrCircle(LiveMenu):
 
     def __init__(
     self, rows:int = None, cols:int = None, facecolor:str = 'C0',
-    edgecolor:str = 'C1', annotations:bool = False, dt:float = 1E-2):
+    edgecolor:str = 'C1', annotations:bool = False, dt:float = 1E-2,
+    blit:bool = True):
         '''
-            Creates an interactive Mohr circle visualizer
+            Creates an interactive Mohr circle visualizer.  If `blit` is True,
+            changes to the circles that fit in the current axis limits only
+            redraw the circles (see `obj.Blitter`).
         '''
+        self._blit = blit
         self._facecolor = facecolor
         self._edgecolor = edgecolor
         self._annotations = annotations
@@ -100,6 +105,19 @@ class MohrCircle(LiveMenu):
 
         return xlim, ylim
 
+    def _keep_lims(self, xlim, ylim, new_xlim, new_ylim):
+        '''
+            Returns True if the current limits `xlim` and `ylim` can be kept in
+            place of `new_xlim` and `new_ylim`, which is when they contain them
+            and are at most twice as wide.  Keeping the limits allows the
+            circles to be blitted instead of redrawing the whole figure.
+        '''
+        return (
+            xlim[0] <= new_xlim[0] and new_xlim[1] <= xlim[1] and
+            ylim[0] <= new_ylim[0] and new_ylim[1] <= ylim[1] and
+            xlim[1] - xlim[0] <= 2*(new_xlim[1] - new_xlim[0])
+        )
+
     def _inactivate_plot(self):
         self._active_plot = False
         self._kill = True
@@ -154,10 +172,16 @@ class MohrCircle(LiveMenu):
         ax.set_xlim(xlim)
         ax.set_ylim(ylim)
 
+        if self._blit:
+            blitter = Blitter(fig, [circle_2, circle_1, circle_3])
+        else:
+            blitter = None
+
         active = True
         self._active_plot = True
         fig.canvas.mpl_connect('close_event', self._inactivate_plot)
         fig.canvas.draw()
+        plt.show(block = False)
 
         try:
             print(f'\033[2J\033[3J\033[f', end = '', flush = True)
@@ -179,14 +203,20 @@ class MohrCircle(LiveMenu):
                     circle_1.set_center(C1)
                     circle_3.set_center(C3)
 
-                    # ax.relim()
-                    xlim, ylim = self._calculate_lims(C1, R1, C2, R2, C3, R3)
-                    ax.set_xlim(xlim)
-                    ax.set_ylim(ylim)
-                    # ax.autoscale_view(True, True, True)
-                    fig.canvas.draw()
-
-                plt.pause(self._dt)
+                    new_xlim, new_ylim = \
+                    self._calculate_lims(C1, R1, C2, R2, C3, R3)
+                    if blitter is not None and \
+                    self._keep_lims(xlim, ylim, new_xlim, new_ylim):
+                        blitter.update()
+                    else:
+                        xlim, ylim = new_xlim, new_ylim
+                        ax.set_xlim(xlim)
+                        ax.set_ylim(ylim)
+                        fig.canvas.draw()
+
+                # Unlike `plt.pause`, this does not redraw a stale figure, so
+                # that blitted updates are not followed by a full redraw
+                fig.canvas.start_event_loop(self._dt)
             t_listener.join()
             t_writer.join()
 
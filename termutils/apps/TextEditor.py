@@ -1,29 +1,177 @@
-from typing import Tuple, Union
+from typing import List, Sequence, Tuple, Union
 from string import punctuation
-from copy import deepcopy
+import threading
 import textwrap
 import readline
+import warnings
 import shutil
 import time
+import re
+import os
 
 from termutils.config.defaults import term_rows, term_cols
-from termutils.obj.LiveMenu import LiveMenu
+from termutils.obj.TextBuffer import TextBuffer
+from termutils.obj.UndoStack import UndoStack
+from termutils.obj.TextView import TextView
+from termutils.obj.TextSearch import TextSearch
+from termutils.obj.Highlighter import Highlighter
+from termutils.utils.width import pad_to_width, str_width, truncate_to_width
+from termutils.obj.LiveMenu import LiveMenu, Paste
+
+# Character classes used to find word boundaries
+_WORD = 0
+_PUNCT = 1
+_SPACE = 2
+_ascii_classes = tuple(
+    _SPACE if chr(i).isspace() else
+    _PUNCT if chr(i) in punctuation and chr(i) != '_' else
+    _WORD for i in range(128)
+)
+
+def _char_class(char:str) -> int:
+    '''
+        Returns the class of a character: whitespace, punctuation (other than
+        underscores), or part of a word.
+    '''
+    code = ord(char)
+    if code < 128:
+        return _ascii_classes[code]
+    return _SPACE if char.isspace() else _WORD
+
+class _Document:
+
+    '''
+        A file (or scratch buffer) open in the editor, with its own undo
+        history, highlighter and save state.  Every pane that shows the
+        document shares its `TextBuffer`.
+    '''
+
+    __slots__ = (
+        'text', 'path', 'undo', 'highlighter', 'saved_version', 'swap_version'
+    )
+
+    def __init__(
+    self, text:TextBuffer, path:str, undo:UndoStack,
+    saved_version:int = 0) -> None:
+        self.text = text
+        self.path = path
+        self.undo = undo
+        self.highlighter = None
+        if path is not None:
+            self.highlighter = Highlighter.for_path(text, path)
+        self.saved_version = saved_version
+        self.swap_version = text.version
+
+    @property
+    def swap_path(self) -> Union[str, None]:
+        '''
+            Returns the path of the swap file, or None if there is no path.
+        '''
+        if self.path is None:
+            return None
+        directory, name = os.path.split(os.path.abspath(self.path))
+        return os.path.join(directory, f'.{name}.swp')
+
+    @property
+    def modified(self) -> bool:
+        '''
+            Returns True if the text has changed since it was last saved.
+        '''
+        return self.text.version != self.saved_version
+
+class _Pane:
+
+    '''
+        A region of the terminal that shows a document through a `TextView`,
+        with its own cursor.
+    '''
+
+    __slots__ = ('doc', 'view', 'row', 'col', 'rect')
+
+    def __init__(self, doc:_Document, view:TextView) -> None:
+        self.doc = doc
+        self.view = view
+        self.row = 0
+        self.col = 0
+        # Top row, left column, height and width on the terminal
+        self.rect = (0, 0) + view.shape
 
 class TextEditor(LiveMenu):
 
-    def __init__(self, dt:float = 0.01, tab_len:int = 4) -> None:
+    def __init__(
+    self, path:Union[str, Sequence[str]] = None, dt:float = 0.01,
+    tab_len:int = 4, undo_bytes:int = 2**24, autosave:float = 5.0,
+    recover:bool = False, wrap:bool = False) -> None:
         '''
             Creates an instance of TextEditor.  Supports usage of the default
             listener provided by class LiveMenu.
-        '''
-        self._delimiters = list(punctuation)
-        self._delimiters.remove('_')
 
+            If `path` is given, the file is opened lazily (see
+            `TextBuffer.from_file`) and saved with Ctrl-s.  Every `autosave`
+            seconds, unsaved changes are written to a swap file next to it on a
+            background thread; if the editor exits with unsaved changes, the
+            swap file is kept, and can be opened with `recover = True`.
+            Files in the languages of `config.syntax` are highlighted.
+
+            `path` may also be a sequence of paths, all of which are opened.
+            Files are opened with Ctrl-o, and cycled through with Alt-n and
+            Alt-p.  Alt-v splits the active pane side by side, Alt-h splits it
+            into a top and bottom pane, Alt-o moves to the next pane and Alt-w
+            closes the active pane.  Panes showing the same file share its
+            text, undo history and highlighting.
+
+            If `wrap` is True, long lines are soft-wrapped rather than
+            scrolled horizontally; Alt-z turns wrapping on or off in the active
+            pane, and in the panes split from it.
+
+            `undo_bytes` limits the memory used to store the undo history of
+            each file.
+        '''
         cols, rows = shutil.get_terminal_size((term_cols, term_rows))[:]
         self._dt = dt
         self._tab_len = tab_len
+        self._undo_bytes = undo_bytes
+        self._autosave = autosave
+        self._wrap = wrap
+        if path is None or isinstance(path, str):
+            paths = [path]
+        else:
+            paths = list(path) or [None]
+        self._docs = [self._open(path, recover) for path in paths]
+        self._doc = self._docs[0]
+        self._pane = None
+        self._layout = None
+        self._save_requests = []
+        self._io_active = False
+        self._io_cond = threading.Condition()
+        # An error from the I/O thread, to be shown in the status line
+        self._io_error = None
+        self._search = None
+        self._query = ''
+        self._regex = False
+        self._prompt = None
+        self._origin = 0
+        self._message = ''
+        self._status = None
+        self._search_state = None
         super().__init__(rows = rows, cols = cols)
 
+    @property
+    def swap_path(self) -> Union[str, None]:
+        '''
+            Returns the path of the swap file of the active file, or None if
+            it has no path.
+        '''
+        return self._doc.swap_path
+
+    @property
+    def modified(self) -> bool:
+        '''
+            Returns True if the active file has changed since it was last
+            saved.
+        '''
+        return self._doc.modified
+
     def __call__(self) -> None:
         '''
             Main loop which runs on one thread, while a listener runs on
@@ -43,31 +191,47 @@ class TextEditor(LiveMenu):
         row = 0
         col = 0
 
-        history = [[[' ']]]
-        row_history = [row]
-        col_history = [col]
-        history_idx = 0
+        text = self._doc.text
+        for doc in self._docs:
+            doc.undo.clear()
+        # The bottom row of the terminal is used as a status line
+        self._pane = self._new_pane(self._doc)
+        self._layout = self._pane
+        self._status = None
+        print(self._arrange(), end = '', flush = True)
 
-        text = [[' ']]
+        self._io_active = True
+        t_io = threading.Thread(target = self._io_loop)
+        t_io.start()
 
         while active:
 
-            if not text:
-                text.append([' '])
-
             btn_outputs = len(self._btn_history)
             key_outputs = len(self._key_history)
 
-            if btn_idx < btn_outputs or key_idx < key_outputs:
+            # Search results arrive from a worker thread
+            found = self._search is not None and self._search_changed()
+
+            # As do errors from the I/O thread
+            with self._io_cond:
+                error, self._io_error = self._io_error, None
+            if error is not None:
+                self._message = error
+
+            if btn_idx < btn_outputs or key_idx < key_outputs or found or \
+               error is not None:
+
+                follow = key_idx < key_outputs
+                if found and self._prompt is not None:
+                    row, col = self._jump(text, row, col)
+                    follow = True
 
                 while btn_idx < btn_outputs:
                     btn = self._btn_history[btn_idx]
                     text, row, col = self._process_btn(btn, text, row, col)
+                    self._doc.undo.seal()
                     btn_idx += 1
 
-                    if not text:
-                        text.append([' '])
-
                 while key_idx < key_outputs:
                     key = self._key_history[key_idx]
 
@@ -75,48 +239,494 @@ class TextEditor(LiveMenu):
                         active = False
                         key_idx += 1
                         break
+                    elif self._prompt is not None:
+                        text, row, col = self._process_prompt(
+                            key, text, row, col
+                        )
+                        key_idx += 1
+                    elif key == 'Ctrl-s':
+                        self.save()
+                        key_idx += 1
                     elif key == 'Ctrl-z':
-                        history_idx = max(0, history_idx - 1)
-                        text = deepcopy(history[history_idx])
-                        row = row_history[history_idx]
-                        col = col_history[history_idx]
+                        cursor = self._doc.undo.undo(text)
+                        if cursor is not None:
+                            row, col = cursor
                         key_idx += 1
                     elif key == 'Ctrl-y':
-                        history_idx = min(len(history) - 1, history_idx + 1)
-                        text = deepcopy(history[history_idx])
-                        row = row_history[history_idx]
-                        col = col_history[history_idx]
+                        cursor = self._doc.undo.redo(text)
+                        if cursor is not None:
+                            row, col = cursor
+                        key_idx += 1
+                    elif isinstance(key, Paste):
+                        self._message = ''
+                        self._doc.undo.begin((row, col))
+                        row, col = self._paste(key, text, row, col)
+                        self._doc.undo.end((row, col))
                         key_idx += 1
                     else:
+                        self._message = ''
+                        undo = self._doc.undo
+                        undo.begin((row, col), self._edit_kind(key))
                         text, row, col = self._process_key(key, text, row, col)
-                        history = history[:history_idx+1]
-                        row_history = row_history[:history_idx+1]
-                        col_history = col_history[:history_idx+1]
+                        undo.end((row, col))
                         key_idx += 1
 
-                        if not text:
-                            text.append([])
-
-                        for i,j in enumerate(text):
-                            if j and j[-1] != ' ':
-                                text[i].append(' ')
-
-                text_str = '\033[2J\033[3J\033[f'
-                text_str += '\n\r'.join(''.join(line) for line in text)
-                text_str += f'\033[{row+1};{col+1}f'
-
-                if not history or text != history[history_idx]:
-                    row_history.append(row)
-                    col_history.append(col)
-                    history.append(text)
-                    history_idx += 1
+                # Only the rows changed by this batch of inputs are rewritten,
+                # in every pane, and written to the terminal at once.
+                if follow:
+                    self._pane.view.follow(row, col)
+                text_str = ''.join(pane.view.render() for pane in self._panes())
+                text_str += self._status_str()
+                if self._prompt is None:
+                    text_str += self._pane.view.cursor_str(row, col)
+                else:
+                    x = str_width(self._prompt_str())
+                    text_str += f'\033[{self.rows};{min(x, self.cols-1)+1}f'
 
                 print(text_str, end = '', flush = True)
 
             time.sleep(self._dt)
 
+        for pane in self._panes():
+            pane.view.close()
+        for doc in self._docs:
+            if doc.highlighter is not None:
+                doc.highlighter.close()
+        if self._search is not None:
+            self._search.close()
+        with self._io_cond:
+            self._io_active = False
+            self._io_cond.notify()
+        t_io.join()
         print('\033[1 q', end = '', flush = True)
 
+    def save(self) -> None:
+        '''
+            Saves the active file on the background I/O thread, without
+            waiting for it to be written.  Has no effect if it has no path.
+        '''
+        if self._doc.path is None:
+            return
+        with self._io_cond:
+            # Snapshots share the text's nodes, so this takes O(1) time
+            self._save_requests.append((self._doc, self._doc.text.snapshot()))
+            self._io_cond.notify()
+
+    def _status_str(self) -> str:
+        '''
+            Returns the string that rewrites the status line, or an empty
+            string if it has not changed.
+        '''
+        if self._prompt is not None:
+            left = self._prompt_str()
+        elif self._message:
+            left = self._message
+        else:
+            left = self._doc.path or '[scratch]'
+            left += ' [+]' if self._doc.modified else ''
+            if len(self._docs) > 1:
+                idx = self._docs.index(self._doc)
+                left = f'[{idx+1}/{len(self._docs)}] {left}'
+
+        right = ''
+        if self._search is not None:
+            count = self._search.count
+            right = f'{count} match{"" if count == 1 else "es"}'
+            right += '' if self._search.done else '…'
+        right = truncate_to_width(right, self.cols)
+        left = truncate_to_width(left, self.cols - str_width(right) - 1)
+        status = pad_to_width(left, self.cols - str_width(right)) + right
+        if status == self._status:
+            return ''
+        self._status = status
+        return f'\033[{self.rows};1f\033[7m{status}\033[m'
+
+    def _prompt_str(self) -> str:
+        '''
+            Returns the text of the prompt on the status line.
+        '''
+        kind, entry = self._prompt
+        if kind == 'find':
+            return f'{"Regex" if self._regex else "Find"}: {entry}'
+        elif kind == 'open':
+            return f'Open: {entry}'
+        return f'Replace `{self._query}` with: {entry}'
+
+    def _search_changed(self) -> bool:
+        '''
+            Returns True if the search has found new matches or finished since
+            the status line was last updated.
+        '''
+        state = (self._search.count, self._search.done)
+        changed = state != self._search_state
+        self._search_state = state
+        return changed
+
+    def _start_search(self, query:str) -> None:
+        '''
+            Replaces the current search with a search for `query`.
+        '''
+        if self._search is not None:
+            self._search.close()
+            self._search = None
+        self._message = ''
+        if not query:
+            return
+        self._query = query
+        try:
+            self._search = TextSearch(self._doc.text, query, regex = self._regex)
+        except re.error as e:
+            self._message = f'Invalid pattern: {e}'
+
+    def _jump(self, text, row, col, backwards = False) -> Tuple[int]:
+        '''
+            Moves the cursor to the next match after the cursor (or the origin
+            of the search, while the prompt is open), or to the previous match
+            if `backwards` is True.
+        '''
+        if self._search is None:
+            return row, col
+        elif self._prompt is not None:
+            match = self._search.next(self._origin - 1)
+        elif backwards:
+            match = self._search.prev(text.offset(row, col))
+        else:
+            match = self._search.next(text.offset(row, col))
+        if match is None:
+            return row, col
+        return text.position(match[0])
+
+    def _process_prompt(self, key, text, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Edits the entry of the prompt on the status line.  Enter accepts
+            the entry (an empty search repeats the previous one), and Ctrl-g
+            cancels it.  While finding, Ctrl-t switches
+            between literal and regular expression searches, and the search is
+            updated with each key.
+        '''
+        kind, entry = self._prompt
+        if isinstance(key, Paste):
+            # Only the first line of a paste fits in the prompt
+            entry += key.partition('\n')[0]
+        elif len(key) == 1 or key == 'Space':
+            entry += ' ' if key == 'Space' else key
+        elif key == 'Backspace':
+            entry = entry[:-1]
+        elif key == 'Ctrl-t' and kind == 'find':
+            self._regex = not self._regex
+        elif key == 'Enter':
+            self._prompt = None
+            if kind == 'open':
+                if entry:
+                    text, row, col = self._open_path(entry, text, row, col)
+            elif kind == 'find' and not entry:
+                # Repeat the previous search
+                self._start_search(self._query)
+                row, col = self._jump(text, row, col)
+            elif kind == 'replace' and self._search is not None:
+                n = self._search.replace_all(entry, self._doc.undo, (row, col))
+                self._doc.undo.seal()
+                row = min(row, text.line_count - 1)
+                col = min(col, text.line_length(row))
+                self._message = f'Replaced {n} match{"" if n == 1 else "es"}'
+            return text, row, col
+        elif key == 'Ctrl-g':
+            self._prompt = None
+            if kind == 'find':
+                self._start_search('')
+                row, col = text.position(min(self._origin, len(text)))
+            return text, row, col
+        else:
+            return text, row, col
+
+        self._prompt = [kind, entry]
+        if kind == 'find':
+            self._start_search(entry)
+            row, col = text.position(min(self._origin, len(text)))
+            row, col = self._jump(text, row, col)
+        return text, row, col
+
+    def _open(self, path:str, recover:bool) -> _Document:
+        '''
+            Opens the file at `path`, or its swap file if `recover` is True.
+            The buffer is empty if neither exists, or if `path` is None.
+        '''
+        undo = UndoStack(max_bytes = self._undo_bytes)
+        doc = _Document(TextBuffer(), path, undo)
+        if path is None:
+            return doc
+        swap_path = doc.swap_path
+        if recover and os.path.exists(swap_path):
+            # The recovered text has not been saved to `path` yet
+            return _Document(TextBuffer.from_file(swap_path), path, undo, None)
+        elif os.path.exists(swap_path):
+            msg = (
+                f'\n\nFound swap file `{swap_path}`, which may contain unsaved '
+                f'changes to `{path}`.  Pass `recover = True` to open it.'
+            )
+            warnings.warn(msg)
+        if os.path.exists(path):
+            return _Document(TextBuffer.from_file(path), path, undo)
+        return doc
+
+    def _io_loop(self) -> None:
+        '''
+            Runs on a background thread while the editor is active, writing
+            the snapshots requested by `save` to their files, and the unsaved
+            changes to each file to its swap file every `autosave` seconds.  On
+            exit, the swap files are removed unless there are unsaved changes.
+        '''
+        active = True
+        while active:
+            with self._io_cond:
+                self._io_cond.wait_for(
+                    lambda: not self._io_active or self._save_requests,
+                    timeout = self._autosave
+                )
+                requests, self._save_requests = self._save_requests, []
+                active = self._io_active
+                docs = list(self._docs)
+
+            for doc, snapshot in requests:
+                try:
+                    snapshot.save(doc.path)
+                except Exception as e:
+                    self._report(f'Cannot save `{doc.path}`', e)
+                    continue
+                doc.saved_version = snapshot.version
+            if requests:
+                continue
+            for doc in docs:
+                if doc.path is None:
+                    continue
+                elif doc.modified and doc.text.version != doc.swap_version:
+                    snapshot = doc.text.snapshot()
+                    # Not retried until the next edit, if it fails
+                    doc.swap_version = snapshot.version
+                    try:
+                        snapshot.save(doc.swap_path)
+                    except Exception as e:
+                        self._report(f'Cannot write `{doc.swap_path}`', e)
+
+        for doc in docs:
+            if doc.path is None:
+                continue
+            try:
+                if not doc.modified and os.path.exists(doc.swap_path):
+                    os.remove(doc.swap_path)
+                elif doc.modified and doc.text.version != doc.swap_version:
+                    doc.text.snapshot().save(doc.swap_path)
+            except OSError:
+                # Nowhere left to report it, as the editor has closed
+                pass
+
+    def _report(self, message:str, error:Exception) -> None:
+        '''
+            Has the writer show `message` and the reason for `error` in the
+            status line; called from the I/O thread.
+        '''
+        reason = getattr(error, 'strerror', None) or str(error)
+        with self._io_cond:
+            self._io_error = f'{message}: {reason}'
+
+    def _new_pane(self, doc:_Document) -> _Pane:
+        '''
+            Returns a pane showing `doc`, which is placed by `_arrange`.
+        '''
+        view = TextView(
+            doc.text, 0, 0, self.rows - 1, self.cols,
+            highlighter = doc.highlighter, wrap = self._wrap
+        )
+        return _Pane(doc, view)
+
+    def _panes(self, node = None) -> List[_Pane]:
+        '''
+            Returns the panes in the layout (or in the part of it rooted at
+            `node`), from top-left to bottom-right.
+        '''
+        node = self._layout if node is None else node
+        if isinstance(node, _Pane):
+            return [node]
+        return self._panes(node[1]) + self._panes(node[2])
+
+    def _arrange(
+    self, node = None, y0:int = 0, x0:int = 0, height:int = None,
+    width:int = None) -> str:
+        '''
+            Fits the panes in the layout (or in the part of it rooted at
+            `node`) to the given region of the terminal, which defaults to all
+            of it except the status line.  Returns the string that draws the
+            borders between them and their contents.
+
+            The layout is a binary tree, whose leaves are panes, and whose
+            other nodes are lists [direction, first, second]; direction 'v'
+            places `first` left of `second`, and 'h' places it above.
+        '''
+        if node is None:
+            node = self._layout
+            height = self.rows - 1
+            width = self.cols
+        if isinstance(node, _Pane):
+            node.rect = (y0, x0, height, width)
+            node.view.resize(
+                y0, x0, height, width, full_width = width == self.cols
+            )
+            return node.view.render()
+
+        direction, first, second = node
+        if direction == 'v':
+            size = (width - 1)//2
+            out = self._arrange(first, y0, x0, height, size)
+            for y in range(y0, y0 + height):
+                out += f'\033[{y+1};{x0+size+1}f│'
+            return out + self._arrange(
+                second, y0, x0 + size + 1, height, width - size - 1
+            )
+        size = (height - 1)//2
+        out = self._arrange(first, y0, x0, size, width)
+        out += f'\033[{y0+size+1};{x0+1}f' + '─'*width
+        return out + self._arrange(
+            second, y0 + size + 1, x0, height - size - 1, width
+        )
+
+    def _focus(self, pane:_Pane, row:int, col:int) -> Tuple[Union[str,int]]:
+        '''
+            Makes `pane` the active pane, given the cursor position in the
+            current one, and returns its text and cursor position.  A search
+            is carried over to the document of the new pane.
+        '''
+        self._pane.row = row
+        self._pane.col = col
+        self._doc.undo.seal()
+        restart = self._search is not None and pane.doc is not self._doc
+        self._pane = pane
+        self._doc = pane.doc
+        if restart:
+            self._start_search(self._query)
+
+        text = pane.doc.text
+        # The text may have been edited through another pane
+        row = min(pane.row, text.line_count - 1)
+        col = min(pane.col, text.line_length(row))
+        return text, row, col
+
+    def _split(
+    self, direction:str, text, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Splits the active pane in two (see `_arrange`), and moves to the
+            new pane, which shows the same document.
+        '''
+        height, width = self._pane.rect[2:]
+        if (direction == 'v' and width < 3) or (direction == 'h' and height < 3):
+            self._message = 'Not enough space to split the pane'
+            return text, row, col
+
+        old = self._pane
+        new = self._new_pane(self._doc)
+        new.view.set_top(old.view.top)
+
+        def replace(node):
+            if node is old:
+                return [direction, old, new]
+            elif isinstance(node, _Pane):
+                return node
+            return [node[0], replace(node[1]), replace(node[2])]
+
+        self._layout = replace(self._layout)
+        self._status = None
+        print(self._arrange(), end = '')
+        new.row, new.col = row, col
+        return self._focus(new, row, col)
+
+    def _close_pane(self, text, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Closes the active pane, and moves to the pane that takes its place.
+        '''
+        old = self._pane
+        if self._layout is old:
+            self._message = 'Cannot close the only pane'
+            return text, row, col
+
+        def remove(node):
+            if isinstance(node, _Pane):
+                return node
+            elif node[1] is old:
+                return node[2]
+            elif node[2] is old:
+                return node[1]
+            return [node[0], remove(node[1]), remove(node[2])]
+
+        self._layout = remove(self._layout)
+        old.view.close()
+        print(self._arrange(), end = '')
+        panes = self._panes()
+        return self._focus(panes[0], row, col)
+
+    def _next_pane(self, text, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Moves to the next pane, in the order of `_panes`.
+        '''
+        panes = self._panes()
+        idx = panes.index(self._pane)
+        return self._focus(panes[(idx + 1) % len(panes)], row, col)
+
+    def _show(self, doc:_Document, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Shows `doc` in the active pane, with the cursor at its start.
+        '''
+        self._pane.view.set_highlighter(doc.highlighter)
+        self._pane.view.set_buffer(doc.text)
+        self._pane.doc = doc
+        return self._focus(self._pane, 0, 0)
+
+    def _cycle(self, step:int, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Shows the next (or previous, if `step` is -1) open document in the
+            active pane.
+        '''
+        idx = self._docs.index(self._doc)
+        return self._show(self._docs[(idx + step) % len(self._docs)], row, col)
+
+    def _open_path(self, path:str, text, row, col) -> Tuple[Union[str,int]]:
+        '''
+            Shows the file at `path` in the active pane, opening it unless it
+            is already open.
+        '''
+        path = os.path.expanduser(path)
+        for doc in self._docs:
+            if doc.path is not None:
+                if os.path.abspath(doc.path) == os.path.abspath(path):
+                    return self._show(doc, row, col)
+
+        try:
+            with warnings.catch_warnings(record = True) as caught:
+                warnings.simplefilter('always')
+                doc = self._open(path, False)
+        except OSError as e:
+            self._message = f'Cannot open `{path}`: {e.strerror}'
+            return text, row, col
+        except UnicodeDecodeError:
+            self._message = f'Cannot open `{path}`: it is not UTF-8 text'
+            return text, row, col
+        with self._io_cond:
+            self._docs.append(doc)
+        text, row, col = self._show(doc, row, col)
+        if caught:
+            self._message = f'Found swap file `{doc.swap_path}`'
+        return text, row, col
+
+    def _edit_kind(self, key) -> Union[str, None]:
+        '''
+            Returns the kind of edit made by the given key, which determines
+            whether consecutive edits are undone together.  Returns None for
+            keys whose edits are always undone separately.
+        '''
+        if len(key) == 1 or key in ('Space', 'Tab', 'Enter'):
+            return 'insert'
+        elif key in ('Backspace', 'Delete'):
+            return key.lower()
+        return None
+
     def _sub_col(self, row, col, text):
         '''
             Returns the coordinate that is one less than the given row & column
@@ -126,155 +736,94 @@ class TextEditor(LiveMenu):
             col -= 1
         elif row > 0:
             row -= 1
-            col = len(text[row]) - 1
-            if not text[row]:
-                row = None
-                col = None
+            col = text.line_length(row)
         else:
             row = None
             col = None
         return row, col
 
-    def _add_col(self, row, col, text):
+    def _word_left(self, text, row, col) -> Tuple[int]:
         '''
-            Returns the coordinate that is one more than the given row & column
-            pair.  If at (row_max, col_max), returns (None, None).
+            Returns the position at the start of the group to the left of the
+            given position, where a group is any whitespace (including line
+            breaks) followed by a run of word characters or of punctuation.
         '''
-        if col < len(text[row]) - 1:
-            col += 1
-        elif row < len(text) - 1:
-            row += 1
-            col = 0
-            if not text[row]:
-                row = None
-                col = None
-        else:
-            row = None
-            col = None
+        line = text.line(row)
+        while True:
+            while col > 0 and _char_class(line[col-1]) == _SPACE:
+                col -= 1
+            if col > 0 or row == 0:
+                break
+            row -= 1
+            line = text.line(row)
+            col = len(line)
+
+        if col > 0:
+            group = _char_class(line[col-1])
+            while col > 0 and _char_class(line[col-1]) == group:
+                col -= 1
         return row, col
 
-    def _left_group(self, text, row, col) -> int:
+    def _word_right(self, text, row, col) -> Tuple[int]:
         '''
-            Returns the number of elements to the left of the current element
-            which consist of a group (such as a word, or a word and a space).
+            Returns the position at the end of the group to the right of the
+            given position (see `_word_left`).
         '''
-        N = 0
-        start_mode = 0      # 0 is normal char, 1 is delimiter, 2 is space.
-        start_col = col
-        row, col = self._sub_col(row, col, text)
-        if row is None:
-            return N
-        char = text[row][col]
-        if start_col == 0:
-            N += 1
-
-        if char in self._delimiters:
-            start_mode = 1
-        elif char == ' ':
-            start_mode = 2
-        N += 1
-
+        line = text.line(row)
+        last = text.line_count - 1
         while True:
-            row, col = self._sub_col(row, col, text)
-            if row is None:
-                return N
-
-            char = text[row][col]
-            if start_mode == 2:
-                if char in self._delimiters:
-                    start_mode = 1
-                elif char != ' ':
-                    start_mode = 0
-            elif start_mode == 1:
-                if char not in self._delimiters:
-                    return N
-            else:
-                if char in self._delimiters or char == ' ':
-                    return N
-            N += 1
-
-    def _right_group(self, text, row, col) -> int:
-        '''
-            Returns the number of elements to the left of the current element
-            which consist of a group (such as a word, or a word and a space).
-        '''
-        N = 0
-        start_mode = 0      # 0 is normal char, 1 is delimiter, 2 is space.
-        char = text[row][col]
-
-        if col == len(text[row]) - 1:
-            N += 1
-
-        if char in self._delimiters:
-            start_mode = 1
-        elif char == ' ':
-            start_mode = 2
-        N += 1
+            while col < len(line) and _char_class(line[col]) == _SPACE:
+                col += 1
+            if col < len(line) or row == last:
+                break
+            row += 1
+            line = text.line(row)
+            col = 0
 
-        while True:
-            row, col = self._add_col(row, col, text)
-            if row is None:
-                return N
-
-            char = text[row][col]
-            if start_mode == 2:
-                if char in self._delimiters:
-                    start_mode = 1
-                elif char != ' ':
-                    start_mode = 0
-            elif start_mode == 1:
-                if char not in self._delimeters:
-                    return N
-            else:
-                if char in self._delimiters or char == ' ':
-                    return N
-            N += 1
+        if col < len(line):
+            group = _char_class(line[col])
+            while col < len(line) and _char_class(line[col]) == group:
+                col += 1
+        return row, col
 
     def _delete(self, text, row, col) -> Tuple[Union[str,int]]:
         '''
-            Performs a delete on the given list of characters, using the
-            context attached to them (see docstring in self._process_key).
+            Performs a delete on the given `TextBuffer`, using the context
+            attached to it (see docstring in self._process_key).
         '''
-        if col < len(text[row]) - 1:
-            text[row].pop(col)
-        elif row < len(text) - 1:
-            new_row = text.pop(row+1)
-            text[row] += new_row
+        pos = text.offset(row, col)
+        if pos < len(text):
+            self._doc.undo.delete(text, pos, pos + 1)
         return text, row, col
 
     def _ctrl_delete(self, text, row, col) -> Tuple[Union[str,int]]:
         '''
-            Performs a ctrl-delete on the given list of characters, using the
-            context attached to them (see docstring in self._process_key).
+            Deletes the group to the right of the cursor in a single operation
+            (see `_word_left`).
         '''
-        N = self._right_group(text, row, col)
-        for i in range(N):
-            text, row, col = self._delete(text, row, col)
+        stop = text.offset(*self._word_right(text, row, col))
+        self._doc.undo.delete(text, text.offset(row, col), stop)
         return text, row, col
 
     def _backspace(self, text, row, col) -> Tuple[Union[str,int]]:
         '''
-            Performs a backspace on the given list of characters, using the
-            context attached to them (see docstring in self._process_key).
+            Performs a backspace on the given `TextBuffer`, using the context
+            attached to it (see docstring in self._process_key).
         '''
-        if col > 0:
-            text[row].pop(col-1)
-            col -= 1
-        elif row > 0:
-            new_row = text.pop(row)
-            text[row-1] += new_row
-            row -= 1
-            col = len(text[row])-len(new_row)
+        pos = text.offset(row, col)
+        if pos > 0:
+            row, col = self._sub_col(row, col, text)
+            self._doc.undo.delete(text, pos - 1, pos)
         return text, row, col
 
     def _ctrl_backspace(self, text, row, col) -> Tuple[Union[str,int]]:
         '''
-            Performs a ctrl-backspace on the given list of characters, using the
-            context attached to them (see docstring in self._process_key).
+            Deletes the group to the left of the cursor in a single operation
+            (see `_word_left`).
         '''
-        N = self._left_group(text, row, col)
-        for i in range(N):
-            text, row, col = self._backspace(text, row, col)
+        stop = text.offset(row, col)
+        row, col = self._word_left(text, row, col)
+        self._doc.undo.delete(text, text.offset(row, col), stop)
         return text, row, col
 
     def _ctrl_left(self, text, row, col) -> Tuple[Union[str,int]]:
@@ -282,11 +831,7 @@ class TextEditor(LiveMenu):
             Moves the cursor to the left until the beginning of the previous
             word is reached.
         '''
-        N = self._left_group(text, row, col)
-        for i in range(N):
-            new_row, new_col = self._sub_col(row, col, text)
-            if new_row is not None:
-                row, col = new_row, new_col
+        row, col = self._word_left(text, row, col)
         return text, row, col
 
     def _ctrl_right(self, text, row, col) -> Tuple[Union[str,int]]:
@@ -294,49 +839,67 @@ class TextEditor(LiveMenu):
             Moves the cursor to the right until the end of the current word is
             reached.
         '''
-        N = self._right_group(text, row, col)
-        for i in range(N):
-            new_row, new_col = self._add_col(row, col, text)
-            if new_row is not None:
-                row, col = new_row, new_col
+        row, col = self._word_right(text, row, col)
         return text, row, col
 
+    def _paste(self, string, text, row, col) -> Tuple[int]:
+        '''
+            Inserts pasted text at the cursor in a single operation, and
+            returns the position of the end of the inserted text.
+        '''
+        self._doc.undo.insert(text, text.offset(row, col), string)
+        newlines = string.count('\n')
+        if newlines:
+            return row + newlines, len(string) - string.rfind('\n') - 1
+        return row, col + len(string)
+
+    def _swap_lines(self, text, row) -> None:
+        '''
+            Swaps line `row` with the line below it.
+        '''
+        start = text.line_start(row)
+        stop = text.line_range(row + 1)[1]
+        upper = text.line(row)
+        lower = text.line(row + 1)
+        self._doc.undo.delete(text, start, stop)
+        self._doc.undo.insert(text, start, lower + '\n' + upper)
+
     def _ctrl_up(self, text, row, col) -> Tuple[Union[str,int]]:
         '''
             Swaps the above line with the current one.
         '''
         if row > 0:
-            current_row = text.pop(row)
-            text.insert(row - 1, current_row)
+            self._swap_lines(text, row - 1)
             row -= 1
+            col = min(col, text.line_length(row))
         return text, row, col
 
     def _ctrl_down(self, text, row, col) -> Tuple[Union[str,int]]:
         '''
             Swaps the below line with the current one.
         '''
-        if row < len(text) - 1:
-            current_row = text.pop(row)
-            text.insert(row + 1, current_row)
+        if row < text.line_count - 1:
+            self._swap_lines(text, row)
             row += 1
+            col = min(col, text.line_length(row))
         return text, row, col
 
     def _process_key(self, key, text, row, col) -> Tuple[Union[str,int]]:
         '''
-            Takes the current text and modifies it using the given key input.
+            Takes the current `TextBuffer` and modifies it in place using the
+            given key input, returning it along with the new cursor position.
         '''
 
         if len(key) == 1:
-            text[row].insert(col, key)
+            self._doc.undo.insert(text, text.offset(row, col), key)
             col += 1
 
         elif key == 'Space':
-            text[row].insert(col, ' ')
+            self._doc.undo.insert(text, text.offset(row, col), ' ')
             col += 1
 
         elif key == 'Tab':
-            for i in range(self._tab_len):
-                text[row].insert(col, ' ')
+            self._doc.undo.insert(text, text.offset(row, col), ' '*self._tab_len)
             col += self._tab_len
 
         elif key == 'Delete':
@@ -352,37 +915,74 @@ class TextEditor(LiveMenu):
             text, row, col = self._ctrl_backspace(text, row, col)
 
         elif key == 'Enter':
-            top = text[:row] + [text[row][:col]]
-            mid = [text[row][col:]]
-            bottom = text[row+1:]
-            text = top + mid + bottom
+            self._doc.undo.insert(text, text.offset(row, col), '\n')
             row += 1
             col = 0
-            if row >= len(text):
-                text.append([' '])
-
-        elif key == 'Up':
-            row = max(0, row - 1)
-            col = min(col, len(text[row])-1)
 
-        elif key == 'Down':
-            row = min(len(text)-1, row + 1)
-            col = min(col, len(text[row])-1)
+        elif key in ('Up', 'Down'):
+            row, col = self._pane.view.move(row, col, 1 if key == 'Down' else -1)
 
         elif key == 'Left':
             if col > 0:
                 col -= 1
             elif row > 0:
                 row -= 1
-                col = len(text[row]) - 1
+                col = text.line_length(row)
 
         elif key == 'Right':
-            if col < len(text[row]) - 1:
+            if col < text.line_length(row):
                 col += 1
-            elif row < len(text) - 1:
+            elif row < text.line_count - 1:
                 row += 1
                 col = 0
 
+        elif key == 'Home':
+            col = 0
+
+        elif key == 'End':
+            col = text.line_length(row)
+
+        elif key in ('PgUp', 'PgDn'):
+            step = self._pane.view.shape[0] - 1
+            step = step if key == 'PgDn' else -step
+            row, col = self._pane.view.move(row, col, step)
+            self._pane.view.scroll(step)
+
+        elif key == 'Ctrl-o':
+            self._prompt = ['open', '']
+
+        elif key in ('Alt-n', 'Alt-p'):
+            text, row, col = self._cycle(1 if key == 'Alt-n' else -1, row, col)
+
+        elif key in ('Alt-v', 'Alt-h'):
+            text, row, col = self._split(key[-1], text, row, col)
+
+        elif key == 'Alt-z':
+            self._wrap = not self._pane.view.wrap
+            self._pane.view.set_wrap(self._wrap)
+
+        elif key == 'Alt-w':
+            text, row, col = self._close_pane(text, row, col)
+
+        elif key == 'Alt-o':
+            text, row, col = self._next_pane(text, row, col)
+
+        elif key == 'Ctrl-f':
+            self._origin = text.offset(row, col)
+            self._prompt = ['find', '']
+
+        elif key == 'Ctrl-r':
+            if self._search is None:
+                self._message = 'Nothing to replace: search with Ctrl-f first'
+            else:
+                self._prompt = ['replace', '']
+
+        elif key in ('Ctrl-n', 'F3'):
+            row, col = self._jump(text, row, col)
+
+        elif key == 'Ctrl-p':
+            row, col = self._jump(text, row, col, backwards = True)
+
         elif key == 'Ctrl-Up':
             text, row, col = self._ctrl_up(text, row, col)
 
@@ -400,10 +1000,28 @@ class TextEditor(LiveMenu):
     def _process_btn(self, btn, text, row, col) -> Tuple[Union[str,int]]:
         '''
             Processes mouse inputs and returns a modified output list based on
-            that.
+            that.  Clicking or scrolling in another pane moves to it.
         '''
+        for pane in self._panes():
+            y0, x0, height, width = pane.rect
+            if y0 <= btn['y'] < y0 + height and x0 <= btn['x'] < x0 + width:
+                if pane is not self._pane:
+                    if btn['action'] == 'LeftDrag':
+                        return text, row, col
+                    text, row, col = self._focus(pane, row, col)
+                break
+        else:
+            return text, row, col
+        y = btn['y'] - y0
+        x = btn['x'] - x0
+
         if btn['action'] in ['LeftClick', 'LeftDrag']:
-            row = min(btn['y'], len(text)-1)
-            col = min(btn['x'], len(text[row])-1)
+            row, col = self._pane.view.position(y, x)
+
+        elif btn['action'] == 'ScrollUp':
+            self._pane.view.scroll(-3)
+
+        elif btn['action'] == 'ScrollDown':
+            self._pane.view.scroll(3)
 
         return text, row, col
@@ -3,3 +3,4 @@ from . import paths
 from . import keys
 from . import rgb
 from . import styles
+from . import syntax
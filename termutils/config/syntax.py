@@ -0,0 +1,168 @@
+# Colors (names from `rgb.colors`) and styles (names from `styles.styles`) used
+# to display each kind of token.
+theme = {
+    'comment'   : ('light slate gray', 'italic'),
+    'string'    : ('light green', 'default'),
+    'keyword'   : ('orange', 'bold'),
+    'constant'  : ('light coral', 'default'),
+    'builtin'   : ('light sky blue', 'default'),
+    'number'    : ('light coral', 'default'),
+    'function'  : ('light goldenrod yellow', 'bold'),
+    'decorator' : ('light pink', 'default'),
+    'preproc'   : ('light pink', 'default'),
+    'type'      : ('light steel blue', 'default'),
+    'variable'  : ('light sky blue', 'default'),
+}
+
+_c_keywords = (
+    r'\b(?:auto|break|case|const|continue|default|do|else|enum|extern|for|'
+    r'goto|if|inline|register|restrict|return|sizeof|static|struct|switch|'
+    r'typedef|union|volatile|while|class|namespace|template|typename|public|'
+    r'private|protected|virtual|new|delete|using|try|catch|throw)\b'
+)
+_c_types = (
+    r'\b(?:void|char|short|int|long|float|double|signed|unsigned|bool|'
+    r'size_t|ssize_t|u?int(?:8|16|32|64)_t)\b'
+)
+_c_number = (
+    r'\b(?:0[xX][\da-fA-F]+|\d+\.?\d*(?:[eE][+-]?\d+)?)[uUlLfF]*\b'
+)
+
+# Each language maps lexer states to lists of rules (regex, token, state),
+# tried in order at each position of a line.  When a rule matches, its text
+# is displayed as `token` (None for plain text), and the lexer switches to
+# `state` if it is not None.  Every language starts each file in state 'root'.
+languages = {
+    'python' : {
+        'extensions' : ('.py', '.pyw', '.pyi'),
+        'states' : {
+            'root' : [
+                (r'#.*', 'comment', None),
+                (r'(?i:[rbuf]{0,2})"""', 'string', 'dq3'),
+                (r"(?i:[rbuf]{0,2})'''", 'string', 'sq3'),
+                (r'(?i:[rbuf]{0,2})"(?:[^"\\]|\\.)*"?', 'string', None),
+                (r"(?i:[rbuf]{0,2})'(?:[^'\\]|\\.)*'?", 'string', None),
+                (r'^\s*@[\w.]+', 'decorator', None),
+                (r'(?<=\bdef )\w+|(?<=\bclass )\w+', 'function', None),
+                (
+                    r'\b(?:and|as|assert|async|await|break|class|continue|def|'
+                    r'del|elif|else|except|finally|for|from|global|if|import|'
+                    r'in|is|lambda|nonlocal|not|or|pass|raise|return|try|'
+                    r'while|with|yield|match|case)\b',
+                    'keyword', None
+                ),
+                (r'\b(?:True|False|None|self|cls)\b', 'constant', None),
+                (
+                    r'\b(?:abs|all|any|bool|bytes|callable|dict|dir|divmod|'
+                    r'enumerate|filter|float|getattr|hasattr|hash|id|input|'
+                    r'int|isinstance|issubclass|iter|len|list|map|max|min|'
+                    r'next|object|open|print|property|range|repr|reversed|'
+                    r'round|set|setattr|slice|sorted|staticmethod|str|sum|'
+                    r'super|tuple|type|zip|classmethod)\b',
+                    'builtin', None
+                ),
+                (
+                    r'\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*\.?[\d_]*'
+                    r'(?:[eE][+-]?\d+)?[jJ]?)\b',
+                    'number', None
+                ),
+            ],
+            'dq3' : [
+                (r'(?:[^"\\]|\\.|"(?!""))*"""', 'string', 'root'),
+                (r'.+', 'string', None),
+            ],
+            'sq3' : [
+                (r"(?:[^'\\]|\\.|'(?!''))*'''", 'string', 'root'),
+                (r'.+', 'string', None),
+            ],
+        },
+    },
+    'c' : {
+        'extensions' : ('.c', '.h', '.cc', '.cpp', '.cxx', '.hpp', '.hh'),
+        'states' : {
+            'root' : [
+                (r'//.*', 'comment', None),
+                (r'/\*', 'comment', 'comment'),
+                (r'"(?:[^"\\]|\\.)*"?', 'string', None),
+                (r"'(?:[^'\\]|\\.)*'?", 'string', None),
+                (r'^\s*#\s*\w+', 'preproc', None),
+                (_c_keywords, 'keyword', None),
+                (_c_types, 'type', None),
+                (r'\b(?:true|false|NULL|nullptr)\b', 'constant', None),
+                (r'\b\w+(?=\s*\()', 'function', None),
+                (_c_number, 'number', None),
+            ],
+            'comment' : [
+                (r'.*?\*/', 'comment', 'root'),
+                (r'.+', 'comment', None),
+            ],
+        },
+    },
+    'javascript' : {
+        'extensions' : ('.js', '.mjs', '.cjs', '.ts', '.jsx', '.tsx'),
+        'states' : {
+            'root' : [
+                (r'//.*', 'comment', None),
+                (r'/\*', 'comment', 'comment'),
+                (r'"(?:[^"\\]|\\.)*"?', 'string', None),
+                (r"'(?:[^'\\]|\\.)*'?", 'string', None),
+                (r'`', 'string', 'template'),
+                (
+                    r'\b(?:async|await|break|case|catch|class|const|continue|'
+                    r'debugger|default|delete|do|else|export|extends|finally|'
+                    r'for|function|if|import|in|instanceof|let|new|of|return|'
+                    r'static|super|switch|throw|try|typeof|var|void|while|'
+                    r'with|yield|from|as|interface|type|enum)\b',
+                    'keyword', None
+                ),
+                (
+                    r'\b(?:true|false|null|undefined|this|NaN|Infinity)\b',
+                    'constant', None
+                ),
+                (r'\b\w+(?=\s*\()', 'function', None),
+                (
+                    r'\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*\.?[\d_]*'
+                    r'(?:[eE][+-]?\d+)?n?)\b',
+                    'number', None
+                ),
+            ],
+            'comment' : [
+                (r'.*?\*/', 'comment', 'root'),
+                (r'.+', 'comment', None),
+            ],
+            'template' : [
+                (r'(?:[^`\\]|\\.)*`', 'string', 'root'),
+                (r'.+', 'string', None),
+            ],
+        },
+    },
+    'json' : {
+        'extensions' : ('.json', '.geojson'),
+        'states' : {
+            'root' : [
+                (r'"(?:[^"\\]|\\.)*"(?=\s*:)', 'keyword', None),
+                (r'"(?:[^"\\]|\\.)*"?', 'string', None),
+                (r'\b(?:true|false|null)\b', 'constant', None),
+                (r'-?\b\d+\.?\d*(?:[eE][+-]?\d+)?\b', 'number', None),
+            ],
+        },
+    },
+    'shell' : {
+        'extensions' : ('.sh', '.bash', '.zsh'),
+        'states' : {
+            'root' : [
+                (r'(?<![\w$])#.*', 'comment', None),
+                (r'"(?:[^"\\]|\\.)*"?', 'string', None),
+                (r"'[^']*'?", 'string', None),
+                (r'\$\{[^}]*\}?|\$\w+|\$[@#?$!*\d-]', 'variable', None),
+                (
+                    r'\b(?:if|then|else|elif|fi|for|while|until|do|done|case|'
+                    r'esac|in|function|return|local|export|readonly|set|'
+                    r'unset|shift|source|exit)\b',
+                    'keyword', None
+                ),
+                (r'\b\d+\b', 'number', None),
+            ],
+        },
+    },
+}
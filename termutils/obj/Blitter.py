@@ -0,0 +1,96 @@
+from typing import Sequence
+
+class Blitter:
+
+    '''
+        Redraws a few animated matplotlib artists over a cached image of the
+        rest of a figure, so that an update only costs drawing those artists
+        and copying the result to the screen (blitting).
+
+        The artists are marked as animated, so that a normal draw of the figure
+        leaves them out.  After every full draw (including those caused by
+        resizing the window), the figure is cached as the background and the
+        artists are drawn over it.  Anything other than the artists that
+        changes, such as the axis limits or labels, requires a full draw with
+        `fig.canvas.draw()`.
+    '''
+
+    def __init__(
+    self, fig:'matplotlib.figure.Figure',
+    artists:Sequence['matplotlib.artist.Artist']) -> None:
+        '''
+            Prepares `artists`, which belong to `fig`, to be blitted.
+        '''
+        self._fig = fig
+        self._canvas = fig.canvas
+        self._artists = list(artists)
+        self._background = None
+        for artist in self._artists:
+            artist.set_animated(True)
+        self._cid = self._canvas.mpl_connect('draw_event', self._on_draw)
+
+    '''GETTERS'''
+
+    @property
+    def supported(self) -> bool:
+        '''
+            Returns True if the figure's canvas supports blitting.
+        '''
+        return bool(getattr(self._canvas, 'supports_blit', False))
+
+    '''SETTERS'''
+
+    def update(self) -> None:
+        '''
+            Redraws the artists over the cached background, or draws the whole
+            figure if there is no background yet or blitting is unsupported.
+        '''
+        if self._background is None or not self.supported:
+            self._canvas.draw()
+            return
+        self._canvas.restore_region(self._background)
+        self._draw_artists()
+        self._canvas.blit(self._fig.bbox)
+        self._canvas.flush_events()
+
+    def add(self, artist:'matplotlib.artist.Artist') -> None:
+        '''
+            Adds `artist` to those that are blitted.  Takes effect from the
+            next full draw, which caches a background without it.
+        '''
+        artist.set_animated(True)
+        self._artists.append(artist)
+
+    def remove(self, artist:'matplotlib.artist.Artist') -> None:
+        '''
+            Stops blitting `artist`, which should also be removed from the
+            figure, or drawn again with a full draw.
+        '''
+        self._artists.remove(artist)
+        artist.set_animated(False)
+
+    def close(self) -> None:
+        '''
+            Stops caching the background, and returns the artists to the
+            normal draw of the figure.
+        '''
+        self._canvas.mpl_disconnect(self._cid)
+        for artist in self._artists:
+            artist.set_animated(False)
+
+    '''PRIVATE METHODS'''
+
+    def _on_draw(self, event) -> None:
+        '''
+            Called after every full draw; caches the background and draws the
+            artists over it.
+        '''
+        self._background = self._canvas.copy_from_bbox(self._fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self) -> None:
+        '''
+            Draws the animated artists onto the canvas.
+        '''
+        for artist in self._artists:
+            self._fig.draw_artist(artist)
@@ -0,0 +1,92 @@
+from typing import Any, List
+import threading
+
+class Channel:
+
+    '''
+        Carries commands and snapshots of state from any number of threads to
+        a single receiving thread, which sleeps in `wait` until something new
+        arrives, rather than checking for it at intervals.
+
+        Commands sent with `send` are received in order, each once.  A
+        snapshot published with `publish` replaces the previous one, so that
+        the receiver only sees the latest state, however many changes were
+        made while it was busy; snapshots should not be modified once
+        published.  `notify` wakes the receiver without sending anything.
+    '''
+
+    def __init__(self, snapshot:Any = None) -> None:
+        '''
+            Creates a channel whose first snapshot is `snapshot`.
+        '''
+        self._condition = threading.Condition()
+        self._commands = []
+        self._snapshot = snapshot
+        # Incremented by every `send`, `publish` and `notify`, and the value
+        # it had when the receiver last woke
+        self._version = 0
+        self._seen = 0
+
+    '''GETTERS'''
+
+    @property
+    def snapshot(self) -> Any:
+        '''
+            Returns the latest snapshot published.
+        '''
+        return self._snapshot
+
+    def wait(self, timeout:float = None) -> bool:
+        '''
+            Sleeps until something is sent, published or notified after the
+            previous call returned, or for at most `timeout` seconds if it is
+            not None.  Returns False if the timeout ran out.
+        '''
+        with self._condition:
+            new = self._condition.wait_for(
+                lambda: self._version != self._seen, timeout
+            )
+            self._seen = self._version
+        return new
+
+    def receive(self) -> List[Any]:
+        '''
+            Returns the commands sent since the previous call, oldest first.
+        '''
+        with self._condition:
+            commands, self._commands = self._commands, []
+        return commands
+
+    '''SETTERS'''
+
+    def send(self, command:Any) -> None:
+        '''
+            Queues `command` for the receiver, and wakes it.
+        '''
+        with self._condition:
+            self._commands.append(command)
+            self._wake()
+
+    def publish(self, snapshot:Any) -> None:
+        '''
+            Replaces the snapshot with `snapshot`, and wakes the receiver.
+        '''
+        with self._condition:
+            self._snapshot = snapshot
+            self._wake()
+
+    def notify(self) -> None:
+        '''
+            Wakes the receiver.
+        '''
+        with self._condition:
+            self._wake()
+
+    '''PRIVATE METHODS'''
+
+    def _wake(self) -> None:
+        '''
+            Marks the channel as changed; called with the condition held.
+        '''
+        self._version += 1
+        self._condition.notify_all()
@@ -0,0 +1,403 @@
+from typing import Callable, Tuple, Union
+import io
+import os
+import select
+import socket
+import stat
+import threading
+import time
+
+import numpy as np
+
+from termutils.obj.RingBuffer import RingBuffer
+
+class DataSource:
+
+    '''
+        Reads numeric records from a stream in a background thread, and
+        appends them to a `RingBuffer`.
+
+        A record is a line of one or more numbers, separated by commas, tabs
+        or spaces.  With two or more numbers, the first two are the x and y of
+        a point (x being a timestamp in seconds, for instance).  With a single
+        number, it is the y of a point whose x is the time in seconds since the
+        source was started.  Lines that cannot be read as numbers, such as a
+        CSV header, are skipped.
+
+        The stream is read in chunks of up to `chunk_size` bytes, and all the
+        complete lines of a chunk are parsed together with `numpy.loadtxt`, so
+        that thousands of records cost a single call.  Subclasses define where
+        the chunks come from by implementing `_open`, `_read` and `_close`.
+    '''
+
+    def __init__(
+    self, capacity:int = 2**20, chunk_size:int = 2**18,
+    timeout:float = 0.1) -> None:
+        '''
+            Creates a source that stores up to `capacity` points, reads up to
+            `chunk_size` bytes at a time, and waits at most `timeout` seconds
+            for data before checking whether it was stopped.
+        '''
+        self._buffer = RingBuffer(capacity)
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+        self._thread = None
+        self._stopped = False
+        # The end of the last chunk, if it did not end with a line break
+        self._partial = b''
+        self._delimiter = None
+        # The number of numbers per record, set by the first record read
+        self._columns = None
+        self._t0 = None
+        self._t_last = 0.0
+        self._callback = None
+
+    '''GETTERS'''
+
+    @property
+    def buffer(self) -> RingBuffer:
+        '''
+            Returns the buffer to which points are appended.
+        '''
+        return self._buffer
+
+    @property
+    def running(self) -> bool:
+        '''
+            Returns True while the background thread is reading.
+        '''
+        return self._thread is not None and self._thread.is_alive()
+
+    '''SETTERS'''
+
+    def set_callback(self, callback:Callable[[], None]) -> None:
+        '''
+            Sets a function, taking no arguments, to call from the background
+            thread whenever points are appended to the buffer, so that readers
+            can sleep until there is new data; None removes it.
+        '''
+        self._callback = callback
+
+    def start(self) -> None:
+        '''
+            Opens the stream, so that errors such as a missing file are raised
+            here, and starts reading it in a background thread.
+        '''
+        if self.running:
+            msg = '\n\nThis DataSource is already running.'
+            raise RuntimeError(msg)
+        self._open()
+        self._stopped = False
+        self._t0 = time.monotonic() - self._t_last
+        self._thread = threading.Thread(target = self._run, daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        '''
+            Stops reading, and waits for the background thread to finish.
+        '''
+        self._stopped = True
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def feed(self, data:bytes) -> None:
+        '''
+            Parses the complete lines of `data`, following any incomplete line
+            left over from the previous call, and appends their points to the
+            buffer.
+        '''
+        data = self._partial + data
+        end = data.rfind(b'\n') + 1
+        self._partial = data[end:]
+        if end:
+            self._append(data[:end])
+
+    '''PRIVATE METHODS'''
+
+    def _run(self) -> None:
+        '''
+            Reads and parses chunks until the stream ends or `stop` is called.
+        '''
+        try:
+            while not self._stopped:
+                data = self._read(self._chunk_size)
+                if data is None:
+                    continue
+                elif not data:
+                    break
+                self.feed(data)
+            if self._partial:
+                self.feed(b'\n')
+        finally:
+            self._close()
+
+    def _append(self, lines:bytes) -> None:
+        '''
+            Parses `lines`, which end with a line break, and appends their
+            points to the buffer.
+        '''
+        if self._delimiter is None:
+            first = lines[:lines.find(b'\n')]
+            self._delimiter = ',' if b',' in first else ' '
+        if self._delimiter == ' ':
+            # Tabs and runs of spaces are all whitespace to `loadtxt`
+            delimiter = None
+        else:
+            delimiter = self._delimiter
+        try:
+            records = np.loadtxt(
+                io.BytesIO(lines), delimiter = delimiter, ndmin = 2
+            )
+        except ValueError:
+            records = self._parse_lines(lines, delimiter)
+        if records.size == 0:
+            return
+        if self._columns is None:
+            self._columns = records.shape[1]
+        elif records.shape[1] != self._columns:
+            records = self._parse_lines(lines, delimiter)
+            if records.size == 0:
+                return
+
+        if records.shape[1] >= 2:
+            x, y = records[:,0], records[:,1]
+        else:
+            # The records are spread evenly since the previous chunk
+            now = time.monotonic() - self._t0
+            y = records[:,0]
+            x = np.linspace(self._t_last, now, len(y) + 1)[1:]
+            self._t_last = now
+        self._buffer.extend(x, y)
+        if self._callback is not None:
+            self._callback()
+
+    def _parse_lines(self, lines:bytes, delimiter:str) -> np.ndarray:
+        '''
+            Parses `lines` one at a time, skipping those that are not numbers
+            or have a different number of columns than the first record.  Only
+            used for chunks that `numpy.loadtxt` cannot parse as a whole.
+        '''
+        records = []
+        columns = self._columns
+        for line in lines.split(b'\n'):
+            try:
+                values = [float(i) for i in line.split(
+                    None if delimiter is None else delimiter.encode()
+                )]
+            except ValueError:
+                continue
+            if values and columns is None:
+                columns = len(values)
+            if values and len(values) == columns:
+                records.append(values)
+        return np.array(records, dtype = np.float64).reshape(
+            len(records), columns or 0
+        )
+
+    def _open(self) -> None:
+        '''
+            Prepares the stream for reading; called by `start`.
+        '''
+
+    def _read(self, size:int) -> Union[bytes, None]:
+        '''
+            Returns up to `size` bytes from the stream, b'' if it has ended,
+            or None if no data arrived within the timeout.
+        '''
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        '''
+            Releases the stream; called in the background thread.
+        '''
+
+def _read_fd(fd:int, size:int, timeout:float) -> Union[bytes, None]:
+    '''
+        Reads up to `size` bytes from file descriptor `fd`, or returns None if
+        nothing can be read within `timeout` seconds.
+    '''
+    ready, _, _ = select.select([fd], [], [], timeout)
+    if not ready:
+        return None
+    return os.read(fd, size)
+
+class StdinSource(DataSource):
+
+    '''
+        Reads records from standard input, such as the output of a command
+        piped into the program.
+
+        Since LiveMenu puts standard input in raw mode and reads keys from the
+        terminal, piped data is read from a duplicate of the pipe, and
+        standard input is reopened on the controlling terminal, `/dev/tty`.
+    '''
+
+    def __init__(
+    self, capacity:int = 2**20, chunk_size:int = 2**18,
+    timeout:float = 0.1) -> None:
+        super().__init__(capacity, chunk_size, timeout)
+        self._fd = None
+
+    def _open(self) -> None:
+        if self._fd is not None:
+            return
+        elif os.isatty(0):
+            self._fd = 0
+            return
+        self._fd = os.dup(0)
+        try:
+            terminal = os.open('/dev/tty', os.O_RDWR)
+        except OSError as e:
+            os.close(self._fd)
+            self._fd = None
+            msg = (
+                f'\n\nStdinSource needs a terminal for input besides the '
+                f'data piped into standard input: {e.strerror}.'
+            )
+            raise RuntimeError(msg) from None
+        os.dup2(terminal, 0)
+        os.close(terminal)
+
+    def _read(self, size:int) -> Union[bytes, None]:
+        return _read_fd(self._fd, size, self._timeout)
+
+    def _close(self) -> None:
+        if self._fd not in (None, 0):
+            os.close(self._fd)
+        self._fd = None
+
+class FileSource(DataSource):
+
+    '''
+        Follows a CSV or TSV file as it grows, like `tail -f`.  If the file is
+        truncated or replaced, it is read again from its start.
+    '''
+
+    def __init__(
+    self, path:str, from_start:bool = True, capacity:int = 2**20,
+    chunk_size:int = 2**18, timeout:float = 0.1) -> None:
+        '''
+            Creates a source that follows the file at `path`, beginning at its
+            start if `from_start` is True, or at its current end otherwise.
+        '''
+        super().__init__(capacity, chunk_size, timeout)
+        self._path = path
+        self._from_start = from_start
+        self._file = None
+
+    def _open(self) -> None:
+        self._file = open(self._path, 'rb')
+        if not self._from_start:
+            self._file.seek(0, os.SEEK_END)
+
+    def _read(self, size:int) -> Union[bytes, None]:
+        data = self._file.read(size)
+        if data:
+            return data
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            stat = None
+        current = os.fstat(self._file.fileno())
+        if stat is not None and (
+            stat.st_ino != current.st_ino or stat.st_size < self._file.tell()
+        ):
+            # Truncated or replaced, as log files are when rotated
+            self._file.close()
+            self._file = open(self._path, 'rb')
+            self._partial = b''
+            return None
+        time.sleep(self._timeout)
+        return None
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class SocketSource(DataSource):
+
+    '''
+        Listens on a local socket, and reads records from each client that
+        connects to it, one client at a time.  The address is either a path,
+        for a UNIX socket, or a (host, port) tuple, for a TCP socket.
+    '''
+
+    def __init__(
+    self, address:Union[str, Tuple[str, int]], capacity:int = 2**20,
+    chunk_size:int = 2**18, timeout:float = 0.1) -> None:
+        '''
+            Creates a source that listens on `address`.
+        '''
+        super().__init__(capacity, chunk_size, timeout)
+        self._address = address
+        self._server = None
+        self._client = None
+        # True once this instance has bound a UNIX socket at the path, which
+        # it then removes when closed
+        self._bound = False
+
+    @property
+    def address(self) -> Union[str, Tuple[str, int]]:
+        '''
+            Returns the address listened on, with the port that was bound if
+            port 0 was requested.
+        '''
+        if self._server is not None:
+            return self._server.getsockname()
+        return self._address
+
+    def _open(self) -> None:
+        # Binding before `start` returns lets clients connect right away
+        if isinstance(self._address, str):
+            try:
+                mode = os.lstat(self._address).st_mode
+            except FileNotFoundError:
+                mode = None
+            if mode is not None and not stat.S_ISSOCK(mode):
+                msg = (
+                    f'\n\nCannot listen on `{self._address}`, since a file '
+                    f'that is not a socket already exists there.'
+                )
+                raise ValueError(msg)
+            elif mode is not None:
+                # A socket left behind by a previous run
+                os.unlink(self._address)
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(self._address)
+        self._bound = isinstance(self._address, str)
+        self._server.listen(1)
+
+    def _read(self, size:int) -> Union[bytes, None]:
+        if self._client is None:
+            ready, _, _ = select.select([self._server], [], [], self._timeout)
+            if ready:
+                self._client = self._server.accept()[0]
+            return None
+        data = _read_fd(self._client.fileno(), size, self._timeout)
+        if data == b'':
+            # The client disconnected, so the next one is waited for
+            self._client.close()
+            self._client = None
+            if self._partial:
+                self.feed(b'\n')
+            return None
+        return data
+
+    def _close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._bound:
+            self._bound = False
+            try:
+                os.unlink(self._address)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,217 @@
+from typing import Dict, List, Tuple, Union
+from functools import lru_cache
+import os
+import re
+
+from termutils.config.syntax import languages, theme
+from termutils.config.styles import styles
+from termutils.obj.TextBuffer import TextBuffer
+from termutils.obj.Color import Color
+from termutils.utils.cache import sized_cache
+
+@lru_cache(maxsize = None)
+def _compile(language:str) -> Dict[str, Tuple]:
+    '''
+        Combines the rules of each lexer state of a language into a single
+        regular expression, with one named group per rule.
+    '''
+    compiled = {}
+    for state, rules in languages[language]['states'].items():
+        pattern = '|'.join(f'(?P<r{n}>{rule[0]})' for n, rule in enumerate(rules))
+        compiled[state] = (
+            re.compile(pattern, re.MULTILINE),
+            tuple((token, new_state) for _, token, new_state in rules)
+        )
+    return compiled
+
+@lru_cache(maxsize = None)
+def _sgr(token:str) -> str:
+    '''
+        Returns the escape sequence that displays a token type in its color
+        and style from `config.syntax.theme`.
+    '''
+    color, style = theme[token]
+    r, g, b = Color.palette(color).rgb
+    return f'\033[{styles[style]};38;2;{r};{g};{b}m'
+
+def _lex_size(result:Tuple, language:str, state:str, line:str) -> int:
+    '''
+        Returns the size of a cached result of `_lex`, in characters: the
+        line, and each of its runs counted as 8, roughly the ratio of the
+        memory of a run to that of a character.
+    '''
+    return len(line) + 8*len(result[0])
+
+@sized_cache(2**21, _lex_size)
+def _lex(language:str, state:str, line:str) -> Tuple:
+    '''
+        Splits a line into styled runs, starting in lexer state `state`.
+        Returns the runs as (start, stop, escape sequence) tuples, and the
+        state at the end of the line.  Results are cached, within a limit on
+        their total size, so lines that are displayed repeatedly are only
+        lexed once.
+    '''
+    compiled = _compile(language)
+    runs = []
+    pos = 0
+    while pos < len(line):
+        pattern, rules = compiled[state]
+        match = pattern.search(line, pos)
+        if match is None:
+            break
+        token, new_state = rules[int(match.lastgroup[1:])]
+        start, stop = match.span()
+        if token is not None and stop > start:
+            runs.append((start, stop, _sgr(token)))
+        if new_state is not None:
+            state = new_state
+        elif stop == start:
+            stop += 1
+        pos = stop
+    return tuple(runs), state
+
+class Highlighter:
+
+    '''
+        Incremental syntax highlighter for a `TextBuffer`, using the rules in
+        `config.syntax`.
+
+        The lexer state at the start of each line is stored, so that any line
+        can be highlighted by lexing it alone.  States are only computed as
+        far as the lines that are requested, which for an editor are the lines
+        in view.  After an edit, the lines from the edited one onward are lexed
+        again only until a line ends in the same state as it did before the
+        edit, after which every stored state is known to be correct again.
+    '''
+
+    def __init__(self, buffer:TextBuffer, language:str) -> None:
+        '''
+            Creates a highlighter for `buffer`, which is written in `language`
+            (a key of `config.syntax.languages`).
+        '''
+        if language not in languages:
+            msg = (
+                f'\n\nArgument `language` in the instantiation of <class '
+                f'\'Highlighter\'> must be one of: '
+                f'{", ".join(languages)}; got `{language}`.'
+            )
+            raise ValueError(msg)
+
+        self._buffer = buffer
+        self._language = language
+        # `_states[i]` is the state at the start of line i, which is correct
+        # for every i <= `_valid`.  The states up to `_resume` were correct
+        # before the edits that ended at line `_edit_end`.
+        self._states = ['root']
+        self._valid = 0
+        self._resume = 0
+        self._edit_end = 0
+        buffer.subscribe(self._on_edit)
+
+    @classmethod
+    def for_path(
+    cls, buffer:TextBuffer, path:str) -> Union['Highlighter', None]:
+        '''
+            Returns a highlighter for the language of the file at `path`,
+            recognized by its extension, or None if it is not supported.
+        '''
+        extension = os.path.splitext(path)[1].lower()
+        for language, definition in languages.items():
+            if extension in definition['extensions']:
+                return cls(buffer, language)
+        return None
+
+    '''GETTERS'''
+
+    @property
+    def language(self) -> str:
+        '''
+            Returns the name of the language being highlighted.
+        '''
+        return self._language
+
+    def states(self, start:int, stop:int) -> List[str]:
+        '''
+            Returns the lexer states at the start of lines `start` to `stop`,
+            lexing any lines before them whose state is not known.
+        '''
+        stop = min(stop, self._buffer.line_count)
+        if stop <= start:
+            return []
+        self._ensure(stop - 1)
+        return self._states[start:stop]
+
+    def runs(self, row:int, line:str = None) -> Tuple[Tuple]:
+        '''
+            Returns the styled runs of line `row` as (start, stop, escape
+            sequence) tuples.  `line` may be given if it was already read.
+        '''
+        self._ensure(row)
+        if line is None:
+            line = self._buffer.line(row)
+        return _lex(self._language, self._states[row], line)[0]
+
+    '''SETTERS'''
+
+    def close(self) -> None:
+        '''
+            Stops tracking the edits made to the buffer.
+        '''
+        self._buffer.unsubscribe(self._on_edit)
+
+    '''PRIVATE METHODS'''
+
+    def _ensure(self, row:int) -> None:
+        '''
+            Lexes lines until the state at the start of line `row` is known.
+        '''
+        while self._valid < row:
+            k = self._valid
+            states = self._states
+            for line in self._buffer.lines(k, row):
+                end = _lex(self._language, states[k], line)[1]
+                k += 1
+                if k < len(states) and k > self._edit_end and k < self._resume:
+                    if states[k] == end:
+                        # The lexer has caught up with its previous run
+                        self._valid = self._resume
+                        break
+                if k < len(states):
+                    states[k] = end
+                else:
+                    states.append(end)
+                self._valid = k
+            if self._valid >= self._resume:
+                self._resume = self._valid
+
+    def _on_edit(self, offset:int, row:int, removed:str, inserted:str) -> None:
+        '''
+            Called by the buffer after each edit; discards the states of the
+            edited lines, and keeps the others for comparison.
+        '''
+        n_removed = removed.count('\n')
+        n_inserted = inserted.count('\n')
+        net = n_inserted - n_removed
+
+        def shift(line:int) -> int:
+            # Maps a line index from before the edit to after it, or to the
+            # edited line if it was inside the edit.
+            return line + net if line > row + n_removed else min(line, row)
+
+        if row + 1 < len(self._states):
+            self._states[row+1:row+1+n_removed] = [None]*n_inserted
+        if self._edit_end < self._valid:
+            # The lexer has passed the end of the earlier edits without
+            # catching up with its previous run, so the states after
+            # `_valid` can only be compared with if the edit comes after it.
+            if row < self._valid:
+                self._resume = shift(self._valid)
+            else:
+                self._resume = shift(self._resume)
+            self._edit_end = row + n_inserted
+        else:
+            self._resume = shift(max(self._resume, self._valid))
+            self._edit_end = max(shift(self._edit_end), row + n_inserted)
+        self._valid = min(self._valid, row)
+        # States after `_resume` cannot be trusted, even if lexing converges
+        del self._states[self._resume+1:]
@@ -14,6 +14,20 @@ from termutils.config.defaults import (
     term_rows, term_cols, term_fd, term_settings
 )
 
+# Sequences around text pasted while bracketed paste mode is enabled
+_paste_start = b'\033[200~'
+_paste_end = b'\033[201~'
+
+class Paste(str):
+
+    '''
+        Text pasted into the terminal, which the default listener of LiveMenu
+        adds to the key history as a single event rather than one key at a
+        time.  Line breaks are normalized to '\n'.
+    '''
+
+    pass
+
 class LiveMenu:
 
     '''
@@ -29,6 +43,7 @@ class LiveMenu:
     _fd = term_fd                   # sys.stdin.fileno()
     _old_settings = term_settings   # termios.tcgetattr(_fd)
     _raw_mode = False
+    _unread = b''                   # Input read past the end of a paste
 
     '''CONSTRUCTOR'''
 
@@ -214,41 +229,62 @@ class LiveMenu:
 
             Expects `_raw_mode` to be True, implying the terminal will read user
             inputs immediately without echoing to the terminal.
+
+            Enables bracketed paste mode, so that pasted text is appended as a
+            single `Paste` instead of a flood of keypresses.
         '''
         escape_hitcount = 0
         try:
-            print('\033[?1002h', end = '', flush = True)
+            print('\033[?1002h\033[?2004h', end = '', flush = True)
             while not self._kill:
                 output = self._get_input()
-                if output == 'Esc':
+                if output == 'Esc' and not isinstance(output, Paste):
                     if escape_hitcount < self._escape_hits - 1:
                         escape_hitcount += 1
                         continue
                     else:
                         self._key_history.append('Kill')
+                        self._on_input()
                         break
-                elif escape_hitcount > 0 and output != 'Esc':
+                elif escape_hitcount > 0:
                     escape_hitcount = 0
                 if isinstance(output, str):
                     self._key_history.append(output)
                 elif isinstance(output, dict):
                     self._btn_history.append(output)
+                self._on_input()
         except Exception as e:
-            print('\033[?1002l', end = '', flush = True)
+            print('\033[?1002l\033[?2004l', end = '', flush = True)
             raise Exception(e)
-        print('\033[?1002l', end = '', flush = True)
+        print('\033[?1002l\033[?2004l', end = '', flush = True)
+
+    def _on_input(self) -> None:
+        '''
+            Called by the default listener after each input it adds to the
+            key or button history.  Does nothing by default; subclasses may
+            override it to wake the writer instead of having it poll.
+        '''
+        pass
 
     @classmethod
     def _get_input(cls) -> Union[str,Dict[str,Union[str,int]]]:
         '''
             Listens for keyboard or mouse input, and returns a string with a
             key name (such as `a`, `Z`, or `Backspace`) or a dictionary with
-            information about how the mouse was clicked, and where.
+            information about how the mouse was clicked, and where.  Pasted
+            text is returned as an instance of `Paste`.
 
             Expects `_raw_mode` to be True, implying the terminal will read user
             inputs immediately without echoing to the terminal.
         '''
-        key = os.read(1,10).decode()
+        if cls._unread:
+            data, cls._unread = cls._unread, b''
+        else:
+            data = os.read(1,10)
+        if data.startswith(_paste_start):
+            return cls._read_paste(data)
+
+        key = data.decode()
         if key in keys_dict.keys():
             output = keys_dict[str(key)]
         elif len(repr(key)) == 3:
@@ -258,6 +294,29 @@ class LiveMenu:
 
         return output
 
+    @classmethod
+    def _read_paste(cls, data:bytes) -> Paste:
+        '''
+            Reads the rest of a bracketed paste, given the input read so far
+            (which begins with the start sequence), and returns its text.
+        '''
+        chunks = [data[len(_paste_start):]]
+        tail = chunks[0]
+        while _paste_end not in tail:
+            chunk = os.read(1, 2**16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            # The end sequence may be split between reads
+            tail = tail[-len(_paste_end):] + chunk
+        data = b''.join(chunks)
+        stop = data.find(_paste_end)
+        if stop >= 0:
+            cls._unread = data[stop + len(_paste_end):]
+            data = data[:stop]
+        text = data.decode(errors = 'replace')
+        return Paste(text.replace('\r\n', '\n').replace('\r', '\n'))
+
     @classmethod
     def _process_click(cls, output) -> Dict[str, Union[str,int]]:
         '''
@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from typing import Dict, Sequence, Tuple
+import threading
+
+import numpy as np
+
+from termutils.utils.expression import compile_expression
+
+class ParameterSweep:
+
+    '''
+        The values of an expression of `x` and free parameters, such as
+        `sin(a*x)`, over a grid of values of each parameter: one frame of y
+        values per point of the grid.
+
+        Frames are not computed one at a time.  The grid is flattened, and a
+        block of consecutive grid points is evaluated as a single broadcasted
+        numpy computation, with `x` along one axis and the grid points along
+        the other.  If every frame fits within `memory_limit` bytes, the whole
+        grid is one block; otherwise blocks of a quarter of the limit are
+        evaluated when first needed, and the four most recently used are kept.
+        Once its block is computed, a frame is just a row of it, so stepping
+        through the values of the last parameter, whose frames are adjacent,
+        costs an array index.
+    '''
+
+    def __init__(
+    self, eqn:str, x:np.ndarray, parameters:Dict[str, Sequence[float]],
+    memory_limit:int = 2**27) -> None:
+        '''
+            Prepares to evaluate expression `eqn` at the points `x`, for every
+            combination of the values of `parameters`, which maps the name of
+            each free parameter of `eqn` to its values.  Raises a ValueError
+            if `eqn` is not a valid expression of `x` and those parameters.
+        '''
+        self._eqn = eqn
+        self._x = np.asarray(x, dtype = np.float64)
+        self._values = {
+            name:np.asarray(values, dtype = np.float64).ravel()
+            for name, values in parameters.items()
+        }
+        if any(len(values) == 0 for values in self._values.values()):
+            msg = (
+                f'\n\nArgument `parameters` in the instantiation of <class '
+                f'\'ParameterSweep\'> must give at least one value for each '
+                f'parameter.'
+            )
+            raise ValueError(msg)
+        self._function = compile_expression(eqn, ('x',) + tuple(self._values))
+        self._shape = tuple(len(values) for values in self._values.values())
+        self._size = int(np.prod(self._shape, dtype = np.int64))
+
+        frame_bytes = max(8*len(self._x), 1)
+        if self._size*frame_bytes <= memory_limit:
+            self._block = self._size
+        else:
+            self._block = max(memory_limit//(4*frame_bytes), 1)
+        self._cached = max(memory_limit//(self._block*frame_bytes), 1)
+        # Evaluated blocks of frames by block number, least recently used
+        # first
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    '''GETTERS'''
+
+    @property
+    def eqn(self) -> str:
+        '''
+            Returns the expression evaluated.
+        '''
+        return self._eqn
+
+    @property
+    def x(self) -> np.ndarray:
+        '''
+            Returns the points at which the expression is evaluated.
+        '''
+        return self._x
+
+    @property
+    def values(self) -> Dict[str, np.ndarray]:
+        '''
+            Returns the values of each parameter, by name, in the order of the
+            axes of the grid.
+        '''
+        return dict(self._values)
+
+    @property
+    def shape(self) -> Tuple[int]:
+        '''
+            Returns the number of values of each parameter.
+        '''
+        return self._shape
+
+    def __len__(self) -> int:
+        '''
+            Returns the number of frames, one per point of the grid.
+        '''
+        return self._size
+
+    def ready(self, index:Sequence[int]) -> bool:
+        '''
+            Returns True if the frame at `index` is already evaluated, so that
+            `frame` returns it without computing anything.
+        '''
+        return self._locate(index)[0] in self._blocks
+
+    def frame(self, index:Sequence[int]) -> np.ndarray:
+        '''
+            Returns the y values for the grid point at `index`, which holds
+            the index of the value of each parameter.  The array is shared
+            with the cache, and must not be modified.  May be called from any
+            thread.
+        '''
+        number, row = self._locate(index)
+        with self._lock:
+            block = self._blocks.get(number)
+            if block is None:
+                block = self._evaluate(number)
+                self._blocks[number] = block
+                while len(self._blocks) > self._cached:
+                    self._blocks.popitem(last = False)
+            else:
+                self._blocks.move_to_end(number)
+        return block[row]
+
+    '''PRIVATE METHODS'''
+
+    def _locate(self, index:Sequence[int]) -> Tuple[int]:
+        '''
+            Returns the number of the block holding the frame at `index`, and
+            its row in the block.
+        '''
+        if self._shape:
+            flat = int(np.ravel_multi_index(tuple(index), self._shape))
+        else:
+            flat = 0
+        return divmod(flat, self._block)
+
+    def _evaluate(self, number:int) -> np.ndarray:
+        '''
+            Returns the frames of block `number`, as an array with one row per
+            grid point, evaluated all at once.
+        '''
+        start = number*self._block
+        stop = min(start + self._block, self._size)
+        if self._shape:
+            grid = np.unravel_index(np.arange(start, stop), self._shape)
+        else:
+            grid = ()
+        args = [
+            values[indices][:,None]
+            for values, indices in zip(self._values.values(), grid)
+        ]
+        return self._function(self._x[None,:], *args)
@@ -0,0 +1,345 @@
+from typing import Dict, Sequence, Tuple, Union
+import io
+import os
+import queue
+import threading
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.image as mpimg
+import numpy as np
+
+from termutils.utils import decimate, raster
+
+class PlotExporter:
+
+    '''
+        Writes plots of named series of points to image, text and data files,
+        without a display.  The format is chosen by the file extension:
+
+            .png, .jpg, .tif   Rendered with matplotlib's Agg backend
+            .svg, .pdf, .eps   Rendered with matplotlib's vector backends
+            .txt, .ans         Rendered with `utils.raster`, without and with
+                               color escape sequences
+            .csv               Columns x,y (or series,x,y for several series)
+            .npy               An array of shape (2, n), or (k, 2, n) for k
+                               series of the same length
+            .npz               Arrays `<name>_x` and `<name>_y` per series
+
+        The same figure is reused for every export, so that exporting many
+        frames only costs rendering each one.  Rendering happens in the calling
+        thread, since the figure is reused, while encoding and writing files
+        happens in a background thread.  Errors from the background thread
+        are raised by the next call to `export` or by `close`.
+    '''
+
+    # The format passed to `imsave` for each extension, which PIL does not
+    # always recognize by itself (e.g. `.tif`)
+    _image_formats = {
+        '.png':'png', '.jpg':'jpeg', '.jpeg':'jpeg', '.tif':'tiff',
+        '.tiff':'tiff'
+    }
+    _vector_formats = ('.svg', '.pdf', '.eps')
+    _text_formats = ('.txt', '.ans')
+    _data_formats = ('.csv', '.npy', '.npz')
+
+    def __init__(
+    self, subplots:Sequence[int] = (1, 1),
+    figsize:Sequence[float] = (6.4, 4.8), dpi:float = 100,
+    text_size:Sequence[int] = (24, 80),
+    text_mode:str = 'braille', decimation:bool = True) -> None:
+        '''
+            Creates an exporter whose figures have the given grid of
+            `subplots`, size in inches `figsize` and resolution `dpi`, and
+            whose text renders have `text_size` (rows, columns) characters
+            drawn in `text_mode` ('braille' or 'halfblock').  If `decimation`
+            is True, images are drawn from the data reduced to their pixel
+            width with `utils.decimate.minmax`, which does not change them.
+        '''
+        if text_mode not in raster.cell_shapes:
+            msg = (
+                f'\n\nArgument `text_mode` in the instantiation of <class '
+                f'\'PlotExporter\'> must be one of: '
+                f'{", ".join(raster.cell_shapes)}; got `{text_mode}`.'
+            )
+            raise ValueError(msg)
+        self._subplots = tuple(subplots)
+        self._text_size = tuple(text_size)
+        self._text_mode = text_mode
+        self._decimation = decimation
+        self._title = ''
+        self._xlabel = ''
+        self._ylabel = ''
+        self._grid = True
+
+        self._fig = Figure(figsize = figsize, dpi = dpi)
+        self._canvas = FigureCanvasAgg(self._fig)
+        n_rows, n_cols = self._subplots
+        self._axes = [
+            self._fig.add_subplot(n_rows, n_cols, n + 1)
+            for n in range(n_rows*n_cols)
+        ]
+        self._lines = {}
+        # Functions that write files, run in order by `_thread`
+        self._queue = queue.Queue()
+        self._thread = None
+        self._error = None
+
+    '''GETTERS'''
+
+    @property
+    def figure(self) -> Figure:
+        '''
+            Returns the figure that images are rendered with.
+        '''
+        return self._fig
+
+    '''SETTERS'''
+
+    def set_labels(
+    self, title:str = None, xlabel:str = None, ylabel:str = None,
+    grid:bool = None) -> None:
+        '''
+            Sets the labels and grid of the exported plots; arguments left as
+            None are unchanged.
+        '''
+        if title is not None:
+            self._title = title
+        if xlabel is not None:
+            self._xlabel = xlabel
+        if ylabel is not None:
+            self._ylabel = ylabel
+        if grid is not None:
+            self._grid = grid
+
+    def export(
+    self, path:str,
+    series:Dict[str, Union[Tuple[np.ndarray], Tuple]]) -> None:
+        '''
+            Writes the plot or data of `series` to `path`.  `series` maps each
+            name to its (x, y) arrays, or to (x, y, subplot) to place it on a
+            subplot other than the first.  The arrays are not copied, and must
+            not be modified until the file is written (see `close`).
+        '''
+        self._raise_error()
+        extension = os.path.splitext(path)[1].lower()
+        entries = {}
+        for name, data in series.items():
+            x, y = (np.asarray(i, dtype = np.float64) for i in data[:2])
+            subplot = data[2] if len(data) > 2 else 0
+            entries[name] = (x, y, subplot)
+
+        if extension in self._image_formats:
+            self._render(entries)
+            self._canvas.draw()
+            # The pixels are copied, and encoded in the background
+            pixels = np.array(self._canvas.buffer_rgba())
+            self._submit(
+                self._write_image, path, pixels,
+                self._image_formats[extension]
+            )
+        elif extension in self._vector_formats:
+            self._render(entries)
+            # Rendering to a vector format is drawing the figure
+            data = io.BytesIO()
+            self._fig.savefig(data, format = extension[1:])
+            self._submit(self._write_bytes, path, data.getvalue())
+        elif extension in self._text_formats:
+            text = self._render_text(entries, color = extension == '.ans')
+            self._submit(self._write_bytes, path, text.encode())
+        elif extension in self._data_formats:
+            self._submit(self._write_data, path, extension, entries)
+        else:
+            formats = (
+                tuple(self._image_formats) + self._vector_formats +
+                self._text_formats + self._data_formats
+            )
+            msg = (
+                f'\n\nCannot export to `{path}`; the extension must be one '
+                f'of: {", ".join(formats)}.'
+            )
+            raise ValueError(msg)
+
+    def close(self) -> None:
+        '''
+            Waits until every file is written.
+        '''
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    def __enter__(self) -> 'PlotExporter':
+        return self
+
+    def __exit__(self, type, value, tb) -> None:
+        self.close()
+
+    '''PRIVATE METHODS'''
+
+    def _render(self, entries:dict) -> None:
+        '''
+            Updates the figure to show `entries`, reusing the line of each
+            series that was already drawn, without drawing it.
+        '''
+        for name in [name for name in self._lines if name not in entries]:
+            self._lines.pop(name).remove()
+        for name, (x, y, subplot) in entries.items():
+            line = self._lines.get(name)
+            if line is not None and line.axes is not self._axes[subplot]:
+                line.remove()
+                line = None
+            if line is None:
+                line, = self._axes[subplot].plot([], [], label = name)
+                self._lines[name] = line
+
+        for index, ax in enumerate(self._axes):
+            members = [
+                (name, x, y) for name, (x, y, subplot) in entries.items()
+                if subplot == index
+            ]
+            limits = [raster.data_limits(x, y) for name, x, y in members]
+            limits = [limit for limit in limits if limit is not None]
+            xlim = (
+                min(limit[0][0] for limit in limits),
+                max(limit[0][1] for limit in limits)
+            ) if limits else None
+            width = int(ax.get_window_extent().width)
+            for name, x, y in members:
+                if self._decimation and xlim is not None:
+                    x, y = decimate.minmax(x, y, xlim, width)
+                self._lines[name].set_data(x, y)
+            ax.relim()
+            if xlim is not None:
+                ax.set_xlim(*xlim)
+            ax.autoscale_view(True, True, True)
+            ax.grid(self._grid)
+            ax.set_xlabel(self._xlabel)
+            ax.set_ylabel(self._ylabel)
+            legend = ax.get_legend()
+            if legend is not None:
+                legend.remove()
+            if len(members) > 1:
+                ax.legend()
+        if len(self._axes) == 1:
+            self._axes[0].set_title(self._title)
+        else:
+            self._fig.suptitle(self._title)
+
+    def _render_text(self, entries:dict, color:bool) -> str:
+        '''
+            Returns `entries` drawn with `utils.raster`, with a grid of
+            subplots like the figure's.
+        '''
+        rows, cols = self._text_size
+        n_rows, n_cols = self._subplots
+        title = self._title
+        lines = []
+        if n_rows*n_cols > 1 and title:
+            lines.append(title[:cols].center(cols))
+            title = ''
+            rows -= 1
+        height, width = rows//n_rows, cols//n_cols
+        palette = raster.line_colors
+
+        blocks = []
+        for index in range(n_rows*n_cols):
+            data = [
+                (x, y, palette[n % len(palette)] if color else '')
+                for n, (x, y, subplot) in enumerate(entries.values())
+                if subplot == index
+            ]
+            limits = [raster.data_limits(x, y) for x, y, c in data]
+            limits = raster.autoscale([limit for limit in limits if limit])
+            if limits is None:
+                blocks.append([' '*width]*height)
+                continue
+            blocks.append(raster.render(
+                data, *limits, height, width, mode = self._text_mode,
+                title = title, xlabel = self._xlabel, ylabel = self._ylabel,
+                grid = self._grid
+            ))
+        for row in range(n_rows):
+            row_blocks = blocks[row*n_cols:(row+1)*n_cols]
+            lines.extend(''.join(parts).rstrip() for parts in zip(*row_blocks))
+        return '\n'.join(lines) + '\n'
+
+    def _submit(self, function, *args) -> None:
+        '''
+            Queues `function(*args)` to run in the background thread.
+        '''
+        if self._thread is None:
+            self._thread = threading.Thread(target = self._work, daemon = True)
+            self._thread.start()
+        self._queue.put((function, args))
+
+    def _work(self) -> None:
+        '''
+            Runs queued functions until `close` queues None.
+        '''
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            function, args = task
+            try:
+                function(*args)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+
+    def _raise_error(self) -> None:
+        '''
+            Raises the first error from the background thread, if any.
+        '''
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @staticmethod
+    def _write_image(path:str, pixels:np.ndarray, format:str) -> None:
+        mpimg.imsave(path, pixels, format = format)
+
+    @staticmethod
+    def _write_bytes(path:str, data:bytes) -> None:
+        with open(path, 'wb') as outfile:
+            outfile.write(data)
+
+    @staticmethod
+    def _write_data(path:str, extension:str, entries:dict) -> None:
+        '''
+            Writes the points of `entries` to `path` as CSV, .npy or .npz.
+        '''
+        if extension == '.npz':
+            arrays = {}
+            for name, (x, y, subplot) in entries.items():
+                arrays[f'{name}_x'] = x
+                arrays[f'{name}_y'] = y
+            np.savez(path, **arrays)
+        elif extension == '.npy':
+            arrays = [np.stack((x, y)) for x, y, subplot in entries.values()]
+            if len(arrays) == 1:
+                np.save(path, arrays[0])
+            elif len({array.shape for array in arrays}) == 1:
+                np.save(path, np.stack(arrays))
+            else:
+                msg = (
+                    f'\n\nCannot export series of different lengths to '
+                    f'`{path}`; use .npz instead.'
+                )
+                raise ValueError(msg)
+        elif len(entries) == 1:
+            x, y, subplot = next(iter(entries.values()))
+            np.savetxt(
+                path, np.column_stack((x, y)), delimiter = ',',
+                header = 'x,y', comments = '', fmt = '%.17g'
+            )
+        else:
+            with open(path, 'w') as outfile:
+                outfile.write('series,x,y\n')
+                for name, (x, y, subplot) in entries.items():
+                    np.savetxt(
+                        outfile, np.column_stack((x, y)), delimiter = ',',
+                        fmt = name.replace('%', '%%') + ',%.17g,%.17g'
+                    )
@@ -0,0 +1,124 @@
+from typing import Tuple
+import threading
+
+import numpy as np
+
+class RingBuffer:
+
+    '''
+        A fixed-size buffer of (x, y) points, allocated once, to which new
+        points are appended in blocks while the oldest are overwritten.
+
+        One thread may append while others read: both hold a lock only for as
+        long as it takes to copy the points, and a counter is incremented with
+        every append, so that readers can tell when there is new data.  The x
+        values are expected to increase, as timestamps do, so that the points
+        within a span of x are found by binary search.
+    '''
+
+    def __init__(self, capacity:int) -> None:
+        '''
+            Allocates room for `capacity` points.
+        '''
+        if capacity <= 0:
+            msg = (
+                f'\n\nArgument `capacity` in the instantiation of <class '
+                f'\'RingBuffer\'> must be a positive integer.'
+            )
+            raise ValueError(msg)
+        self._x = np.empty(capacity, dtype = np.float64)
+        self._y = np.empty(capacity, dtype = np.float64)
+        # Index of the oldest point, and the number of points stored
+        self._start = 0
+        self._size = 0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    '''GETTERS'''
+
+    @property
+    def capacity(self) -> int:
+        '''
+            Returns the maximum number of points stored.
+        '''
+        return len(self._x)
+
+    @property
+    def version(self) -> int:
+        '''
+            Returns the number of appends made so far.
+        '''
+        return self._version
+
+    def __len__(self) -> int:
+        '''
+            Returns the number of points stored.
+        '''
+        return self._size
+
+    def window(self, span:float = None) -> Tuple[np.ndarray]:
+        '''
+            Returns copies of the x and y values of the stored points, oldest
+            first.  If `span` is given, only the points whose x is within
+            `span` of the newest are returned.
+        '''
+        with self._lock:
+            segments = self._segments()
+            if span is not None and self._size:
+                last = segments[-1]
+                cutoff = self._x[last.stop-1] - span
+                # Only the newest segment is searched, unless it begins after
+                # the cutoff
+                if len(segments) == 2 and self._x[last.start] <= cutoff:
+                    segments = [last]
+                first = segments[0]
+                i = np.searchsorted(self._x[first], cutoff, side = 'left')
+                segments[0] = slice(first.start + int(i), first.stop)
+            x = np.concatenate([self._x[s] for s in segments])
+            y = np.concatenate([self._y[s] for s in segments])
+        return x, y
+
+    '''SETTERS'''
+
+    def extend(self, x:np.ndarray, y:np.ndarray) -> None:
+        '''
+            Appends the points (`x`, `y`), overwriting the oldest points once
+            the buffer is full.
+        '''
+        capacity = self.capacity
+        n = len(x)
+        if n > capacity:
+            x, y, n = x[-capacity:], y[-capacity:], capacity
+        with self._lock:
+            end = (self._start + self._size) % capacity
+            first = min(n, capacity - end)
+            self._x[end:end+first] = x[:first]
+            self._y[end:end+first] = y[:first]
+            self._x[:n-first] = x[first:]
+            self._y[:n-first] = y[first:]
+            overflow = self._size + n - capacity
+            if overflow > 0:
+                self._start = (self._start + overflow) % capacity
+            self._size = min(self._size + n, capacity)
+            self._version += 1
+
+    def clear(self) -> None:
+        '''
+            Removes every point.
+        '''
+        with self._lock:
+            self._start = 0
+            self._size = 0
+            self._version += 1
+
+    '''PRIVATE METHODS'''
+
+    def _segments(self) -> list:
+        '''
+            Returns the slices of the arrays that hold the stored points,
+            oldest first.
+        '''
+        end = self._start + self._size
+        if end <= self.capacity:
+            return [slice(self._start, end)]
+        return [slice(self._start, self.capacity), slice(0, end - self.capacity)]
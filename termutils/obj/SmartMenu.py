@@ -1,13 +1,190 @@
+from typing import Callable, Union, Dict, Tuple
+import time
+
+import numpy as np
+
+from termutils.obj.widgets import Button, Display, Widget
+from termutils.obj.LiveMenu import LiveMenu
+
 class SmartMenu(LiveMenu):
     '''
         A smarter frontend variant of `LiveMenu` which automates many of the
         processes involved in creating a `LiveMenu` for simple usage.
+
+        Widgets are declared once via `add_widget`, `new_button`,
+        `new_display` or `new_widget`, after which `SmartMenu` routes mouse
+        events to them and rewrites only the widgets whose state has changed.
     '''
 
-    def __init__(self, rows:int = None, cols:int = None):
+    def __init__(
+    self, rows:int = None, cols:int = None, dt:float = 0.01,
+    escape_hits:int = 15) -> None:
         '''
             Returns an instance of `SmartMenu`.
         '''
-        super().__init__(rows = rows, cols = cols)
+        super().__init__(rows = rows, cols = cols, escape_hits = escape_hits)
+        self._dt = dt
+        self._widgets = []
+        self._key_bindings = {}
+        self._pressed = None
+
+        # Maps each terminal cell to the index of its topmost widget, or -1.
+        self._hit_index = np.full(self._dims, -1, dtype = np.int64)
+
+    '''GETTERS'''
+
+    @property
+    def widgets(self) -> Tuple[Widget]:
+        '''
+            Returns the widgets managed by this instance, in drawing order.
+        '''
+        return tuple(self._widgets)
+
+    def widget_at(self, x:int, y:int) -> Union[Widget, None]:
+        '''
+            Returns the topmost widget covering terminal coordinate (x, y), or
+            None if there is no widget there.
+        '''
+        if not (0 <= y < self._dims[0] and 0 <= x < self._dims[1]):
+            return None
+        idx = self._hit_index[y, x]
+        if idx < 0:
+            return None
+        return self._widgets[idx]
+
+    '''SETTERS'''
+
+    def add_widget(self, widget:Widget) -> Widget:
+        '''
+            Adds an existing widget to the menu.  Widgets added later are drawn
+            on top of, and receive clicks before, those added earlier.
+        '''
+        if not isinstance(widget, Widget):
+            msg = (
+                f'\n\nMethod `add_widget` of <class \'SmartMenu\'> expects an '
+                f'instance of <class \'Widget\'>, got {type(widget)}.'
+            )
+            raise TypeError(msg)
+
+        y0, x0, y1, x1 = widget.limits
+        self._hit_index[y0:y1, x0:x1] = len(self._widgets)
+        self._widgets.append(widget)
+        widget.touch()
+        return widget
+
+    def new_button(
+    self, x0:int, y0:int, x1:int, y1:int, text:str, on_click:Callable = None,
+    **kwargs) -> Button:
+        '''
+            Creates a new instance of `Button` and adds it to the menu.
+            Keyword arguments are passed on to the `Button` constructor.
+        '''
+        return self.add_widget(
+            Button(x0, y0, x1, y1, text, on_click = on_click, **kwargs)
+        )
+
+    def new_display(
+    self, x0:int, y0:int, x1:int, y1:int, text:str = '', **kwargs) -> Display:
+        '''
+            Creates a new instance of `Display` and adds it to the menu.
+            Keyword arguments are passed on to the `Display` constructor.
+        '''
+        display = Display(x0, y0, x1, y1, **kwargs)
+        display(text)
+        return self.add_widget(display)
+
+    def new_widget(
+    self, x0:int, y0:int, x1:int, y1:int, text:str = '', **kwargs) -> Widget:
+        '''
+            Creates a new instance of `Widget` and adds it to the menu.
+            Keyword arguments are passed on to the `Widget` constructor.
+        '''
+        widget = Widget(y0, x0, y1, x1, **kwargs)
+        widget(text)
+        return self.add_widget(widget)
 
-    def new_button(self, x0:int, y0:int, x1:int, y1:int):
+    def bind_key(self, key:str, callback:Callable) -> None:
+        '''
+            Runs `callback(key)` whenever the given key is pressed.
+        '''
+        self._key_bindings[key] = callback
+
+    def redraw(self) -> None:
+        '''
+            Flags every widget to be rewritten on the next frame.
+        '''
+        for widget in self._widgets:
+            widget.touch()
+
+    '''RUNTIME'''
+
+    def __call__(self) -> None:
+        '''
+            Main loop which dispatches user inputs to the declared widgets and
+            rewrites the widgets that have changed.
+        '''
+        print('\033[?25l', end = '', flush = True)
+
+        active = True
+        key_idx = 0
+        btn_idx = 0
+
+        while active:
+
+            while key_idx <= len(self._key_history) - 1:
+                key = self._key_history[key_idx]
+                key_idx += 1
+                if key == 'Kill':
+                    self._kill = True
+                    active = False
+                    break
+                elif key in self._key_bindings:
+                    self._key_bindings[key](key)
+
+            while btn_idx <= len(self._btn_history) - 1:
+                self._process_btn(self._btn_history[btn_idx])
+                btn_idx += 1
+
+            self._render()
+
+            time.sleep(self._dt)
+
+        print('\033[?25h', end = '', flush = True)
+
+    '''PRIVATE METHODS'''
+
+    def _process_btn(self, btn:Dict[str,Union[str,int]]) -> None:
+        '''
+            Routes a mouse event to the widget found under it via the hit
+            index.
+        '''
+        if btn is None:
+            return
+        action = btn['action']
+
+        if action == 'MouseUp':
+            if self._pressed is not None:
+                self._pressed.release()
+                self._pressed = None
+            return
+
+        widget = self.widget_at(btn['x'], btn['y'])
+        if widget is None:
+            return
+
+        if action == 'LeftClick' and isinstance(widget, Button):
+            self._pressed = widget
+            widget.click(btn)
+        elif action == 'ScrollUp':
+            widget.scroll_up()
+        elif action == 'ScrollDown':
+            widget.scroll_down()
+
+    def _render(self) -> None:
+        '''
+            Writes every widget that has changed since the last frame in a
+            single terminal write.
+        '''
+        out = ''.join(w.render() for w in self._widgets if w.dirty)
+        if out:
+            print(out, end = '', flush = True)
@@ -0,0 +1,573 @@
+from typing import BinaryIO, Callable, Iterator, Tuple, Union
+from collections import deque
+import tempfile
+import random
+import mmap
+import os
+
+import numpy as np
+
+# Text is stored in chunks of at most `_LEAF` characters when it is first
+# loaded; typing may grow a chunk in place up to `_LEAF_MAX` characters.
+_LEAF = 2048
+_LEAF_MAX = 4096
+
+# Size in bytes of the chunks of a memory-mapped file
+_MAPPED_LEAF = 8192
+
+class _Mapped:
+
+    '''
+        A chunk of text that has not been read yet: a range of bytes in a
+        memory-mapped UTF-8 file, along with the number of characters and
+        newlines it contains.  It is decoded each time its text is needed, and
+        is replaced by a string in any node whose text is edited.
+    '''
+
+    __slots__ = ('data', 'start', 'stop', 'length', 'newlines')
+
+    def __init__(
+    self, data:mmap.mmap, start:int, stop:int, length:int,
+    newlines:int) -> None:
+        self.data = data
+        self.start = start
+        self.stop = stop
+        self.length = length
+        self.newlines = newlines
+
+    def __len__(self) -> int:
+        return self.length
+
+    def decode(self) -> str:
+        return self.data[self.start:self.stop].decode()
+
+def _text(chunk:Union[str, _Mapped]) -> str:
+    '''
+        Returns the text of a chunk, decoding it if necessary.
+    '''
+    return chunk if chunk.__class__ is str else chunk.decode()
+
+class _Node:
+
+    '''
+        A node of the rope: a chunk of text, its two subtrees and the number
+        of characters and newlines in the subtree rooted at the node.  Nodes
+        are never modified once created, so that trees may share them.
+    '''
+
+    __slots__ = (
+        'chunk', 'priority', 'left', 'right', 'newlines', 'size', 'lines'
+    )
+
+    def __init__(
+    self, chunk:Union[str, _Mapped], priority:float, left:'_Node' = None,
+    right:'_Node' = None) -> None:
+        self.chunk = chunk
+        self.priority = priority
+        self.left = left
+        self.right = right
+        if chunk.__class__ is str:
+            self.newlines = chunk.count('\n')
+        else:
+            self.newlines = chunk.newlines
+        self.size = len(chunk)
+        self.lines = self.newlines
+        if left is not None:
+            self.size += left.size
+            self.lines += left.lines
+        if right is not None:
+            self.size += right.size
+            self.lines += right.lines
+
+def _size(t:_Node) -> int:
+    return 0 if t is None else t.size
+
+def _lines(t:_Node) -> int:
+    return 0 if t is None else t.lines
+
+def _merge(a:_Node, b:_Node) -> _Node:
+    '''
+        Concatenates two trees.
+    '''
+    if a is None:
+        return b
+    elif b is None:
+        return a
+    elif a.priority > b.priority:
+        return _Node(a.chunk, a.priority, a.left, _merge(a.right, b))
+    return _Node(b.chunk, b.priority, _merge(a, b.left), b.right)
+
+def _split(t:_Node, pos:int) -> Tuple[_Node]:
+    '''
+        Splits a tree into the first `pos` characters and the rest.
+    '''
+    if t is None:
+        return None, None
+    left = _size(t.left)
+    if pos <= left:
+        a, b = _split(t.left, pos)
+        return a, _Node(t.chunk, t.priority, b, t.right)
+    elif pos >= left + len(t.chunk):
+        a, b = _split(t.right, pos - left - len(t.chunk))
+        return _Node(t.chunk, t.priority, t.left, a), b
+    k = pos - left
+    chunk = _text(t.chunk)
+    return (
+        _Node(chunk[:k], t.priority, t.left, None),
+        _Node(chunk[k:], t.priority, None, t.right)
+    )
+
+def _build(text:str) -> _Node:
+    '''
+        Builds a balanced tree from `text` in O(len(text)).
+    '''
+    return _build_chunks([text[i:i+_LEAF] for i in range(0, len(text), _LEAF)])
+
+def _build_chunks(chunks:list) -> _Node:
+    '''
+        Builds a balanced tree whose chunks are `chunks`, in order.
+        Priorities are drawn at random and handed out in level order, so that
+        the result is a valid treap.
+    '''
+    n = len(chunks)
+    if n == 0:
+        return None
+
+    priorities = sorted((random.random() for i in range(n)), reverse = True)
+    node_priority = [0.0]*n
+    queue = deque([(0, n)])
+    k = 0
+    while queue:
+        lo, hi = queue.popleft()
+        if lo < hi:
+            mid = (lo + hi) // 2
+            node_priority[mid] = priorities[k]
+            k += 1
+            queue.append((lo, mid))
+            queue.append((mid + 1, hi))
+
+    def build(lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        return _Node(
+            chunks[mid], node_priority[mid], build(lo, mid), build(mid + 1, hi)
+        )
+
+    return build(0, n)
+
+def _insert(t:_Node, pos:int, text:str) -> _Node:
+    '''
+        Inserts `text` at `pos`, growing an existing chunk in place when it
+        has room, and splicing in a new subtree otherwise.
+    '''
+    if t is None:
+        return _build(text)
+    left = _size(t.left)
+    if pos < left:
+        return _Node(t.chunk, t.priority, _insert(t.left, pos, text), t.right)
+    elif pos > left + len(t.chunk):
+        return _Node(
+            t.chunk, t.priority, t.left,
+            _insert(t.right, pos - left - len(t.chunk), text)
+        )
+    elif len(t.chunk) + len(text) <= _LEAF_MAX:
+        k = pos - left
+        chunk = _text(t.chunk)
+        chunk = chunk[:k] + text + chunk[k:]
+        return _Node(chunk, t.priority, t.left, t.right)
+    a, b = _split(t, pos)
+    return _merge(_merge(a, _build(text)), b)
+
+def _delete(t:_Node, start:int, stop:int) -> _Node:
+    '''
+        Removes the characters in range [start, stop), editing a single chunk
+        in place when the range lies within it.
+    '''
+    left = _size(t.left)
+    end = left + len(t.chunk)
+    if stop <= left:
+        return _Node(t.chunk, t.priority, _delete(t.left, start, stop), t.right)
+    elif start >= end:
+        return _Node(
+            t.chunk, t.priority, t.left,
+            _delete(t.right, start - end, stop - end)
+        )
+    elif start >= left and stop <= end:
+        chunk = _text(t.chunk)
+        chunk = chunk[:start - left] + chunk[stop - left:]
+        if not chunk:
+            return _merge(t.left, t.right)
+        return _Node(chunk, t.priority, t.left, t.right)
+    a, rest = _split(t, start)
+    b, c = _split(rest, stop - start)
+    return _merge(a, c)
+
+def _iter_chunks(t:_Node, start:int, stop:int) -> Iterator[str]:
+    '''
+        Yields the parts of the chunks that lie in range [start, stop), in
+        order.  Only the subtrees that overlap the range are visited.
+    '''
+    stack = []
+    offset = 0
+    while True:
+        # Descend leftwards, skipping left subtrees that end before `start`
+        while t is not None:
+            stack.append((t, offset))
+            t = t.left if start < offset + _size(t.left) else None
+        if not stack:
+            return
+        node, offset = stack.pop()
+        chunk_start = offset + _size(node.left)
+        chunk_stop = chunk_start + len(node.chunk)
+        if chunk_start >= stop:
+            return
+        elif chunk_stop > start:
+            chunk = _text(node.chunk)
+            if start <= chunk_start and stop >= chunk_stop:
+                yield chunk
+            else:
+                yield chunk[max(0, start - chunk_start):stop - chunk_start]
+        t = node.right
+        offset = chunk_stop
+
+def _iter_pieces(t:_Node) -> Iterator[Union[str, _Mapped]]:
+    '''
+        Yields every chunk of a tree in order, without decoding them.
+    '''
+    stack = []
+    while stack or t is not None:
+        while t is not None:
+            stack.append(t)
+            t = t.left
+        t = stack.pop()
+        yield t.chunk
+        t = t.right
+
+def _scan(data:mmap.mmap) -> list:
+    '''
+        Divides a memory-mapped UTF-8 file into chunks of roughly
+        `_MAPPED_LEAF` bytes which begin and end on character boundaries, and
+        counts the characters and newlines in each.  Chunks of pure ASCII,
+        where characters and bytes coincide, are not decoded.
+    '''
+    arr = np.frombuffer(data, dtype = np.uint8)
+    stops = np.arange(_MAPPED_LEAF, len(arr), _MAPPED_LEAF)
+    # Move each boundary back to the start of a character; a UTF-8 character
+    # has at most three continuation bytes of the form 10xxxxxx.
+    for i in range(3):
+        stops[(arr[stops] & 0xC0) == 0x80] -= 1
+    starts = [0] + stops.tolist()
+    stops = stops.tolist() + [len(arr)]
+
+    chunks = []
+    for start, stop in zip(starts, stops):
+        raw = data[start:stop]
+        length = len(raw) if raw.isascii() else len(raw.decode())
+        chunks.append(_Mapped(data, start, stop, length, raw.count(b'\n')))
+    return chunks
+
+class TextBuffer:
+
+    '''
+        A text document stored as a balanced rope: a randomized binary search
+        tree (treap) of text chunks, where each node also records how many
+        characters and newlines its subtree contains.
+
+        Inserting, deleting and converting between character offsets and
+        (row, column) positions take O(log n) time, independently of where in
+        the document they happen.  Nodes are immutable and shared between
+        versions, so `snapshot` takes O(1) time and memory.
+    '''
+
+    def __init__(self, text:str = '') -> None:
+        '''
+            Creates a new instance of `TextBuffer` containing `text`.
+        '''
+        if not isinstance(text, str):
+            msg = (
+                f'\n\nArgument `text` in constructor of class `TextBuffer` '
+                f'expects a value of <class \'str\'>, got {type(text)}.'
+            )
+            raise TypeError(msg)
+        self._root = _build(text)
+        self._version = 0
+        self._listeners = []
+
+    @classmethod
+    def from_file(cls, path:str) -> 'TextBuffer':
+        '''
+            Opens the UTF-8 file at `path` without reading it into memory: the
+            file is memory-mapped, and each part of it is only decoded when its
+            text is accessed.  Parts that are edited are held in memory from
+            then on.
+
+            The file should not be modified by other programs while the buffer
+            is in use.  Saving the buffer over it with `save` is safe.
+        '''
+        new = cls()
+        with open(path, 'rb') as infile:
+            if os.fstat(infile.fileno()).st_size == 0:
+                return new
+            data = mmap.mmap(infile.fileno(), 0, access = mmap.ACCESS_READ)
+        new._root = _build_chunks(_scan(data))
+        return new
+
+    '''GETTERS'''
+
+    def __len__(self) -> int:
+        '''
+            Returns the number of characters in the buffer.
+        '''
+        return _size(self._root)
+
+    def __str__(self) -> str:
+        '''
+            Returns the full contents of the buffer.
+        '''
+        return ''.join(self.chunks())
+
+    @property
+    def version(self) -> int:
+        '''
+            Returns a counter that is incremented by every edit.
+        '''
+        return self._version
+
+    @property
+    def line_count(self) -> int:
+        '''
+            Returns the number of lines, which is one more than the number of
+            newline characters.
+        '''
+        return _lines(self._root) + 1
+
+    def line_start(self, row:int) -> int:
+        '''
+            Returns the offset of the first character of line `row`.
+        '''
+        if row <= 0:
+            return 0
+        elif row >= self.line_count:
+            return len(self)
+        # Offset just past the row-th newline
+        t = self._root
+        k = row
+        offset = 0
+        while True:
+            left_lines = _lines(t.left)
+            if k <= left_lines:
+                t = t.left
+                continue
+            k -= left_lines
+            offset += _size(t.left)
+            if k <= t.newlines:
+                chunk = _text(t.chunk)
+                i = -1
+                for _ in range(k):
+                    i = chunk.index('\n', i + 1)
+                return offset + i + 1
+            k -= t.newlines
+            offset += len(t.chunk)
+            t = t.right
+
+    def line_range(self, row:int) -> Tuple[int]:
+        '''
+            Returns the offsets at which line `row` begins and ends, excluding
+            the newline.
+        '''
+        start = self.line_start(row)
+        stop = self.line_start(row + 1)
+        if row + 1 < self.line_count:
+            stop -= 1
+        return start, stop
+
+    def line_length(self, row:int) -> int:
+        '''
+            Returns the number of characters in line `row`, excluding the
+            newline.
+        '''
+        start, stop = self.line_range(row)
+        return stop - start
+
+    def line(self, row:int) -> str:
+        '''
+            Returns line `row`, excluding the newline.
+        '''
+        return self.substring(*self.line_range(row))
+
+    def lines(self, start:int = 0, stop:int = None) -> Iterator[str]:
+        '''
+            Yields lines `start` to `stop` (excluding newlines), reading the
+            chunks that contain them in a single pass.
+        '''
+        if stop is None or stop > self.line_count:
+            stop = self.line_count
+        if start >= stop:
+            return
+        end = self.line_start(stop)
+        if stop < self.line_count:
+            end -= 1
+        text = []
+        count = start
+        for chunk in _iter_chunks(self._root, self.line_start(start), end):
+            parts = chunk.split('\n')
+            for part in parts[:-1]:
+                text.append(part)
+                yield ''.join(text)
+                text = []
+                count += 1
+            text.append(parts[-1])
+        if count < stop:
+            yield ''.join(text)
+
+    def substring(self, start:int, stop:int) -> str:
+        '''
+            Returns the characters in range [start, stop).
+        '''
+        return ''.join(_iter_chunks(self._root, start, stop))
+
+    def chunks(self, start:int = 0, stop:int = None) -> Iterator[str]:
+        '''
+            Yields the contents of range [start, stop) as a sequence of chunks,
+            without joining them into a single string.
+        '''
+        if stop is None:
+            stop = len(self)
+        return _iter_chunks(self._root, start, stop)
+
+    def write_to(self, outfile:BinaryIO) -> None:
+        '''
+            Writes the contents of the buffer to a binary file in UTF-8, one
+            chunk at a time.  Parts of a memory-mapped file that have not been
+            edited are copied without being decoded.
+        '''
+        for chunk in _iter_pieces(self._root):
+            if chunk.__class__ is str:
+                outfile.write(chunk.encode())
+            else:
+                outfile.write(memoryview(chunk.data)[chunk.start:chunk.stop])
+
+    def save(self, path:str) -> None:
+        '''
+            Saves the buffer to `path` atomically: the contents are streamed to
+            a temporary file in the same directory, which then replaces `path`
+            in a single step, so that `path` is never left partially written.
+        '''
+        path = os.path.abspath(path)
+        directory, name = os.path.split(path)
+        fd, tmp_path = tempfile.mkstemp(prefix = f'.{name}.', dir = directory)
+        try:
+            with os.fdopen(fd, 'wb') as outfile:
+                self.write_to(outfile)
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            if os.path.exists(path):
+                os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def offset(self, row:int, col:int) -> int:
+        '''
+            Converts a (row, column) position into a character offset.
+        '''
+        return self.line_start(row) + col
+
+    def position(self, offset:int) -> Tuple[int]:
+        '''
+            Converts a character offset into a (row, column) position.
+        '''
+        t = self._root
+        row = 0
+        base = 0
+        rest = offset
+        while t is not None:
+            left = _size(t.left)
+            if rest < left:
+                t = t.left
+            elif rest <= left + len(t.chunk):
+                row += _lines(t.left)
+                row += _text(t.chunk).count('\n', 0, rest - left)
+                break
+            else:
+                row += _lines(t.left) + t.newlines
+                rest -= left + len(t.chunk)
+                t = t.right
+        return row, offset - self.line_start(row)
+
+    def snapshot(self) -> 'TextBuffer':
+        '''
+            Returns an independent copy of the buffer in O(1) time, sharing
+            all of its nodes.
+        '''
+        new = self.__class__.__new__(self.__class__)
+        new._root = self._root
+        new._version = self._version
+        new._listeners = []
+        return new
+
+    '''SETTERS'''
+
+    def subscribe(self, callback:Callable) -> None:
+        '''
+            Registers `callback` to be called after every edit as
+            `callback(offset, row, removed, inserted)`, where `row` is the line
+            containing `offset`, and `removed` and `inserted` are the text that
+            was removed from and inserted at `offset`.
+        '''
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback:Callable) -> None:
+        '''
+            Stops calling a callback registered with `subscribe`.
+        '''
+        self._listeners.remove(callback)
+
+    def insert(self, offset:int, text:str) -> None:
+        '''
+            Inserts `text` so that it begins at `offset`.
+        '''
+        if not text:
+            return
+        self._check_range(offset, offset)
+        self._root = _insert(self._root, offset, text)
+        self._version += 1
+        self._notify(offset, '', text)
+
+    def delete(self, start:int, stop:int) -> str:
+        '''
+            Removes the characters in range [start, stop), and returns them.
+        '''
+        self._check_range(start, stop)
+        if start == stop:
+            return ''
+        removed = self.substring(start, stop)
+        self._root = _delete(self._root, start, stop)
+        self._version += 1
+        self._notify(start, removed, '')
+        return removed
+
+    '''PRIVATE METHODS'''
+
+    def _notify(self, offset:int, removed:str, inserted:str) -> None:
+        '''
+            Calls every callback registered with `subscribe`.
+        '''
+        if self._listeners:
+            row = self.position(offset)[0]
+            for callback in tuple(self._listeners):
+                callback(offset, row, removed, inserted)
+
+    def _check_range(self, start:int, stop:int) -> None:
+        '''
+            Raises an IndexError if [start, stop) is not a valid range.
+        '''
+        if not 0 <= start <= stop <= len(self):
+            msg = (
+                f'\n\nRange [{start}, {stop}) is out of bounds for a '
+                f'<class \'TextBuffer\'> of length {len(self)}.'
+            )
+            raise IndexError(msg)
@@ -0,0 +1,312 @@
+from typing import Tuple, Union
+import threading
+import re
+
+import numpy as np
+
+from termutils.obj.TextBuffer import TextBuffer
+from termutils.obj.UndoStack import UndoStack
+
+# Approximate number of characters searched by the worker at a time
+_BLOCK = 2**16
+
+class TextSearch:
+
+    '''
+        Finds every match of a literal string or regular expression in a
+        `TextBuffer`, and keeps the matches up to date as the buffer is
+        edited.  Matches do not span lines.
+
+        The buffer is searched from start to end on a worker thread, one block
+        of lines at a time, while the matches found so far are available
+        immediately.  Once it reaches the end, the worker sleeps until an edit
+        leaves part of the buffer unsearched.  Each block is read from an O(1) snapshot of the buffer,
+        so the worker never blocks editing.  An edit to the part of the buffer
+        that has already been searched shifts the matches after it and
+        searches the edited lines again; the rest is left to the worker.
+
+        Matches are stored as sorted arrays of offsets, so finding the next or
+        previous match from a position takes O(log m) time.
+    '''
+
+    def __init__(
+    self, buffer:TextBuffer, pattern:str, regex:bool = False,
+    ignore_case:bool = False) -> None:
+        '''
+            Starts searching `buffer` for `pattern`, which is treated as a
+            regular expression if `regex` is True, and as a literal string
+            otherwise.  Raises a `re.error` if the expression is invalid.
+        '''
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        if not regex:
+            pattern = re.escape(pattern)
+        self._pattern = re.compile(pattern, flags)
+        self._regex = regex
+        self._buffer = buffer
+
+        self._lock = threading.Lock()
+        # Notified after every edit, to wake the worker if it is waiting
+        self._wake = threading.Condition(self._lock)
+        self._starts = np.zeros(0, dtype = np.int64)
+        self._stops = np.zeros(0, dtype = np.int64)
+        # Everything before `_frontier`, which is always at the start of a
+        # line, has been searched.
+        self._frontier = 0
+        self._version = buffer.version
+        self._active = True
+
+        buffer.subscribe(self._on_edit)
+        self._worker = threading.Thread(target = self._search, daemon = True)
+        self._worker.start()
+
+    '''GETTERS'''
+
+    @property
+    def pattern(self) -> re.Pattern:
+        '''
+            Returns the compiled pattern.
+        '''
+        return self._pattern
+
+    @property
+    def done(self) -> bool:
+        '''
+            Returns True once the whole buffer has been searched.
+        '''
+        return self._frontier >= len(self._buffer)
+
+    @property
+    def count(self) -> int:
+        '''
+            Returns the number of matches found so far.
+        '''
+        return len(self._starts)
+
+    def __len__(self) -> int:
+        '''
+            Returns the number of matches found so far.
+        '''
+        return len(self._starts)
+
+    def __getitem__(self, idx:int) -> Tuple[int]:
+        '''
+            Returns the start and stop offsets of match number `idx`.
+        '''
+        with self._lock:
+            return int(self._starts[idx]), int(self._stops[idx])
+
+    def index(self, offset:int) -> Union[int, None]:
+        '''
+            Returns the number of the match that begins at `offset`, or None.
+        '''
+        with self._lock:
+            idx = int(np.searchsorted(self._starts, offset))
+            if idx < len(self._starts) and self._starts[idx] == offset:
+                return idx
+        return None
+
+    def next(self, offset:int) -> Union[Tuple[int], None]:
+        '''
+            Returns the first match that begins after `offset`, wrapping
+            around to the first match of the buffer.  Returns None if there
+            are no matches.
+        '''
+        with self._lock:
+            if not len(self._starts):
+                return None
+            idx = int(np.searchsorted(self._starts, offset, 'right'))
+            idx %= len(self._starts)
+            return int(self._starts[idx]), int(self._stops[idx])
+
+    def prev(self, offset:int) -> Union[Tuple[int], None]:
+        '''
+            Returns the last match that begins before `offset`, wrapping
+            around to the last match of the buffer.  Returns None if there are
+            no matches.
+        '''
+        with self._lock:
+            if not len(self._starts):
+                return None
+            idx = int(np.searchsorted(self._starts, offset, 'left')) - 1
+            idx %= len(self._starts)
+            return int(self._starts[idx]), int(self._stops[idx])
+
+    def in_range(self, start:int, stop:int) -> Tuple[np.ndarray]:
+        '''
+            Returns the start and stop offsets of the matches that begin in
+            range [start, stop).
+        '''
+        with self._lock:
+            i = np.searchsorted(self._starts, start)
+            j = np.searchsorted(self._starts, stop)
+            return self._starts[i:j].copy(), self._stops[i:j].copy()
+
+    '''SETTERS'''
+
+    def close(self) -> None:
+        '''
+            Stops the worker and stops tracking the edits made to the buffer.
+        '''
+        with self._lock:
+            self._active = False
+            self._wake.notify()
+        self._buffer.unsubscribe(self._on_edit)
+
+    def replace_all(
+    self, replacement:str, undo:UndoStack = None,
+    cursor:Tuple[int] = (0, 0)) -> int:
+        '''
+            Replaces every match in the buffer with `replacement`, in which
+            group references such as `\\1` are expanded if the pattern is a
+            regular expression.  Returns the number of replacements.
+
+            The text between the first and last match is replaced in a single
+            deletion and insertion, which is recorded in `undo` (if given) as
+            one step.  The search is completed first, on the calling thread.
+        '''
+        self._finish()
+        with self._lock:
+            if not len(self._starts):
+                return 0
+            start = int(self._starts[0])
+            stop = int(self._stops[-1])
+            starts = self._starts.tolist()
+            stops = self._stops.tolist()
+
+        # The whole lines around the matches, so that lookbehind and
+        # lookahead assertions see the same text as when they were found
+        first = self._buffer.line_start(self._buffer.position(start)[0])
+        last = self._buffer.line_range(self._buffer.position(stop)[0])[1]
+        text = self._buffer.substring(first, last)
+        parts = []
+        prev = start - first
+        count = 0
+        for i, j in zip(starts, stops):
+            i, j = i - first, j - first
+            if self._regex:
+                match = self._pattern.match(text, i)
+                if match is None or match.span() != (i, j):
+                    continue
+                parts.append(text[prev:i])
+                parts.append(match.expand(replacement))
+            else:
+                parts.append(text[prev:i])
+                parts.append(replacement)
+            prev = j
+            count += 1
+        parts.append(text[prev:stop - first])
+        new = ''.join(parts)
+
+        if undo is not None:
+            undo.begin(cursor)
+            undo.delete(self._buffer, start, stop)
+            undo.insert(self._buffer, start, new)
+            undo.end(cursor)
+        else:
+            self._buffer.delete(start, stop)
+            self._buffer.insert(start, new)
+        return count
+
+    '''PRIVATE METHODS'''
+
+    def _find(self, text:str, offset:int) -> Tuple[np.ndarray]:
+        '''
+            Returns the start and stop offsets of the matches in `text` which
+            do not span lines, shifted by `offset`.
+        '''
+        starts = []
+        stops = []
+        for match in self._pattern.finditer(text):
+            i, j = match.span()
+            if i == j or '\n' in text[i:j]:
+                continue
+            starts.append(i)
+            stops.append(j)
+        starts = np.array(starts, dtype = np.int64) + offset
+        stops = np.array(stops, dtype = np.int64) + offset
+        return starts, stops
+
+    def _search(self) -> None:
+        '''
+            Runs on the worker thread, searching the buffer one block of lines
+            at a time, and waiting whenever the whole buffer has been searched
+            or an edit has not been processed by `_on_edit` yet, until the
+            search is closed.
+        '''
+        while True:
+            with self._lock:
+                while True:
+                    if not self._active:
+                        return
+                    snapshot = self._buffer.snapshot()
+                    start = self._frontier
+                    if snapshot.version == self._version and \
+                       start < len(snapshot):
+                        break
+                    self._wake.wait()
+
+            row = snapshot.position(min(start + _BLOCK, len(snapshot)))[0]
+            stop = snapshot.line_range(row)[1]
+            starts, stops = self._find(snapshot.substring(start, stop), start)
+
+            with self._lock:
+                # Dropped if an edit or `_finish` has moved the frontier
+                if self._version != snapshot.version or \
+                   self._frontier != start:
+                    continue
+                self._starts = np.concatenate((self._starts, starts))
+                self._stops = np.concatenate((self._stops, stops))
+                # Move past the newline that ends the block
+                self._frontier = stop + 1
+
+    def _finish(self) -> None:
+        '''
+            Searches whatever the worker has not reached yet, on the calling
+            thread.  Moving the frontier to the end makes the worker drop the
+            block it may be searching, so that no block is counted twice.
+        '''
+        with self._lock:
+            start = self._frontier
+            if start < len(self._buffer):
+                text = self._buffer.substring(start, len(self._buffer))
+                starts, stops = self._find(text, start)
+                self._starts = np.concatenate((self._starts, starts))
+                self._stops = np.concatenate((self._stops, stops))
+                self._frontier = len(self._buffer) + 1
+
+    def _on_edit(self, offset:int, row:int, removed:str, inserted:str) -> None:
+        '''
+            Called by the buffer after each edit; updates the matches on the
+            edited lines, and shifts those after them.
+        '''
+        with self._lock:
+            self._version = self._buffer.version
+            # Takes effect once the lock is released, by which time the
+            # frontier is up to date
+            self._wake.notify()
+            # The edited lines, in the new text
+            start = self._buffer.line_start(row)
+            last = row + inserted.count('\n')
+            stop = self._buffer.line_range(last)[1]
+            if start >= self._frontier:
+                return
+
+            delta = len(inserted) - len(removed)
+            old_stop = stop - delta
+            i = np.searchsorted(self._starts, start)
+            j = np.searchsorted(self._starts, old_stop, 'right')
+            if self._frontier <= old_stop:
+                # The edit reaches the part that has not been searched yet
+                self._starts = self._starts[:i]
+                self._stops = self._stops[:i]
+                self._frontier = start
+                return
+
+            starts, stops = self._find(self._buffer.substring(start, stop), start)
+            self._starts = np.concatenate(
+                (self._starts[:i], starts, self._starts[j:] + delta)
+            )
+            self._stops = np.concatenate(
+                (self._stops[:i], stops, self._stops[j:] + delta)
+            )
+            self._frontier += delta
@@ -0,0 +1,552 @@
+from typing import List, Sequence, Tuple
+from bisect import bisect_right
+
+import numpy as np
+
+from termutils.obj.TextBuffer import TextBuffer
+from termutils.obj.Highlighter import Highlighter
+from termutils.obj.WrapIndex import WrapIndex
+from termutils.utils.width import (
+    str_width, slice_columns, column_index, column_span, pad_to_width
+)
+
+class TextView:
+
+    '''
+        A rectangular window onto a `TextBuffer`, which keeps track of which of
+        its rows no longer match what is on the terminal.
+
+        The view subscribes to its buffer, so that an edit marks only the rows
+        it touched as dirty.  Edits that add or remove lines, and vertical
+        scrolling, are performed by the terminal itself: the affected rows are
+        confined to a scroll region (DECSTBM) and shifted with the insert line,
+        delete line and scroll sequences, after which only the rows that were
+        exposed need to be written.  The cost of `render` is therefore bounded
+        by the size of the view, and not by the size of the buffer.
+
+        The terminal can only shift entire rows, so views that do not span the
+        full width of the terminal (`full_width = False`) rewrite the shifted
+        rows instead.
+
+        If a `Highlighter` is attached, the lexer state that each row was drawn
+        with is remembered, so that rows whose highlighting was changed by an
+        edit to an earlier line (such as an opening quote) are redrawn too.
+
+        If `wrap` is True, lines wider than the view are soft-wrapped onto
+        several rows instead of being scrolled horizontally.  The rows taken
+        by each line are kept in a `WrapIndex`, through which scrolling, and
+        converting between rows and buffer positions, take O(log n) time.
+    '''
+
+    def __init__(
+    self, buffer:TextBuffer, y0:int, x0:int, height:int, width:int,
+    full_width:bool = True, highlighter:Highlighter = None,
+    wrap:bool = False) -> None:
+        '''
+            Creates a view of `buffer` whose top-left corner is at terminal
+            row `y0` and column `x0` (counting from zero).
+        '''
+        if height <= 0 or width <= 0:
+            msg = (
+                f'\n\nArguments `height` and `width` in the instantiation of '
+                f'<class \'TextView\'> must be positive integers.'
+            )
+            raise ValueError(msg)
+
+        self._y0 = y0
+        self._x0 = x0
+        self._height = height
+        self._width = width
+        self._full_width = full_width
+        self._top = 0
+        self._left = 0
+        # The row of line `_top` at the top of the view, if wrapping
+        self._sub = 0
+        self._buffer = None
+        self._highlighter = highlighter
+        self._wrap = None
+        self.set_buffer(buffer)
+        if wrap:
+            self.set_wrap(True)
+
+    '''GETTERS'''
+
+    @property
+    def buffer(self) -> TextBuffer:
+        '''
+            Returns the buffer being viewed.
+        '''
+        return self._buffer
+
+    @property
+    def top(self) -> int:
+        '''
+            Returns the index of the line at the top of the view.
+        '''
+        return self._top
+
+    @property
+    def left(self) -> int:
+        '''
+            Returns the first column in view.
+        '''
+        return self._left
+
+    @property
+    def wrap(self) -> bool:
+        '''
+            Returns True if long lines are soft-wrapped.
+        '''
+        return self._wrap is not None
+
+    @property
+    def shape(self) -> Tuple[int]:
+        '''
+            Returns the height and width of the view.
+        '''
+        return self._height, self._width
+
+    @property
+    def dirty(self) -> bool:
+        '''
+            Returns True if the terminal does not match the view.
+        '''
+        return bool(self._dirty or self._ops)
+
+    def cursor_str(self, row:int, col:int) -> str:
+        '''
+            Returns the string that moves the terminal cursor to the given
+            position in the buffer.
+        '''
+        if self._wrap:
+            line = self._buffer.line(row)
+            offsets = self._wrap.offsets(row, line)
+            sub = bisect_right(offsets, col) - 1
+            y = self._wrap.first_row(row) + sub - self._first()
+            x = str_width(line[offsets[sub]:col])
+        else:
+            y = row - self._top
+            x = self._column(row, col) - self._left
+        y = min(max(y, 0), self._height - 1)
+        x = min(max(x, 0), self._width - 1)
+        return f'\033[{self._y0+y+1};{self._x0+x+1}f'
+
+    def position(self, y:int, x:int) -> Tuple[int]:
+        '''
+            Returns the position in the buffer of the character displayed at
+            row `y` and column `x` of the view (counting from zero), clamped to
+            the text.
+        '''
+        if self._wrap:
+            row, sub = self._wrap.locate(self._first() + y)
+            return row, self._col_at(row, sub, x)
+        row = min(self._top + y, self._buffer.line_count - 1)
+        return row, self._col_at(row, None, self._left + x)
+
+    def move(self, row:int, col:int, rows:int) -> Tuple[int]:
+        '''
+            Returns the position `rows` rows below the given one (above, if
+            `rows` is negative), clamped to the text.  When wrapping, this
+            moves between the rows of a wrapped line, and keeps the cursor in
+            the same column.
+        '''
+        if not self._wrap:
+            row = max(0, min(row + rows, self._buffer.line_count - 1))
+            return row, min(col, self._buffer.line_length(row))
+        line = self._buffer.line(row)
+        offsets = self._wrap.offsets(row, line)
+        sub = bisect_right(offsets, col) - 1
+        x = str_width(line[offsets[sub]:col])
+        row, sub = self._wrap.locate(self._wrap.first_row(row) + sub + rows)
+        return row, self._col_at(row, sub, x)
+
+    '''SETTERS'''
+
+    def set_buffer(self, buffer:TextBuffer) -> None:
+        '''
+            Switches the view to another buffer, starting at its first line.
+        '''
+        if self._buffer is not None:
+            self._buffer.unsubscribe(self._on_edit)
+        self._buffer = buffer
+        self._buffer.subscribe(self._on_edit)
+        self._top = 0
+        self._left = 0
+        self._sub = 0
+        if self._wrap is not None:
+            self._wrap = WrapIndex(buffer, self._width)
+        self.invalidate()
+
+    def set_wrap(self, wrap:bool) -> None:
+        '''
+            Turns soft wrapping on or off.
+        '''
+        if wrap and self._wrap is None:
+            self._wrap = WrapIndex(self._buffer, self._width)
+            self._left = 0
+        elif not wrap:
+            self._wrap = None
+        self._sub = 0
+        self.invalidate()
+
+    def set_highlighter(self, highlighter:Highlighter) -> None:
+        '''
+            Sets the highlighter used to style the buffer's lines, or removes
+            it if `highlighter` is None.
+        '''
+        self._highlighter = highlighter
+        self.invalidate()
+
+    def close(self) -> None:
+        '''
+            Stops tracking the edits made to the buffer.
+        '''
+        self._buffer.unsubscribe(self._on_edit)
+
+    def invalidate(self) -> None:
+        '''
+            Marks every row as dirty.
+        '''
+        self._dirty = set(range(self._height))
+        self._ops = []
+        # The lexer state each row was last drawn with
+        self._drawn = [None]*self._height
+
+    def resize(
+    self, y0:int, x0:int, height:int, width:int,
+    full_width:bool = None) -> None:
+        '''
+            Moves the view to a new region of the terminal.  `full_width` is
+            left unchanged if it is None.
+        '''
+        self._y0 = y0
+        self._x0 = x0
+        self._height = height
+        self._width = width
+        if full_width is not None:
+            self._full_width = full_width
+        if self._wrap:
+            self._wrap.set_width(width)
+            self._sub = min(self._sub, self._wrap.rows(self._top) - 1)
+        self.invalidate()
+
+    def scroll(self, rows:int) -> None:
+        '''
+            Scrolls the view down by `rows` rows, or up if `rows` is negative.
+        '''
+        if self._wrap:
+            self._scroll_to(self._first() + rows)
+        else:
+            self.set_top(self._top + rows)
+
+    def set_top(self, top:int) -> None:
+        '''
+            Scrolls the view so that line `top` is at the top.
+        '''
+        top = max(0, min(top, self._buffer.line_count - 1))
+        if self._wrap:
+            self._scroll_to(self._wrap.first_row(top))
+            return
+        delta = top - self._top
+        self._top = top
+        if delta:
+            self._shift(0, -delta)
+
+    def follow(self, row:int, col:int) -> None:
+        '''
+            Scrolls the view as little as possible so that the given position
+            is visible.
+        '''
+        if self._wrap:
+            offsets = self._wrap.offsets(row)
+            y = self._wrap.first_row(row) + bisect_right(offsets, col) - 1
+            if y < self._first():
+                self._scroll_to(y)
+            elif y >= self._first() + self._height:
+                self._scroll_to(y - self._height + 1)
+            return
+
+        if row < self._top:
+            self.set_top(row)
+        elif row >= self._top + self._height:
+            self.set_top(row - self._height + 1)
+
+        x = self._column(row, col)
+        if x < self._left:
+            self._left = max(0, x - self._width//2)
+            self.invalidate()
+        elif x >= self._left + self._width:
+            self._left = x - self._width//2
+            self.invalidate()
+
+    def render(self) -> str:
+        '''
+            Returns the string that brings the terminal up to date with the
+            view, and marks every row as clean.  Returns an empty string if
+            nothing changed.
+        '''
+        out = ''.join(self._ops)
+        if self._wrap:
+            out += self._render_wrapped()
+            self._dirty = set()
+            self._ops = []
+            return out
+
+        if self._highlighter is not None:
+            states = self._highlighter.states(
+                self._top, self._top + self._height
+            )
+            for y, state in enumerate(states):
+                if state != self._drawn[y]:
+                    self._dirty.add(y)
+        if self._dirty:
+            first = min(self._dirty)
+            last = max(self._dirty)
+            lines = self._buffer.lines(self._top + first, self._top + last + 1)
+            for y in range(first, last + 1):
+                line = next(lines, None)
+                if y not in self._dirty:
+                    continue
+                out += f'\033[{self._y0+y+1};{self._x0+1}f'
+                if line is not None and self._highlighter is not None:
+                    row = self._top + y
+                    out += self._styled(line, self._highlighter.runs(row, line))
+                    self._drawn[y] = states[y]
+                else:
+                    out += slice_columns(line or '', self._left, self._width)
+                    self._drawn[y] = None
+        self._dirty = set()
+        self._ops = []
+        return out
+
+    '''PRIVATE METHODS'''
+
+    def _column(self, row:int, col:int) -> int:
+        '''
+            Returns the display column of the given position.
+        '''
+        if col == 0:
+            return 0
+        start = self._buffer.line_start(row)
+        return str_width(self._buffer.substring(start, start + col))
+
+    def _first(self) -> int:
+        '''
+            Returns the row (counting wrapped rows) at the top of the view.
+        '''
+        return self._wrap.first_row(self._top) + self._sub
+
+    def _scroll_to(self, first:int) -> None:
+        '''
+            Scrolls a wrapping view so that row `first` (counting wrapped rows)
+            is at the top.
+        '''
+        first = max(0, min(first, self._wrap.total - 1))
+        delta = first - self._first()
+        self._top, self._sub = self._wrap.locate(first)
+        if delta:
+            self._shift(0, -delta)
+
+    def _col_at(self, row:int, sub:int, x:int) -> int:
+        '''
+            Returns the index of the character displayed at column `x` of line
+            `row`, or of row `sub` of it if wrapping (in which case `sub` is
+            not None).  Positions beyond the end of a row are clamped to its
+            last character, or to the end of the line on its last row.
+        '''
+        line = self._buffer.line(row)
+        start = 0
+        stop = len(line)
+        if sub is not None:
+            offsets = self._wrap.offsets(row, line)
+            start = offsets[sub]
+            if sub + 1 < len(offsets):
+                stop = offsets[sub + 1] - 1
+        index = column_index(line[start:stop])
+        if index is None:
+            return start + min(max(x, 0), stop - start)
+        return start + int(np.searchsorted(index, max(x, 0), 'right'))
+
+    def _layout(self) -> List[Tuple]:
+        '''
+            Returns the line index, text, and range of characters shown on each
+            row of a wrapping view, down to the end of the buffer.
+        '''
+        rows = []
+        row = self._top
+        lines = self._buffer.lines(self._top, self._top + self._height)
+        for line in lines:
+            offsets = self._wrap.offsets(row, line)
+            stops = offsets[1:] + (len(line),)
+            start = self._sub if row == self._top else 0
+            for i, j in zip(offsets[start:], stops[start:]):
+                rows.append((row, line, i, j))
+            if len(rows) >= self._height:
+                break
+            row += 1
+        return rows[:self._height]
+
+    def _render_wrapped(self) -> str:
+        '''
+            Returns the string that rewrites the dirty rows of a wrapping view.
+        '''
+        highlighter = self._highlighter
+        if not self._dirty and highlighter is None:
+            return ''
+        layout = self._layout()
+        if highlighter is not None and layout:
+            states = highlighter.states(self._top, layout[-1][0] + 1)
+            for y, (row, _, _, _) in enumerate(layout):
+                if states[row - self._top] != self._drawn[y]:
+                    self._dirty.add(y)
+
+        out = ''
+        runs = {}
+        for y in sorted(self._dirty):
+            out += f'\033[{self._y0+y+1};{self._x0+1}f'
+            if y >= len(layout):
+                out += ' '*self._width
+                self._drawn[y] = None
+                continue
+            row, line, i, j = layout[y]
+            if highlighter is None:
+                out += pad_to_width(line[i:j], self._width)
+                continue
+            if row not in runs:
+                runs[row] = highlighter.runs(row, line)
+            out += self._paint(line, runs[row], i, j, 0)
+            self._drawn[y] = states[row - self._top]
+        return out
+
+    def _styled(self, line:str, runs:Sequence[Tuple]) -> str:
+        '''
+            Returns the part of `line` that is in view, padded to the width of
+            the view, with the escape sequences of the styled `runs` (see
+            `Highlighter.runs`) around the characters they cover.
+        '''
+        index = column_index(line)
+        lead = 0
+        if index is None:
+            i = min(self._left, len(line))
+            j = min(self._left + self._width, len(line))
+        else:
+            # Wide characters cut by either edge of the view are replaced by
+            # spaces
+            i, j, lead = column_span(index, self._left, self._width)
+        return self._paint(line, runs, i, j, lead)
+
+    def _paint(
+    self, line:str, runs:Sequence[Tuple], i:int, j:int, lead:int) -> str:
+        '''
+            Returns characters `i` to `j` of `line` after `lead` spaces, padded
+            to the width of the view, with the escape sequences of the styled
+            `runs` around the characters they cover.
+        '''
+        parts = [' '*lead]
+        pos = i
+        for start, stop, sgr in runs:
+            start = max(start, i)
+            stop = min(stop, j)
+            if start >= stop:
+                continue
+            parts.append(line[pos:start])
+            parts.append(f'{sgr}{line[start:stop]}\033[m')
+            pos = stop
+        parts.append(line[pos:j])
+        width = lead + str_width(line[i:j])
+        parts.append(' '*max(0, self._width - width))
+        return ''.join(parts)
+
+    def _on_edit(self, offset:int, row:int, removed:str, inserted:str) -> None:
+        '''
+            Called by the buffer after each edit; marks the rows that changed.
+        '''
+        n_removed = removed.count('\n')
+        n_inserted = inserted.count('\n')
+        net = n_inserted - n_removed
+        if self._wrap:
+            self._on_edit_wrapped(row, n_removed, n_inserted)
+            return
+
+        if row + n_removed < self._top:
+            # The edit lies entirely above the view, which moves with the
+            # lines it was showing.
+            self._top += net
+            return
+        elif row < self._top:
+            # The line at the top of the view was edited, and may be gone
+            self._top = min(self._top, row, self._buffer.line_count - 1)
+            self.invalidate()
+            return
+
+        y = row - self._top
+        if y >= self._height:
+            return
+        if net:
+            self._shift(y + 1, net)
+        for i in range(y, min(y + n_inserted + 1, self._height)):
+            self._dirty.add(i)
+
+    def _on_edit_wrapped(
+    self, row:int, n_removed:int, n_inserted:int) -> None:
+        '''
+            Equivalent to `_on_edit` for a wrapping view, where the rows of the
+            edited lines are shifted by the change in the number of rows they
+            take, rather than by the change in the number of lines.
+        '''
+        before, after = self._wrap.edit(row, n_removed, n_inserted)
+        if row + n_removed < self._top:
+            self._top += n_inserted - n_removed
+            return
+        elif row < self._top or (row == self._top and self._sub):
+            # The line at the top of the view was edited
+            self._top = min(self._top, row)
+            self._sub = min(self._sub, self._wrap.rows(self._top) - 1)
+            self.invalidate()
+            return
+
+        y = self._wrap.first_row(row) - self._first()
+        if y >= self._height:
+            return
+        if after != before:
+            self._shift(y + min(before, after), after - before)
+        for i in range(y, min(y + after, self._height)):
+            self._dirty.add(i)
+
+    def _shift(self, y:int, n:int) -> None:
+        '''
+            Moves the rows from `y` to the bottom of the view down by `n` rows
+            (up if `n` is negative), and marks the rows that were exposed as
+            dirty.
+        '''
+        rows = self._height - y
+        if len(self._dirty) == self._height:
+            # Every row will be rewritten anyway
+            return
+        elif abs(n) >= rows or not self._full_width:
+            for i in range(max(y, 0), self._height):
+                self._dirty.add(i)
+            return
+
+        # Inserting or deleting lines at the top of a scroll region shifts
+        # the rest of the region, and nothing outside of it.
+        region = f'\033[{self._y0+y+1};{self._y0+self._height}r'
+        move = f'\033[{self._y0+y+1};1f'
+        move += f'\033[{n}L' if n > 0 else f'\033[{-n}M'
+        self._ops.append(f'{region}{move}\033[r')
+
+        dirty = set()
+        for i in self._dirty:
+            if i < y:
+                dirty.add(i)
+            elif y <= i + n < self._height and (n > 0 or i >= y - n):
+                dirty.add(i + n)
+        if n > 0:
+            exposed = range(y, y + n)
+            drawn = self._drawn[:y] + [None]*n + self._drawn[y:]
+        else:
+            exposed = range(self._height + n, self._height)
+            drawn = self._drawn[:y] + self._drawn[y-n:] + [None]*(-n)
+        dirty.update(exposed)
+        self._dirty = dirty
+        self._drawn = drawn[:self._height]
@@ -0,0 +1,290 @@
+from typing import Tuple, Union
+from collections import deque
+
+from termutils.obj.TextBuffer import TextBuffer
+
+# Approximate memory used by an operation besides its text, in bytes.
+_OP_OVERHEAD = 64
+
+class _Edit:
+
+    '''
+        A single undoable step: a list of insertions and deletions, applied in
+        order, and the cursor positions before and after them.
+    '''
+
+    __slots__ = (
+        'kind', 'ops', 'before', 'after', 'open', 'size', 'pieces', 'length'
+    )
+
+    def __init__(self, kind:str, before:Tuple[int]) -> None:
+        self.kind = kind
+        # Each operation is (is_insert, offset, text)
+        self.ops = []
+        self.before = before
+        self.after = before
+        self.open = kind is not None
+        self.size = 0
+        # While steps are being coalesced into this one, the text of its last
+        # operation is kept as pieces, and their total length, so that each
+        # keystroke does not copy everything typed before it
+        self.pieces = None
+        self.length = 0
+
+    def seal(self) -> None:
+        '''
+            Joins the pieces of the last operation, and prevents any further
+            steps from being coalesced into this one.
+        '''
+        self.open = False
+        if self.pieces is not None:
+            is_insert, offset, _ = self.ops[-1]
+            self.ops[-1] = (is_insert, offset, ''.join(self.pieces))
+            self.pieces = None
+
+class UndoStack:
+
+    '''
+        Records the edits made to a `TextBuffer` as a log of operations, so
+        that undoing an edit applies its inverse rather than restoring a copy
+        of the whole document.  Undo and redo both take time proportional to
+        the size of the edit.
+
+        Edits are made through `insert` and `delete` between calls to `begin`
+        and `end`, and everything between a pair of calls is undone as one
+        step.  Consecutive steps of the same `kind` (such as typing, or
+        repeated backspaces) that continue where the last one left off are
+        coalesced into a single step.
+
+        The text held by the stack is limited to roughly `max_bytes`, beyond
+        which the oldest steps are forgotten.
+    '''
+
+    def __init__(self, max_bytes:int = 2**24) -> None:
+        '''
+            Creates a new, empty instance of `UndoStack`.
+        '''
+        if max_bytes != int(max_bytes) or max_bytes <= 0:
+            msg = (
+                f'\n\nArgument `max_bytes` in the instantiation of <class '
+                f'\'UndoStack\'> must be a positive integer.'
+            )
+            raise ValueError(msg)
+
+        self._max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        self._pending = None
+
+    '''GETTERS'''
+
+    @property
+    def can_undo(self) -> bool:
+        '''
+            Returns True if there is a step to undo.
+        '''
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        '''
+            Returns True if there is a step to redo.
+        '''
+        return bool(self._redo)
+
+    @property
+    def nbytes(self) -> int:
+        '''
+            Returns the approximate memory used by the recorded steps.
+        '''
+        return self._bytes
+
+    '''SETTERS'''
+
+    def begin(self, cursor:Tuple[int], kind:str = None) -> None:
+        '''
+            Starts a new step, given the position of the cursor before it.
+            Steps whose `kind` is None are never coalesced.
+        '''
+        self._pending = _Edit(kind, tuple(cursor))
+
+    def insert(self, buffer:TextBuffer, offset:int, text:str) -> None:
+        '''
+            Inserts `text` into `buffer` at `offset`, recording the operation
+            in the current step.
+        '''
+        self._check_pending()
+        buffer.insert(offset, text)
+        self._record(True, offset, text)
+
+    def delete(self, buffer:TextBuffer, start:int, stop:int) -> str:
+        '''
+            Removes the range [start, stop) from `buffer`, recording the
+            operation in the current step.  Returns the removed text.
+        '''
+        self._check_pending()
+        removed = buffer.delete(start, stop)
+        self._record(False, start, removed)
+        return removed
+
+    def end(self, cursor:Tuple[int]) -> None:
+        '''
+            Completes the current step, given the position of the cursor after
+            it.  A step that changed nothing is discarded, but still prevents
+            the steps on either side of it from being coalesced.
+        '''
+        edit, self._pending = self._pending, None
+        if edit is None:
+            return
+        elif not edit.ops:
+            self.seal()
+            return
+
+        edit.after = tuple(cursor)
+        self._clear_redo()
+
+        last = self._undo[-1] if self._undo else None
+        if last is not None and last.open and last.kind == edit.kind:
+            if self._coalesce(last, edit):
+                last.after = edit.after
+                self._trim()
+                return
+
+        self.seal()
+        self._undo.append(edit)
+        self._bytes += edit.size
+        self._trim()
+
+    def seal(self) -> None:
+        '''
+            Prevents the most recent step from being coalesced with the next.
+        '''
+        if self._undo:
+            self._undo[-1].seal()
+
+    def undo(self, buffer:TextBuffer) -> Union[Tuple[int], None]:
+        '''
+            Reverts the most recent step in `buffer`, and returns the cursor
+            position from before it.  Returns None if there is nothing to undo.
+        '''
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        edit.seal()
+        for is_insert, offset, text in reversed(edit.ops):
+            if is_insert:
+                buffer.delete(offset, offset + len(text))
+            else:
+                buffer.insert(offset, text)
+        self._redo.append(edit)
+        return edit.before
+
+    def redo(self, buffer:TextBuffer) -> Union[Tuple[int], None]:
+        '''
+            Reapplies the most recently undone step in `buffer`, and returns
+            the cursor position from after it.  Returns None if there is
+            nothing to redo.
+        '''
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        for is_insert, offset, text in edit.ops:
+            if is_insert:
+                buffer.insert(offset, text)
+            else:
+                buffer.delete(offset, offset + len(text))
+        self._undo.append(edit)
+        return edit.after
+
+    def clear(self) -> None:
+        '''
+            Forgets every recorded step.
+        '''
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._pending = None
+
+    '''PRIVATE METHODS'''
+
+    def _check_pending(self) -> None:
+        '''
+            Raises a RuntimeError if no step has been begun.
+        '''
+        if self._pending is None:
+            msg = (
+                f'\n\nEdits to a <class \'TextBuffer\'> through an instance of '
+                f'<class \'UndoStack\'> must be made between calls to `begin` '
+                f'and `end`.'
+            )
+            raise RuntimeError(msg)
+
+    def _record(self, is_insert:bool, offset:int, text:str) -> None:
+        '''
+            Adds an operation to the current step.
+        '''
+        if not text:
+            return
+        self._pending.ops.append((is_insert, offset, text))
+        self._pending.size += len(text) + _OP_OVERHEAD
+
+    def _coalesce(self, last:_Edit, edit:_Edit) -> bool:
+        '''
+            Merges `edit` into `last` if it consists of a single operation that
+            continues the last operation of `last`.  Returns True on success.
+        '''
+        if len(edit.ops) != 1:
+            return False
+        is_insert, offset, text = edit.ops[0]
+        prev_insert, prev_offset, prev_text = last.ops[-1]
+        if is_insert != prev_insert:
+            return False
+        if last.pieces is None:
+            last.pieces = deque((prev_text,))
+            last.length = len(prev_text)
+        pieces = last.pieces
+
+        if is_insert:
+            # Typing continues at the end of the last insertion, and a new
+            # step begins with each word or line.
+            if offset != prev_offset + last.length:
+                return False
+            elif text[:1].isspace() and not pieces[-1][-1:].isspace():
+                return False
+            elif pieces[-1].endswith('\n'):
+                return False
+            pieces.append(text)
+            offset = prev_offset
+        elif offset + len(text) == prev_offset:
+            # Backspace
+            pieces.appendleft(text)
+        elif offset == prev_offset:
+            # Delete
+            pieces.append(text)
+        else:
+            return False
+
+        # The text of the operation is filled in from the pieces by `seal`
+        last.ops[-1] = (is_insert, offset, None)
+        last.length += len(text)
+        last.size += len(text)
+        self._bytes += len(text)
+        return True
+
+    def _clear_redo(self) -> None:
+        '''
+            Discards the steps that can be redone, since a new step has been
+            made after them.
+        '''
+        for edit in self._redo:
+            self._bytes -= edit.size
+        self._redo.clear()
+
+    def _trim(self) -> None:
+        '''
+            Forgets the oldest steps until the memory limit is respected,
+            always keeping the most recent one.
+        '''
+        while self._bytes > self._max_bytes and len(self._undo) > 1:
+            self._bytes -= self._undo.popleft().size
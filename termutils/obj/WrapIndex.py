@@ -0,0 +1,268 @@
+from typing import Tuple
+import itertools
+
+import numpy as np
+
+from termutils.obj.TextBuffer import TextBuffer
+from termutils.utils.width import str_widths
+from termutils.utils.wrap import wrap_offsets
+
+# The number of lines per block.  Blocks are split once they reach twice
+# this size, and merged with a neighbor once they fall below half of it.
+_BLOCK = 512
+
+def _fenwick(values:np.ndarray) -> np.ndarray:
+    '''
+        Builds a Fenwick tree of `values` in O(n) time: node i holds the sum
+        of the `i & -i` values that end at index i (counting from one).
+    '''
+    cum = np.zeros(len(values) + 1, dtype = np.int64)
+    np.cumsum(values, out = cum[1:])
+    idx = np.arange(len(cum))
+    return cum - cum[idx - (idx & -idx)]
+
+def _fenwick_add(tree:np.ndarray, i:int, delta:int) -> None:
+    '''
+        Adds `delta` to value `i` (counting from zero) of a Fenwick tree.
+    '''
+    i += 1
+    while i < len(tree):
+        tree[i] += delta
+        i += i & -i
+
+class WrapIndex:
+
+    '''
+        Maps between the lines of a `TextBuffer` and the rows they occupy on
+        the terminal when they are soft-wrapped to a given width (see
+        `utils.wrap.wrap_offsets`).
+
+        The number of rows taken by each line is stored in blocks of a few
+        hundred consecutive lines, and two Fenwick trees (binary indexed
+        trees) hold the number of lines and of rows in each block.  The block
+        holding a line, or a row, is found by descending the trees in
+        O(log n) time, and the line within it with a vectorized search of the
+        block.  An edit updates a single block and both trees in O(log n)
+        time, even if it adds or removes lines; only when a block grows too
+        large or too small are the blocks around it split or merged, and the
+        trees rebuilt.
+
+        The index does not subscribe to the buffer: its owner passes each edit
+        to `edit`, which returns the rows taken by the edited lines before and
+        after it, so that the owner can shift what it displays.
+    '''
+
+    def __init__(self, buffer:TextBuffer, width:int) -> None:
+        '''
+            Measures every line of `buffer` wrapped to `width` columns.
+        '''
+        if width <= 0:
+            msg = (
+                f'\n\nArgument `width` in the instantiation of <class '
+                f'\'WrapIndex\'> must be a positive integer.'
+            )
+            raise ValueError(msg)
+
+        self._buffer = buffer
+        self._width = width
+        self._build()
+
+    '''GETTERS'''
+
+    @property
+    def width(self) -> int:
+        '''
+            Returns the width to which lines are wrapped.
+        '''
+        return self._width
+
+    @property
+    def total(self) -> int:
+        '''
+            Returns the number of rows taken by the whole buffer.
+        '''
+        return self._total
+
+    def rows(self, line:int) -> int:
+        '''
+            Returns the number of rows taken by `line`.
+        '''
+        block, i, _ = self._descend(self._line_tree, self._row_tree, line)
+        return int(self._blocks[block][i])
+
+    def offsets(self, line:int, text:str = None) -> Tuple[int]:
+        '''
+            Returns the index of the first character on each row of `line`.
+            `text` may be given if the line was already read.
+        '''
+        if text is None:
+            text = self._buffer.line(line)
+        return wrap_offsets(text, self._width)
+
+    def first_row(self, line:int) -> int:
+        '''
+            Returns the row on which `line` begins.
+        '''
+        block, i, row = self._descend(self._line_tree, self._row_tree, line)
+        if block == len(self._blocks):
+            return row
+        return row + int(self._blocks[block][:i].sum())
+
+    def locate(self, row:int) -> Tuple[int]:
+        '''
+            Returns the line shown on `row`, and which of its rows it is.  Rows
+            past the end of the buffer are clamped to its last row.
+        '''
+        row = min(max(row, 0), self._total - 1)
+        block, row, line = self._descend(self._row_tree, self._line_tree, row)
+        cum = np.cumsum(self._blocks[block])
+        i = int(np.searchsorted(cum, row, 'right'))
+        if i:
+            row -= int(cum[i-1])
+        return line + i, row
+
+    '''SETTERS'''
+
+    def set_width(self, width:int) -> None:
+        '''
+            Measures every line again, wrapped to `width` columns.
+        '''
+        if width != self._width:
+            self._width = width
+            self._build()
+
+    def edit(self, row:int, n_removed:int, n_inserted:int) -> Tuple[int]:
+        '''
+            Updates the index after an edit to `buffer` which began on line
+            `row`, and removed and inserted the given numbers of line breaks.
+            Returns the number of rows taken by the edited lines before and
+            after the edit.
+        '''
+        block, i, _ = self._descend(self._line_tree, self._row_tree, row)
+        new = self._measure(row, row + n_inserted + 1)
+        after = int(new.sum())
+        stop = i + n_removed + 1
+        counts = self._blocks[block]
+
+        if stop <= len(counts) and n_removed == n_inserted:
+            # The same lines are still there, so the counts change in place
+            before = int(counts[i:stop].sum())
+            counts[i:stop] = new
+            self._resize(block, 0, after - before)
+            return before, after
+
+        # The edited lines, which may span several blocks
+        last = block
+        length = len(counts)
+        while length < stop:
+            last += 1
+            length += len(self._blocks[last])
+        if last > block:
+            counts = np.concatenate(self._blocks[block:last+1])
+        before = int(counts[i:stop].sum())
+        counts = np.concatenate((counts[:i], new, counts[stop:]))
+
+        if last == block and _BLOCK//2 <= len(counts) <= 2*_BLOCK:
+            self._blocks[block] = counts
+            self._resize(block, n_inserted - n_removed, after - before)
+        else:
+            self._replace(block, last + 1, counts)
+        return before, after
+
+    '''PRIVATE METHODS'''
+
+    def _measure(self, start:int, stop:int) -> np.ndarray:
+        '''
+            Returns the number of rows taken by each of lines `start` to
+            `stop`, reading them in a single pass but measuring them one block
+            at a time, so that they are never all held at once.
+        '''
+        lines = self._buffer.lines(start, stop)
+        parts = []
+        while True:
+            batch = list(itertools.islice(lines, _BLOCK))
+            if not batch:
+                break
+            widths = str_widths(batch)
+            counts = np.ones(len(batch), dtype = np.int64)
+            # Only lines wider than the view need to be broken up to be
+            # counted
+            for n in np.flatnonzero(widths > self._width).tolist():
+                counts[n] = len(wrap_offsets(batch[n], self._width))
+            parts.append(counts)
+        if not parts:
+            return np.zeros(0, dtype = np.int64)
+        return np.concatenate(parts)
+
+    def _build(self) -> None:
+        '''
+            Measures every line of the buffer.
+        '''
+        counts = self._measure(0, self._buffer.line_count)
+        self._blocks = []
+        self._sizes = np.zeros(0, dtype = np.int64)
+        self._sums = np.zeros(0, dtype = np.int64)
+        self._replace(0, 0, counts)
+
+    def _replace(self, first:int, stop:int, counts:np.ndarray) -> None:
+        '''
+            Replaces blocks `first` to `stop` by the row counts `counts`,
+            which are merged with a neighboring block if there are too few of
+            them and split into several blocks if there are too many, and
+            rebuilds the trees.
+        '''
+        if len(counts) < _BLOCK//2:
+            if stop < len(self._blocks):
+                counts = np.concatenate((counts, self._blocks[stop]))
+                stop += 1
+            elif first > 0:
+                first -= 1
+                counts = np.concatenate((self._blocks[first], counts))
+        n = max(1, -(-len(counts) // _BLOCK))
+        blocks = np.array_split(counts, n) if n > 1 else [counts]
+        blocks = [block.copy() for block in blocks]
+
+        self._blocks[first:stop] = blocks
+        sizes = np.array([len(block) for block in blocks], dtype = np.int64)
+        sums = np.array([block.sum() for block in blocks], dtype = np.int64)
+        self._sizes = np.concatenate(
+            (self._sizes[:first], sizes, self._sizes[stop:])
+        )
+        self._sums = np.concatenate(
+            (self._sums[:first], sums, self._sums[stop:])
+        )
+        self._line_tree = _fenwick(self._sizes)
+        self._row_tree = _fenwick(self._sums)
+        self._total = int(self._sums.sum())
+
+    def _resize(self, block:int, lines:int, rows:int) -> None:
+        '''
+            Adds `lines` lines and `rows` rows to the totals of `block`.
+        '''
+        if lines:
+            self._sizes[block] += lines
+            _fenwick_add(self._line_tree, block, lines)
+        if rows:
+            self._sums[block] += rows
+            _fenwick_add(self._row_tree, block, rows)
+            self._total += rows
+
+    def _descend(
+    self, tree:np.ndarray, other:np.ndarray, target:int) -> Tuple[int]:
+        '''
+            Finds the block containing item `target` (a line or a row) by
+            descending `tree`.  Returns the number of the block, the index of
+            the item within it, and the sum of the blocks before it in the
+            `other` tree.
+        '''
+        n = len(self._blocks)
+        block = 0
+        total = 0
+        step = 1 << (n.bit_length() - 1)
+        while step:
+            if block + step <= n and tree[block + step] <= target:
+                block += step
+                target -= int(tree[block])
+                total += int(other[block])
+            step >>= 1
+        return block, int(target), total
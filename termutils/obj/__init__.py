@@ -1,4 +1,17 @@
 from .widgets import *
 from .Color import Color
-from .LiveMenu import LiveMenu
+from .LiveMenu import LiveMenu, Paste
+from .Blitter import Blitter
+from .Channel import Channel
+from .RingBuffer import RingBuffer
+from .DataSource import DataSource, StdinSource, FileSource, SocketSource
+from .PlotExporter import PlotExporter
+from .ParameterSweep import ParameterSweep
+from .TextBuffer import TextBuffer
+from .UndoStack import UndoStack
+from .Highlighter import Highlighter
+from .WrapIndex import WrapIndex
+from .TextView import TextView
+from .TextSearch import TextSearch
+from .SmartMenu import SmartMenu
 from .String import String
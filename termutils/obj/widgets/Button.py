@@ -1,11 +1,12 @@
+from typing import Callable, Union, Dict
 from warnings import warn
-from textwrap import wrap
-from typing import Union
 
+from termutils.obj.widgets.Widget import Widget
+from termutils.utils.width import str_width, truncate_to_width
+from termutils.utils.wrap import wrap
 from termutils.obj.Color import Color
-from termutils.config import defaults
 
-class Button:
+class Button(Widget):
     '''
         A button with a user-selected background color, text color, text style,
         and string.  To be used with class `SmartMenu`.
@@ -13,88 +14,119 @@ class Button:
 
     def __init__(
     self, x0:int, y0:int, x1:int, y1:int, text:str, style:str = None,
-    background:Union[str, Color] = None, foreground:Union[str, Color] = None):
+    background:Union[str, Color] = None, foreground:Union[str, Color] = None,
+    on_click:Callable = None):
         '''
             Returns a new instance of class `Button`.
+
+            If given, `on_click` is called as `on_click(button, btn)` whenever
+            the button is clicked, where `btn` is the mouse event dict created
+            by `LiveMenu`.
         '''
-        text = text.strip()
+        self._pressed = False
+        self._on_click = on_click
 
-        self._x0 = x0
-        self._y0 = y0
-        self._x1 = x1
-        self._y1 = y1
-        self._text = text
+        super().__init__(
+            y0, x0, y1, x1, background = background, foreground = foreground,
+            style = style
+        )
 
-        self._size = (y1-y0)*(x1-x0)
-        self._shape = (y1-y0, x1-x0)
+        # The pressed state swaps the foreground and background colors.
+        self._released_format = self.ANSI_format
+        self._pressed_format = (
+            f'\033[{self._style_fmt}'
+            f'{self._back_fmt.replace("48;2", "38;2", 1)};'
+            f'{self._fore_fmt.replace("38;2", "48;2", 1)}m'
+        )
 
-        if self._shape[0] <= 0 or self._shape[1] <= 0:
-            msg = (
-                f'\n\nWhen instantiating class `Button`, arguments `x1` and '
-                f'`y1` must be larger than `x0` and `y0`, respectively.'
-            )
-            raise ValueError(msg)
-
-        if background is None:
-            background = defaults.background_color
-        elif isinstance(background, str):
-            background = Color.palette(background)
-        elif isinstance(background, (tuple, list, np.ndarray)):
-            background = Color(background)
-        elif not isinstance(background, Color):
-            msg = (
-                f'\n\nInvalid attempt to create `Button` with background color '
-                f'`{background}`.'
-            )
-            raise ValueError(msg)
-
-        if foreground is None:
-            foreground = defaults.foreground_color
-        elif isinstance(foreground, str):
-            foreground = Color.palette(foreground)
-        elif isinstance(foreground, (tuple, list, np.ndarray)):
-            foreground = Color(foreground)
-        elif not isinstance(foreground, Color):
-            msg = (
-                f'\n\nInvalid attempt to create `Button` with text color '
-                f'`{foreground}`.'
-            )
-            raise ValueError(msg)
+        self.__call__(text)
 
+    # PROPERTIES
+    @property
+    def text(self) -> str:
+        '''
+            Returns the button's label.
+        '''
+        return self._label
+
+    @property
+    def pressed(self) -> bool:
+        '''
+            Returns True if the button is currently held down.
+        '''
+        return self._pressed
+
+    # SETTERS
+    def __call__(self, text:str) -> None:
+        '''
+            Sets the button's label, wrapping it over multiple lines if it is
+            wider than the button.
+        '''
         if not isinstance(text, str):
             msg = (
                 f'\n\nArgument `text` in constructor of class `Button` expects '
                 f'a value of <class \'str\'>, got {type(text)}.'
             )
-            raise TypeError(text)
-        elif len(text) > self._size:
+            raise TypeError(msg)
+
+        text = text.strip()
+        label = text
+        width = str_width(text)
+
+        if width > self._size:
             msg = (
-                f'\n\nButton text `{text}` will be cut off since text length '
-                f'({len(text)}) exceeds button dimensions ({self._size}).'
+                f'\n\nButton text `{text}` will be cut off since text width '
+                f'({width}) exceeds button dimensions ({self._size}).'
             )
-            self._text = text[:self._size-1].strip() + '…'
+            label = truncate_to_width(text, self._size, '…')
             warn(msg)
-        elif len(text) > self._shape[1]:
+        elif width > self._shape[1]:
             msg = (
                 f'\n\nButton text `{text}` will be separated into multiple '
-                f'lines, since text length ({len(text)}) exceeds button width '
-                f'({(x1-x0)}).'
+                f'lines, since text width ({width}) exceeds button width '
+                f'({self._shape[1]}).'
             )
             warn(msg)
-        self._text = wrap(self._text, self._shape[1])
+
+        self._label = text
+        self._text_rows = wrap(label, self._shape[1])
+        super().__call__('\n'.join(self._text_rows), fmt_spec = 'c')
+
+    def set_on_click(self, on_click:Callable) -> None:
+        '''
+            Sets the callable that is run when the button is clicked.
+        '''
+        self._on_click = on_click
+
+    def press(self) -> None:
+        '''
+            Displays the button in its pressed state.
+        '''
+        if not self._pressed:
+            self._pressed = True
+            self.ANSI_format = self._pressed_format
+            self._dirty = True
+
+    def release(self) -> None:
+        '''
+            Displays the button in its released state.
+        '''
+        if self._pressed:
+            self._pressed = False
+            self.ANSI_format = self._released_format
+            self._dirty = True
+
+    def click(self, btn:Dict[str,Union[str,int]] = None) -> None:
+        '''
+            Presses the button and runs its `on_click` callable, if any.
+        '''
+        self.press()
+        if self._on_click is not None:
+            self._on_click(self, btn)
 
     def check_lims(self, x:int, y:int) -> bool:
         '''
             If the given coordinate is within the button limits, returns True.
             Returns False otherwise.
         '''
-        if y < y0:
-            return False
-        elif y > y1:
-            return False
-        elif x < x0:
-            return False
-        elif x > x1:
-            return False
-        else:
-            return True
+        return super().check_lims(y, x)
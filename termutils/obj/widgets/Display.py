@@ -1,8 +1,14 @@
 from typing import Union, Tuple
 
+import numpy as np
+
+from termutils.utils.width import pad_to_width
+from termutils.utils.wrap import wrap_paragraph
+from termutils.obj.widgets.Widget import Widget
 from termutils.obj.Color import Color
+from termutils.config import defaults
 
-class Display:
+class Display(Widget):
 
     '''
         For displaying text in a region of the terminal with automatic
@@ -11,7 +17,8 @@ class Display:
 
     def __init__(
     self, x0:int, y0:int, x1:int, y1:int, border:Union[str, Color] = None,
-    background:Union[str, Color] = None, foreground:Union[str, Color] = None):
+    background:Union[str, Color] = None, foreground:Union[str, Color] = None,
+    style:str = None):
         '''
             Returns a new instance of class `Display`
         '''
@@ -23,23 +30,8 @@ class Display:
             )
             raise ValueError(msg)
 
-        self._x0 = x0
-        self._y0 = y0
-        self._x1 = x1
-        self._y1 = y1
-
-        self._size = (y1-y0)*(x1-x0)
-        self._shape = (y1-y0, x1-x0)
-
-        if self._shape[0] <= 0 or self._shape[1] <= 0:
-            msg = (
-                f'\n\nWhen instantiating class `Display`, arguments `x1` and '
-                f'`y1` must be larger than `x0` and `y0`, respectively.'
-            )
-            raise ValueError(msg)
-
         if border is None:
-            border = defaults.btn_border
+            border = Color.palette(defaults.foreground_color)
         elif isinstance(border, str):
             border = Color.palette(border)
         elif isinstance(border, (tuple, list, np.ndarray)):
@@ -50,51 +42,78 @@ class Display:
                 f'`{border}`.'
             )
             raise ValueError(msg)
+        self._border = border
 
-        if background is None:
-            background = defaults.background_color
-        elif isinstance(background, str):
-            background = Color.palette(background)
-        elif isinstance(background, (tuple, list, np.ndarray)):
-            background = Color(background)
-        elif not isinstance(background, Color):
-            msg = (
-                f'\n\nInvalid attempt to create `Display` with background color '
-                f'`{background}`.'
-            )
-            raise ValueError(msg)
+        # Each paragraph is wrapped separately, so that appending text only
+        # rewraps the last one; `_last_start` is the index of its first row.
+        self._paragraphs = ['']
+        self._text_rows = []
+        self._last_start = 0
+        self._rows_cache = {}
 
-        if foreground is None:
-            foreground = defaults.foreground_color
-        elif isinstance(foreground, str):
-            foreground = Color.palette(foreground)
-        elif isinstance(foreground, (tuple, list, np.ndarray)):
-            foreground = Color(foreground)
-        elif not isinstance(foreground, Color):
-            msg = (
-                f'\n\nInvalid attempt to create `Display` with text color '
-                f'`{foreground}`.'
-            )
-            raise ValueError(msg)
+        super().__init__(
+            y0, x0, y1, x1, background = background, foreground = foreground,
+            style = style
+        )
 
-        self._text = self.__call__('')
+    # PROPERTIES
+    @property
+    def text(self) -> str:
+        '''
+            Returns the full text of the display.
+        '''
+        return '\n'.join(self._paragraphs)
 
+    # SETTERS
     def __call__(self, text:str) -> None:
         '''
-            Sets the current state of the display to the given text.  Ignores
-            newline characters and automatically formats using python's
-            textwrap.wrap utility.
+            Sets the current state of the display to the given text, which is
+            wrapped to the display width paragraph by paragraph; newline
+            characters separate paragraphs.
+        '''
+        self._paragraphs = []
+        self._text_rows = []
+        self._last_start = 0
+        self._add_paragraphs(text.strip().split('\n'))
+        self._set_rows(list(self._text_rows))
+
+    def append(self, text:str) -> None:
+        '''
+            Appends text to the end of the display.  Only the last paragraph,
+            and any paragraphs added by `text`, are rewrapped.
         '''
-        self._text = [i.strip() for i in wrap(text.strip(), self._shape[1])]
+        if not text:
+            return
+        start = self._last_start
+        paragraphs = text.split('\n')
+        paragraphs[0] = self._paragraphs.pop() + paragraphs[0]
+        del self._text_rows[start:]
+        self._add_paragraphs(paragraphs)
+        self._set_rows(self._text_rows[start:], start = start)
 
+    # GETTERS
     def rows(self, fmt_spec:str = '<') -> Tuple[str]:
         '''
             Returns the rows of the display as a list of strings.  Each row
-            is exactly the length of self.shape[1].
+            is exactly self.shape[1] terminal columns wide.
 
             `fmt_spec` can take the values '<', '>', and '^'.
         '''
-        rows = []
-        for i in self._text:
-            rows.append(f'{i:{fmt_spec}{self._shape[1]}s}')
-        return tuple(rows)
+        if fmt_spec not in self._rows_cache:
+            self._rows_cache[fmt_spec] = tuple(
+                pad_to_width(i, self._shape[1], fmt_spec) for i in self._text_rows
+            )
+        return self._rows_cache[fmt_spec]
+
+    # PRIVATE METHODS
+    def _add_paragraphs(self, paragraphs:list) -> None:
+        '''
+            Wraps and appends the given paragraphs to the display's rows.
+        '''
+        self._rows_cache = {}
+        for paragraph in paragraphs:
+            self._last_start = len(self._text_rows)
+            self._paragraphs.append(paragraph)
+            self._text_rows.extend(
+                wrap_paragraph(paragraph, self._shape[1]) or ('',)
+            )
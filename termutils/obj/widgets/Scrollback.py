@@ -0,0 +1,222 @@
+from typing import Iterable, Union
+from collections import deque
+import threading
+
+import numpy as np
+
+from termutils.obj.widgets.Widget import Widget
+from termutils.utils.width import str_width
+from termutils.obj.Color import Color
+
+class Scrollback(Widget):
+
+    '''
+        A scrollable pane of text lines, such as a live log, backed by a
+        fixed-capacity ring buffer.  Lines may be appended from any thread.
+
+        Retention is limited by line count (`max_lines`), by the total size
+        of the stored lines in bytes (`max_bytes`), or both; the oldest lines
+        are discarded first.  While the view is at the bottom of the buffer it
+        follows new lines, otherwise it stays on the lines being viewed.
+    '''
+
+    def __init__(
+    self, y0:int, x0:int, y1:int, x1:int, max_lines:int = 10000,
+    max_bytes:int = None, background:Union[str, Color] = None,
+    foreground:Union[str, Color] = None, style:str = None):
+        '''
+            Returns a new instance of class `Scrollback`.
+        '''
+        for i,j in zip((max_lines, max_bytes), ('max_lines', 'max_bytes')):
+            if i is not None and (i != int(i) or i <= 0):
+                msg = (
+                    f'\n\nArgument `{j}` in the instantiation of <class '
+                    f'\'Scrollback\'> must be a positive integer or None.'
+                )
+                raise ValueError(msg)
+        if max_lines is None and max_bytes is None:
+            msg = (
+                f'\n\nArguments `max_lines` and `max_bytes` in the '
+                f'instantiation of <class \'Scrollback\'> cannot both be None, '
+                f'since the buffer would grow without bound.'
+            )
+            raise ValueError(msg)
+
+        self._lock = threading.RLock()
+        self._max_lines = max_lines
+        self._max_bytes = max_bytes
+        self._lines = deque(maxlen = max_lines)
+        self._sizes = deque()
+        self._bytes = 0
+        self._max_width = 0
+        # `_start` is the number of lines discarded so far, so that `_top`
+        # (the first line in view) can be tracked as an absolute line number.
+        self._start = 0
+        self._top = 0
+        self._follow = True
+
+        super().__init__(
+            y0, x0, y1, x1, background = background, foreground = foreground,
+            style = style, column_index = False
+        )
+
+    # PROPERTIES
+    @property
+    def follow(self) -> bool:
+        '''
+            Returns True if the view is following newly appended lines.
+        '''
+        return self._follow
+
+    @property
+    def line_count(self) -> int:
+        '''
+            Returns the number of lines currently stored.
+        '''
+        return len(self._lines)
+
+    @property
+    def dropped(self) -> int:
+        '''
+            Returns the number of lines discarded to respect the retention
+            limits so far.
+        '''
+        return self._start
+
+    # SETTERS
+    def __call__(self, text:str, fmt_spec:str = '<') -> None:
+        '''
+            Replaces the contents of the pane with the lines of `text`.
+            `fmt_spec` is ignored, since lines are always left-aligned.
+        '''
+        if not isinstance(text, str):
+            msg = (
+                f'\n\nAttribute `text` in calling of {self._type} instance must'
+                f' be of <class \'str\'>.'
+            )
+            raise TypeError(msg)
+
+        with self._lock:
+            self._lines.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._max_width = 0
+            self._start = 0
+            self._top = 0
+            self._follow = True
+            self._rows = self._lines
+            self._indents = None
+            self._view = np.zeros(2, dtype = np.int64)
+            if text:
+                self.extend(text.split('\n'))
+            self._dirty = True
+
+    def append(self, line:str) -> None:
+        '''
+            Appends a single line to the pane in O(1), discarding the oldest
+            lines if a retention limit is exceeded.  Thread-safe.
+        '''
+        size = len(line) if line.isascii() else len(line.encode())
+        width = str_width(line)
+        with self._lock:
+            if len(self._lines) == self._max_lines:
+                # The deque discards its oldest line itself
+                self._bytes -= self._sizes.popleft()
+                self._start += 1
+            self._lines.append(line)
+            self._sizes.append(size)
+            self._bytes += size
+            if self._max_bytes is not None:
+                while self._bytes > self._max_bytes and len(self._lines) > 1:
+                    self._lines.popleft()
+                    self._bytes -= self._sizes.popleft()
+                    self._start += 1
+            if width > self._max_width:
+                self._max_width = width
+            if self._follow or self._top < self._start:
+                self._dirty = True
+
+    def extend(self, lines:Iterable[str]) -> None:
+        '''
+            Appends several lines to the pane.  Thread-safe.
+        '''
+        with self._lock:
+            for line in lines:
+                self.append(line)
+
+    def clear(self) -> None:
+        '''
+            Removes every line from the pane.
+        '''
+        self.__call__('')
+
+    def _set_view(self, y:int, x:int) -> None:
+        '''
+            Backend for method `set_view`, where `y` is relative to the oldest
+            stored line.  Moving the view to the bottom resumes following.
+        '''
+        with self._lock:
+            bottom = max(0, len(self._lines) - self._shape[0])
+            y = max(0, min(y, bottom))
+            x = max(0, min(x, max(0, self._max_width - self._shape[1])))
+            self._follow = y == bottom
+            self._top = self._start + y
+            if y != self._view[0] or x != self._view[1]:
+                self._dirty = True
+            self._view = np.array([y, x], dtype = np.int64)
+
+    def scroll_up(self, rows:int = 1) -> None:
+        '''
+            Scrolls the current view up by the designated number of rows.
+        '''
+        with self._lock:
+            self._sync_view()
+            super().scroll_up(rows)
+
+    def scroll_down(self, rows:int = 1) -> None:
+        '''
+            Scrolls the current view down by the designated number of rows.
+        '''
+        with self._lock:
+            self._sync_view()
+            super().scroll_down(rows)
+
+    # GETTERS
+    @property
+    def lines(self) -> tuple:
+        '''
+            Returns the lines currently in view, each exactly as wide as the
+            pane.
+        '''
+        with self._lock:
+            self._sync_view()
+            return super().lines
+
+    def render(self, ellipsis:bool = False) -> str:
+        '''
+            Returns the string that writes the visible lines to the pane's
+            designated coordinates.  Only the lines in view are read.
+        '''
+        with self._lock:
+            self._sync_view()
+            return super().render(ellipsis = ellipsis)
+
+    # PRIVATE METHODS
+    def _sync_view(self) -> None:
+        '''
+            Converts the absolute line number at the top of the view into an
+            index into the ring buffer, accounting for discarded lines.
+        '''
+        bottom = max(0, len(self._lines) - self._shape[0])
+        if self._follow:
+            y = bottom
+        else:
+            y = max(0, min(self._top - self._start, bottom))
+        self._top = self._start + y
+        self._view = np.array([y, self._view[1]], dtype = np.int64)
+
+    def _extent(self, row_idx:int) -> int:
+        '''
+            Returns the column at which the given row ends.
+        '''
+        return str_width(self._lines[row_idx])
@@ -5,6 +5,9 @@ import numpy as np
 
 from termutils.config.styles import styles as styles_dict
 from termutils.utils import text as textutils
+from termutils.utils.width import (
+    str_widths, column_index, slice_indexed, slice_columns
+)
 from termutils.obj.Color import Color
 from termutils.config import defaults
 
@@ -15,12 +18,21 @@ class Widget:
         <class 'Button'> or <class 'Display'>.  Should normally be inherited.
     '''
 
+    # Rows longer than this many characters are sliced using a cached column
+    # index, so that horizontal scrolling costs O(widget width).
+    _index_min = 256
+
     def __init__(
     self, y0:int, x0:int, y1:int, x1:int, background:Union[str, Color] = None,
-    foreground:Union[str, Color] = None, style:str = None):
+    foreground:Union[str, Color] = None, style:str = None,
+    column_index:bool = True):
         '''
             Returns a new instance of class `Widget`.  Shouldn't normally be
             instantiated directly, but inherited.
+
+            If `column_index` is True, a column index is built and cached the
+            first time each long row is displayed; otherwise long rows are
+            measured again on every render, which saves memory.
         '''
         # `Widget`, or the name of the subclass that inherits `Widget`.
         self._cls_name = self.__class__.__name__
@@ -51,7 +63,7 @@ class Widget:
                 raise ValueError(msg)
 
         if background is None:
-            background = defaults.background_color
+            background = Color.palette(defaults.background_color)
         elif isinstance(background, str):
             background = Color.palette(background)
         elif isinstance(background, (tuple, list, np.ndarray)):
@@ -64,10 +76,11 @@ class Widget:
                 f' user-provided color: `{background}`.'
             )
             raise ValueError(msg)
+        self._background = background
         self._back_fmt = '48;2;{};{};{}'.format(*background._rgb)
 
         if foreground is None:
-            foreground = defaults.foreground_color
+            foreground = Color.palette(defaults.foreground_color)
         elif isinstance(foreground, str):
             foreground = Color.palette(foreground)
         elif isinstance(foreground, (tuple, list, np.ndarray)):
@@ -80,6 +93,7 @@ class Widget:
                 f' user-provided color: `{foreground}`.'
             )
             raise ValueError(msg)
+        self._foreground = foreground
         self._fore_fmt = '38;2;{};{};{}'.format(*foreground._rgb)
 
         if style is None:
@@ -106,9 +120,28 @@ class Widget:
         Y,X = Y[:,:,None], X[:,:,None]
         self._indices = np.concatenate([X,Y], axis = 2)
 
+        # True whenever the widget must be rewritten to the terminal.
+        self._dirty = True
+        self._use_index = column_index
+
         self.__call__('')
 
     # PROPERTIES
+    @property
+    def dirty(self) -> bool:
+        '''
+            Returns True if the widget has changed since it was last written
+            to the terminal, False otherwise.
+        '''
+        return self._dirty
+
+    @property
+    def limits(self) -> Tuple[int]:
+        '''
+            Returns the widget's terminal coordinates as (y0, x0, y1, x1).
+        '''
+        return (self._y0, self._x0, self._y1, self._x1)
+
     @property
     def lines(self) -> Tuple[str]:
         '''
@@ -119,12 +152,19 @@ class Widget:
             The returned list will contain equidistant strings, each exactly as
             long as the widget's width.
         '''
-        return tuple(self._lines)
+        return tuple(
+            self._render_row(self._view[0] + i, self._view[1], self._shape[1])
+            for i in range(self._shape[0])
+        )
 
     # SETTERS
     def __call__(self, text:str, fmt_spec:str = '<') -> None:
         '''
             Sets the current state of the widget to the given text.
+
+            `fmt_spec` can take the values '<', '>', and '^' to align the lines
+            with respect to the longest line, or 'c' to center each line within
+            the widget.
         '''
         if not isinstance(text, str):
             msg = (
@@ -133,31 +173,62 @@ class Widget:
             )
             raise TypeError(msg)
 
-        rows = []
-        split_text = text.split('\n')
-        max_len = max(len(line) for line in split_text)
-        max_len = max(self._shape[1], max_len)
+        rows = text.split('\n')
+        widths = str_widths(rows)
+        max_len = max(self._shape[1], int(widths.max()))
 
+        # Alignment is stored as a per-row indent rather than as padding.
         if fmt_spec == 'c':
-            for i in split_text:
-                row = f'{i:^{self._shape[1]}}'
-                rows.append(f'{row:<{max_len}}')
+            indents = np.maximum(0, (self._shape[1] - widths) // 2)
+        elif fmt_spec == '^':
+            indents = (max_len - widths) // 2
+        elif fmt_spec == '>':
+            indents = max_len - widths
         else:
-            for i in split_text:
-                rows.append(f'{i:{fmt_spec}{max_len}}')
+            indents = None
 
         self._text = text
-        self._rows = rows
-        self._text_shape = (len(rows), max_len)
-        self._text_size = len(rows)*max_len
+        self._set_rows(rows, widths, indents)
 
-        self._view = np.zeros(2, dtype = np.int64)
+    def _set_rows(
+    self, rows:list, widths:np.ndarray = None, indents:np.ndarray = None,
+    start:int = None) -> None:
+        '''
+            Backend for `__call__`.  Replaces the widget's rows and resets the
+            view.  Rows are stored as given, without padding, along with their
+            widths and optional indents.
 
-        y_idx = np.arange(0, self._text_shape[0], 1, dtype = np.int64)
-        x_idx = np.arange(0, self._text_shape[1], 1, dtype = np.int64)
-        Y,X = np.meshgrid(y_idx, x_idx)
-        Y,X = Y[:,:,None], X[:,:,None]
-        self._text_indices = np.concatenate([X,Y], axis = 2)
+            If `start` is given, only the rows from index `start` onwards are
+            replaced, with no indents, and the view is left unchanged.
+        '''
+        if widths is None:
+            widths = str_widths(rows)
+
+        if start is None:
+            self._rows = rows
+            self._widths = widths
+            self._indents = indents
+            self._col_index = {}
+            self._view = np.zeros(2, dtype = np.int64)
+        else:
+            del self._rows[start:]
+            self._rows.extend(rows)
+            self._widths = np.concatenate([self._widths[:start], widths])
+            if self._indents is not None:
+                self._indents = np.concatenate(
+                    [self._indents[:start], np.zeros_like(widths)]
+                )
+            for i in [i for i in self._col_index if i >= start]:
+                del self._col_index[i]
+
+        extents = self._widths
+        if self._indents is not None:
+            extents = extents + self._indents
+        max_len = max(self._shape[1], int(extents.max(initial = 0)))
+
+        self._text_shape = (len(self._rows), max_len)
+        self._text_size = int(extents.sum())
+        self._dirty = True
 
     def set_view(self, y:int, x:int) -> None:
         '''
@@ -191,7 +262,9 @@ class Widget:
         '''
         y = max(0, min(y, max(0, self._text_shape[0] - self._shape[0])))
         x = max(0, min(x, max(0, self._text_shape[1] - self._shape[1])))
-        self._view = self._text_indices[y,x]
+        if y != self._view[0] or x != self._view[1]:
+            self._dirty = True
+        self._view = np.array([y, x], dtype = np.int64)
 
     def scroll_up(self, rows:int = 1) -> None:
         '''
@@ -217,43 +290,91 @@ class Widget:
         '''
         self._set_view(y = self._view[0], x = self._view[1] - cols)
 
-    # GETTERS
-    def write(self, ellipsis:bool = False):
+    def touch(self) -> None:
         '''
-            Writes the string to its designated coordinates with the view taken
-            into account.
+            Flags the widget to be rewritten on the next render, regardless of
+            whether its state has changed.
         '''
-        # Saving the cursor position
-        print('\0337', end = '')
+        self._dirty = True
 
+    def check_lims(self, y:int, x:int) -> bool:
+        '''
+            If the given terminal coordinate is within the widget limits,
+            returns True.  Returns False otherwise.
+        '''
+        return self._y0 <= y < self._y1 and self._x0 <= x < self._x1
+
+    # GETTERS
+    def render(self, ellipsis:bool = False) -> str:
+        '''
+            Returns the string that writes the widget to its designated
+            coordinates with the view taken into account, and marks the widget
+            as clean.  Rows beyond the end of the text are left blank.
+        '''
         y_start = self._view[0]
-        y_stop = self._view[0] + self._shape[0]
         x_start = self._view[1]
         x_stop = self._view[1] + self._shape[1]
 
-        for i, row_idx in enumerate(range(y_start, y_stop)):
-            textutils.cursor_to(self._y0 + i, self._x0)
-            if ellipsis:
-                row = self._rows[row_idx]
-                if row[x_stop:].strip() != '':
-                    row = row[x_start:x_stop-1] + '…'
-                else:
-                    row = row[x_start:x_stop]
-                row = (
-                    f'{self.ANSI_format}'
-                    f'{row}'
-                    f'\033[m'
-                )
-                print(row, end = '', flush = True)
+        # Saving the cursor position
+        out = ['\0337']
+
+        for i in range(self._shape[0]):
+            row_idx = y_start + i
+            if ellipsis and row_idx < len(self._rows) and \
+            self._extent(row_idx) > x_stop:
+                row = self._render_row(
+                    row_idx, x_start, self._shape[1] - 1
+                ) + '…'
             else:
-                row = (
-                    f'{self.ANSI_format}'
-                    f'{self._rows[row_idx][x_start:x_stop]}'
-                    f'\033[m'
-                )
-                print(
-                    row, end = '', flush = True
-                )
+                row = self._render_row(row_idx, x_start, self._shape[1])
+            out.append(
+                f'{textutils.cursor_str(self._y0 + i, self._x0)}'
+                f'{self.ANSI_format}{row}\033[m'
+            )
 
         # Restoring the cursor position
-        print('\0338', end = '')
+        out.append('\0338')
+
+        self._dirty = False
+        return ''.join(out)
+
+    def write(self, ellipsis:bool = False) -> None:
+        '''
+            Writes the string to its designated coordinates with the view taken
+            into account.
+        '''
+        print(self.render(ellipsis = ellipsis), end = '', flush = True)
+
+    # PRIVATE METHODS
+    def _extent(self, row_idx:int) -> int:
+        '''
+            Returns the column at which the given row ends, including indents.
+        '''
+        extent = self._widths[row_idx]
+        if self._indents is not None:
+            extent += self._indents[row_idx]
+        return int(extent)
+
+    def _render_row(self, row_idx:int, x_start:int, width:int) -> str:
+        '''
+            Returns the `width` columns of row `row_idx` that begin at column
+            `x_start`, padded with spaces.  Only the visible part of the row is
+            sliced, so the cost does not depend on the length of the row.
+        '''
+        if row_idx >= len(self._rows):
+            return ' '*width
+
+        row = self._rows[row_idx]
+        indent = 0 if self._indents is None else int(self._indents[row_idx])
+        lead = min(width, max(0, indent - x_start))
+        x_start = max(0, x_start - indent)
+
+        if self._use_index and len(row) >= self._index_min:
+            if row_idx not in self._col_index:
+                self._col_index[row_idx] = column_index(row)
+            visible = slice_indexed(
+                row, x_start, width - lead, self._col_index[row_idx]
+            )
+        else:
+            visible = slice_columns(row, x_start, width - lead)
+        return ' '*lead + visible
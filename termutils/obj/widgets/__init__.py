@@ -1,3 +1,4 @@
 from .Button import Button
 from .Display import Display
+from .Scrollback import Scrollback
 from .Widget import Widget
@@ -1,2 +1,8 @@
+from . import cache
+from . import decimate
+from . import expression
 from . import parsers
+from . import raster
 from . import text
+from . import width
+from . import wrap
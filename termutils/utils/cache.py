@@ -0,0 +1,49 @@
+'''
+    Caches bounded by the total size of what they hold rather than by the
+    number of entries, for functions of strings such as lines of text, whose
+    results take memory in proportion to their length.  A cache of a fixed
+    number of entries has no real bound when one entry can be a megabyte
+    line, while one of a fixed total size keeps many short entries and few
+    long ones.
+'''
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+import threading
+
+def sized_cache(max_size:int, size:Callable[..., int]) -> Callable:
+    '''
+        Decorator caching the results of a function by its (hashable)
+        arguments, least recently used first.  `size(result, *args)` returns
+        the size of an entry, such as the number of characters it holds, and
+        the oldest entries are forgotten once the total exceeds `max_size`.
+        Entries larger than a quarter of `max_size` are never cached.  The
+        cached function may be called from any thread.
+    '''
+    def decorator(function:Callable) -> Callable:
+        cache = OrderedDict()
+        lock = threading.Lock()
+        total = 0
+
+        @wraps(function)
+        def cached(*args):
+            nonlocal total
+            with lock:
+                entry = cache.get(args)
+                if entry is not None:
+                    cache.move_to_end(args)
+                    return entry[0]
+            result = function(*args)
+            entry_size = size(result, *args)
+            if entry_size > max_size // 4:
+                return result
+            with lock:
+                if args not in cache:
+                    cache[args] = (result, entry_size)
+                    total += entry_size
+                while total > max_size:
+                    total -= cache.popitem(last = False)[1][1]
+            return result
+
+        return cached
+    return decorator
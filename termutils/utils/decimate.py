@@ -0,0 +1,109 @@
+'''
+    Reduction of large datasets to the few points that can be told apart on
+    screen, so that plotting costs depend on the size of the plot rather than
+    on the size of the data.
+
+    `minmax` keeps the first, last, lowest and highest point of every run of
+    consecutive points that fall into the same pixel column.  A line drawn
+    through the kept points covers exactly the same pixels as one drawn through
+    every point, so the output looks the same.  `lttb` keeps a fixed number of
+    points chosen by the Largest-Triangle-Three-Buckets algorithm, which
+    preserves the shape of the data but not every extreme.
+'''
+from typing import Sequence, Tuple
+
+import numpy as np
+
+def _first_per_run(indices:np.ndarray, starts:np.ndarray) -> np.ndarray:
+    '''
+        Returns the first of the sorted `indices` in each run that begins at
+        one of the sorted `starts`.
+    '''
+    if len(indices) == 0:
+        return indices
+    runs = np.searchsorted(starts, indices, side = 'right')
+    first = np.empty(len(runs), dtype = bool)
+    first[0] = True
+    np.not_equal(runs[1:], runs[:-1], out = first[1:])
+    return indices[first]
+
+def minmax(
+x:np.ndarray, y:np.ndarray, xlim:Sequence[float],
+width:int) -> Tuple[np.ndarray]:
+    '''
+        Returns the points of (`x`, `y`) that affect how the line through them
+        looks when the x-range `xlim` spans `width` pixel columns.
+
+        The points are split into runs of consecutive points in the same
+        column, with every point left or right of `xlim` falling into a column
+        of its own, and the first, last, lowest and highest points of each run
+        are kept in their original order.  NaNs, which break the line, are kept
+        as well.  The data is returned unchanged if it has no more than four
+        points per column.
+    '''
+    n = len(x)
+    if n <= 4*width or xlim[1] <= xlim[0]:
+        return x, y
+
+    col = (x - xlim[0])*(width/(xlim[1] - xlim[0]))
+    np.floor(col, out = col)
+    np.clip(col, -1, width, out = col)
+    starts = np.flatnonzero(col[1:] != col[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    if len(starts) > n//4:
+        return x, y
+    lengths = np.diff(np.append(starts, n))
+
+    lows = np.fmin.reduceat(y, starts)
+    highs = np.fmax.reduceat(y, starts)
+    keep = [starts, starts + lengths - 1]
+    for extreme in (lows, highs):
+        indices = np.flatnonzero(y == np.repeat(extreme, lengths))
+        keep.append(_first_per_run(indices, starts))
+    keep.append(_first_per_run(np.flatnonzero(np.isnan(y)), starts))
+
+    keep = np.unique(np.concatenate(keep))
+    return x[keep], y[keep]
+
+def lttb(
+x:np.ndarray, y:np.ndarray, xlim:Sequence[float],
+n_out:int) -> Tuple[np.ndarray]:
+    '''
+        Returns `n_out` of the points of (`x`, `y`) in the x-range `xlim`
+        (and the point on each side of it), chosen with the Largest-Triangle-
+        Three-Buckets algorithm.  `x` must be sorted.
+
+        The points between the first and the last are split into `n_out - 2`
+        buckets, and from each bucket the point is kept that forms the largest
+        triangle with the point kept from the previous bucket and the mean of
+        the next one.
+    '''
+    i0 = max(int(np.searchsorted(x, xlim[0], side = 'left')) - 1, 0)
+    i1 = min(int(np.searchsorted(x, xlim[1], side = 'right')) + 1, len(x))
+    x = x[i0:i1]
+    y = y[i0:i1]
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    # Buckets b = 0, ..., n_out - 3 cover [edges[b], edges[b+1]), and the
+    # last point is a bucket of its own
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    lengths = np.diff(edges)
+    mean_x = np.add.reduceat(x, edges[:-1])/lengths
+    mean_y = np.add.reduceat(y, edges[:-1])/lengths
+
+    keep = np.empty(n_out, dtype = np.int64)
+    keep[0] = 0
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b+1]
+        area = np.abs(
+            (x[a] - mean_x[b+1])*(y[lo:hi] - y[a]) -
+            (x[a] - x[lo:hi])*(mean_y[b+1] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[b+1] = a
+    keep[-1] = n - 1
+    return x[keep], y[keep]
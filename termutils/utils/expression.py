@@ -0,0 +1,192 @@
+'''
+    Safe, cached compilation of the mathematical expressions typed into apps
+    such as LivePlot.
+
+    An expression is parsed into a Python AST once, and every node is checked
+    against a small whitelist: numbers, the named variables, arithmetic
+    operators, and calls to numpy ufuncs (written either as `np.sin(x)` or as
+    `sin(x)`).  The validated AST is compiled to a code object, and the
+    resulting callable is cached by the text of the expression, so that
+    evaluating the same expression over a new domain costs a single vectorized
+    numpy computation.
+
+    Names that are neither variables nor numpy functions or constants, such as
+    `a` in `sin(a*x)`, are the free parameters of an expression, and are found
+    with `free_variables`.
+'''
+from functools import lru_cache
+from typing import Callable, Dict, Sequence, Tuple
+import ast
+
+import numpy as np
+
+_OPERATORS = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub
+)
+
+_CONSTANTS = {'pi':np.pi, 'e':np.e, 'inf':np.inf, 'nan':np.nan}
+
+@lru_cache(maxsize = None)
+def _namespace() -> Dict[str, object]:
+    '''
+        Returns the functions and constants that expressions may refer to by
+        name, which are every numpy ufunc and a few mathematical constants.
+    '''
+    namespace = {
+        name:value for name, value in vars(np).items()
+        if isinstance(value, np.ufunc)
+    }
+    namespace.update(_CONSTANTS)
+    return namespace
+
+def _validate(node:ast.AST, variables:Sequence[str], text:str) -> None:
+    '''
+        Raises a ValueError if `node`, or any node below it, is not allowed in
+        an expression of `variables`.
+    '''
+    namespace = _namespace()
+    # Names and attributes that are only allowed as part of their parent:
+    # the ufuncs called, and `np` as the base of an attribute.  `ast.walk`
+    # visits each node before its children.
+    allowed = set()
+    for child in ast.walk(node):
+        if isinstance(child, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load)):
+            continue
+        elif isinstance(child, _OPERATORS):
+            continue
+        elif isinstance(child, ast.Constant):
+            if isinstance(child.value, (int, float)):
+                continue
+        elif isinstance(child, ast.Name):
+            if child.id in variables or child.id in _CONSTANTS:
+                continue
+            elif child in allowed:
+                continue
+        elif isinstance(child, ast.Attribute):
+            if child in allowed:
+                continue
+            base = child.value
+            if isinstance(base, ast.Name) and base.id in ('np', 'numpy'):
+                if child.attr in _CONSTANTS:
+                    allowed.add(base)
+                    continue
+        elif isinstance(child, ast.Call):
+            func = child.func
+            if isinstance(func, ast.Name) and func.id not in variables:
+                ufunc = namespace.get(func.id)
+            elif isinstance(func, ast.Attribute) and \
+                 isinstance(func.value, ast.Name) and \
+                 func.value.id in ('np', 'numpy'):
+                ufunc = namespace.get(func.attr)
+                allowed.add(func.value)
+            else:
+                ufunc = None
+            # Further positional arguments would be output arrays, which the
+            # ufunc writes to, and fewer would fail when evaluated
+            if isinstance(ufunc, np.ufunc) and not child.keywords and \
+               len(child.args) == ufunc.nin:
+                allowed.add(func)
+                continue
+        msg = (
+            f'\n\nExpression `{text}` contains `{ast.unparse(child)}`, which '
+            f'is not a number, a variable ({", ".join(variables) or "none"}), '
+            f'an arithmetic operator or a call to a numpy ufunc with one '
+            f'argument per input.'
+        )
+        raise ValueError(msg)
+
+class _Constants(ast.NodeTransformer):
+
+    '''
+        Replaces every number in an expression with a name bound to it as a
+        float64, so that arithmetic on numbers alone follows numpy's rules,
+        rather than Python's: `9**9**9**9` is inf instead of an integer too
+        large to ever compute, and `1/0` is inf instead of an error.
+    '''
+
+    def __init__(self) -> None:
+        # The numbers by name; the names cannot be typed into an expression
+        self.values = {}
+
+    def visit_Constant(self, node:ast.Constant) -> ast.Name:
+        name = f'#{len(self.values)}'
+        try:
+            self.values[name] = np.float64(node.value)
+        except OverflowError:
+            self.values[name] = np.float64(np.inf)
+        return ast.copy_location(ast.Name(id = name, ctx = ast.Load()), node)
+
+def _parse(text:str) -> ast.Expression:
+    '''
+        Parses `text` as a Python expression, raising a ValueError if it is
+        not one.
+    '''
+    try:
+        return ast.parse(text.strip(), mode = 'eval')
+    except SyntaxError as e:
+        msg = f'\n\nExpression `{text}` is not valid: {e.msg}.'
+        raise ValueError(msg) from None
+
+def free_variables(
+text:str, variables:Sequence[str] = ('x',)) -> Tuple[str]:
+    '''
+        Returns the names in `text` that are not among `variables` and are not
+        numpy functions or constants, in the order they first appear.  These
+        are the free parameters of the expression, which must be passed to
+        `compile_expression` as further variables.
+    '''
+    namespace = _namespace()
+    names = [
+        node for node in ast.walk(_parse(text)) if isinstance(node, ast.Name)
+        and node.id not in variables and node.id not in namespace
+        and node.id not in ('np', 'numpy')
+    ]
+    names.sort(key = lambda node: node.col_offset)
+    return tuple(dict.fromkeys(node.id for node in names))
+
+@lru_cache(maxsize = 256)
+def compile_expression(
+text:str, variables:Sequence[str] = ('x',)) -> Callable[..., np.ndarray]:
+    '''
+        Compiles `text` into a function of the given `variables`, which are
+        passed to it positionally as numbers or arrays.  The function returns
+        a float64 array with the shape the arguments broadcast to (or a float
+        if there are no variables), so that constant expressions such as `2`
+        still produce one value per point.
+
+        Raises a ValueError if `text` is not a valid expression.  Results are
+        cached by (text, variables).
+    '''
+    variables = tuple(variables)
+    tree = _parse(text)
+    _validate(tree, variables, text)
+    constants = _Constants()
+    tree = ast.fix_missing_locations(constants.visit(tree))
+    code = compile(tree, '<expression>', 'eval')
+
+    globals_ = dict(_namespace())
+    globals_.update(constants.values)
+    globals_['__builtins__'] = {}
+    globals_['np'] = globals_['numpy'] = np
+
+    def function(*args) -> np.ndarray:
+        if len(args) != len(variables):
+            msg = (
+                f'\n\nExpression `{text}` takes {len(variables)} arguments '
+                f'({", ".join(variables)}); got {len(args)}.'
+            )
+            raise TypeError(msg)
+        args = [np.asarray(arg, dtype = np.float64) for arg in args]
+        with np.errstate(all = 'ignore'):
+            result = eval(code, globals_, dict(zip(variables, args)))
+        result = np.asarray(result, dtype = np.float64)
+        if not args:
+            return float(result)
+        shape = np.broadcast_shapes(*(arg.shape for arg in args))
+        if result.shape != shape:
+            result = np.broadcast_to(result, shape).copy()
+        return result
+
+    function.__doc__ = f'Evaluates `{text}` as a function of {variables}.'
+    return function
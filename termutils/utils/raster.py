@@ -0,0 +1,338 @@
+'''
+    Plotting in the terminal, without a graphical window.
+
+    Lines are rasterized onto a grid of subpixels, several of which share each
+    character cell: 2x4 with Unicode braille patterns, or 1x2 with the half
+    block characters.  Every line segment is clipped to the plot and sampled
+    at subpixel spacing in a single vectorized pass, so the cost of a frame
+    depends on the size of the terminal and on the number of segments, which
+    `utils.decimate` bounds by the width of the plot.
+'''
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from termutils.utils import decimate
+
+# Subpixels per character cell, as (columns, rows)
+cell_shapes = {'braille':(2, 4), 'halfblock':(1, 2)}
+
+# The bit of a braille pattern that raises the dot on each (row, column)
+_BRAILLE_BITS = np.array(
+    [[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]], dtype = np.uint32
+)
+
+_HALFBLOCKS = np.array([' ', '▀', '▄', '█'])
+
+# Escape sequences for the colors given to successive lines
+line_colors = tuple(
+    f'\033[38;2;{r};{g};{b}m' for r, g, b in (
+        (99, 147, 237), (255, 127, 0), (142, 237, 142), (249, 127, 114),
+        (216, 112, 214), (63, 224, 209)
+    )
+)
+
+def ticks(lo:float, hi:float, n:int) -> np.ndarray:
+    '''
+        Returns up to about `n` evenly spaced round numbers (multiples of 1, 2
+        or 5 times a power of ten) between `lo` and `hi`.
+    '''
+    if not np.isfinite(lo) or not np.isfinite(hi) or hi <= lo or n < 1:
+        return np.zeros(0)
+    raw = (hi - lo)/n
+    power = 10**np.floor(np.log10(raw))
+    for factor in (1, 2, 5, 10):
+        step = factor*power
+        if step >= raw:
+            break
+    first = np.ceil(lo/step)*step
+    values = np.arange(first, hi + step*1E-9, step)
+    # Avoids labels such as `-0` and `0.30000000000000004`
+    return np.round(values/step)*step + 0.0
+
+def data_limits(x:np.ndarray, y:np.ndarray) -> Union[Tuple[Tuple], None]:
+    '''
+        Returns the range of `x` and the range of the finite values of `y`, or
+        None if there are no such values.
+    '''
+    finite = y[np.isfinite(y)]
+    if len(x) == 0 or len(finite) == 0:
+        return None
+    return (
+        (float(x.min()), float(x.max())),
+        (float(finite.min()), float(finite.max()))
+    )
+
+def autoscale(limits:Sequence[Tuple[Tuple]]) -> Union[Tuple[Tuple], None]:
+    '''
+        Returns the x and y ranges that fit every pair of ranges in `limits`
+        (see `data_limits`), with the same margins as matplotlib on y, or
+        None if `limits` is empty.  Empty ranges are widened to one unit on
+        each side.
+    '''
+    if not limits:
+        return None
+    xlim = (
+        min(limit[0][0] for limit in limits),
+        max(limit[0][1] for limit in limits)
+    )
+    ylim = (
+        min(limit[1][0] for limit in limits),
+        max(limit[1][1] for limit in limits)
+    )
+    margin = 0.05*(ylim[1] - ylim[0]) or 1
+    ylim = (ylim[0] - margin, ylim[1] + margin)
+    if xlim[1] == xlim[0]:
+        xlim = (xlim[0] - 1, xlim[1] + 1)
+    return xlim, ylim
+
+def subpixel_range(lim:Sequence[float], size:int) -> Tuple[float]:
+    '''
+        Returns the range covered by `size` subpixels whose centers span
+        `lim`, which is the range to decimate the data to (see
+        `utils.decimate.minmax`) so that its pixel columns are the subpixels.
+    '''
+    half = 0.5*(lim[1] - lim[0])/max(size - 1, 1)
+    return lim[0] - half, lim[1] + half
+
+def rasterize(
+x:np.ndarray, y:np.ndarray, xlim:Sequence[float], ylim:Sequence[float],
+width:int, height:int) -> np.ndarray:
+    '''
+        Returns a boolean array of shape (`height`, `width`) subpixels, in
+        which the line through the points (`x`, `y`) is set.  `xlim` and
+        `ylim` are the ranges covered by the array, whose first row is at the
+        top.  Points with NaN coordinates break the line.
+
+        Data with more than four points per subpixel column is first reduced
+        with `utils.decimate.minmax`, which does not change the result.
+    '''
+    grid = np.zeros((height, width), dtype = bool)
+    if len(x) == 0 or xlim[1] <= xlim[0] or ylim[1] <= ylim[0]:
+        return grid
+    if len(x) > 4*width:
+        x, y = decimate.minmax(x, y, subpixel_range(xlim, width), width)
+
+    with np.errstate(all = 'ignore'):
+        px = (np.asarray(x, dtype = np.float64) - xlim[0])*(
+            (width - 1)/(xlim[1] - xlim[0])
+        )
+        py = (ylim[1] - np.asarray(y, dtype = np.float64))*(
+            (height - 1)/(ylim[1] - ylim[0])
+        )
+    valid = np.isfinite(px) & np.isfinite(py)
+
+    # Isolated points are drawn on their own
+    inside = valid & (px > -0.5) & (px < width - 0.5)
+    inside &= (py > -0.5) & (py < height - 0.5)
+    rows = np.rint(py[inside]).astype(np.int64)
+    cols = np.rint(px[inside]).astype(np.int64)
+    grid[rows, cols] = True
+
+    joined = np.flatnonzero(valid[:-1] & valid[1:])
+    if len(joined) == 0:
+        return grid
+    ax, ay = px[joined], py[joined]
+    dx, dy = px[joined+1] - ax, py[joined+1] - ay
+
+    # Clips each segment a + t*d to the subpixel grid (Liang-Barsky)
+    t_in = np.zeros(len(joined))
+    t_out = np.ones(len(joined))
+    with np.errstate(all = 'ignore'):
+        for a, d, size in ((ax, dx, width), (ay, dy, height)):
+            t0 = (-0.5 - a)/d
+            t1 = (size - 0.5 - a)/d
+            flat = d == 0
+            within = (a[flat] > -0.5) & (a[flat] < size - 0.5)
+            t0[flat] = np.where(within, -np.inf, np.inf)
+            t1[flat] = -t0[flat]
+            np.maximum(t_in, np.minimum(t0, t1), out = t_in)
+            np.minimum(t_out, np.maximum(t0, t1), out = t_out)
+    keep = t_in < t_out
+    ax, ay, dx, dy = ax[keep], ay[keep], dx[keep], dy[keep]
+    t_in, t_out = t_in[keep], t_out[keep]
+    if len(ax) == 0:
+        return grid
+
+    # Samples each clipped segment once per subpixel along its longer axis
+    span = np.maximum(np.abs(dx), np.abs(dy))*(t_out - t_in)
+    counts = np.ceil(span).astype(np.int64) + 1
+    starts = np.cumsum(counts) - counts
+    segment = np.repeat(np.arange(len(counts)), counts)
+    k = np.arange(len(segment)) - starts[segment]
+    step = (t_out - t_in)/np.maximum(counts - 1, 1)
+    t = t_in[segment] + step[segment]*k
+    cols = np.rint(ax[segment] + dx[segment]*t).astype(np.int64)
+    rows = np.rint(ay[segment] + dy[segment]*t).astype(np.int64)
+    np.clip(cols, 0, width - 1, out = cols)
+    np.clip(rows, 0, height - 1, out = rows)
+    grid[rows, cols] = True
+    return grid
+
+def cell_codes(grid:np.ndarray, mode:str) -> np.ndarray:
+    '''
+        Returns, for each character cell of `grid`, a code whose bits are the
+        subpixels set in it.  Codes of overlapping grids can be combined with
+        a bitwise or.
+    '''
+    sub_cols, sub_rows = cell_shapes[mode]
+    rows, cols = grid.shape[0]//sub_rows, grid.shape[1]//sub_cols
+    if mode == 'braille':
+        cells = grid.reshape(rows, 4, cols, 2).astype(np.uint32)
+        return np.einsum('rycx,yx->rc', cells, _BRAILLE_BITS)
+    return grid[0::2].astype(np.uint32) + 2*grid[1::2].astype(np.uint32)
+
+def cell_chars(codes:np.ndarray, mode:str) -> np.ndarray:
+    '''
+        Returns an array of the characters that display `codes` (see
+        `cell_codes`), in which empty cells are spaces.
+    '''
+    if mode == 'braille':
+        codes = np.where(codes > 0, codes + 0x2800, ord(' ')).astype('<u4')
+        return codes.view('<U1')
+    return _HALFBLOCKS[codes]
+
+def braille(grid:np.ndarray) -> List[str]:
+    '''
+        Returns the rows of characters that display `grid`, whose shape must
+        be a multiple of (4, 2), as braille patterns.  Empty cells are spaces.
+    '''
+    chars = cell_chars(cell_codes(grid, 'braille'), 'braille')
+    return [''.join(row) for row in chars]
+
+def halfblock(grid:np.ndarray) -> List[str]:
+    '''
+        Returns the rows of characters that display `grid`, whose number of
+        rows must be even, with the half block characters.
+    '''
+    chars = cell_chars(cell_codes(grid, 'halfblock'), 'halfblock')
+    return [''.join(row) for row in chars]
+
+def render(
+series:Sequence[Tuple], xlim:Sequence[float], ylim:Sequence[float],
+rows:int, cols:int, mode:str = 'braille', title:str = '', xlabel:str = '',
+ylabel:str = '', grid:bool = False) -> List[str]:
+    '''
+        Returns `rows` lines of text, each `cols` columns wide (not counting
+        escape sequences), that display a line for each (x, y, color) tuple
+        in `series` over the ranges `xlim` and `ylim`, with axes, ticks, tick
+        labels, a title, axis labels and optionally a grid.  `mode` is
+        'braille' or 'halfblock', and each color is an escape sequence (or an
+        empty string).  Where lines cross, a cell takes the color of the last.
+    '''
+    if mode not in cell_shapes:
+        msg = (
+            f'\n\nArgument `mode` in function `render` must be one of: '
+            f'{", ".join(cell_shapes)}; got `{mode}`.'
+        )
+        raise ValueError(msg)
+    layout = plot_area(rows, cols, ylim, title, xlabel, ylabel)
+    top, left, height, width, y_ticks, y_labels = layout
+    lines = [' '*cols for i in range(rows)]
+    if height < 1 or width < 1:
+        return lines
+    pad = ' '*(cols - left - width)
+
+    sub_cols, sub_rows = cell_shapes[mode]
+    codes = np.zeros((height, width), dtype = np.uint32)
+    owner = np.full((height, width), -1)
+    for n, (x, y, color) in enumerate(series):
+        pixels = rasterize(x, y, xlim, ylim, width*sub_cols, height*sub_rows)
+        series_codes = cell_codes(pixels, mode)
+        codes |= series_codes
+        owner[series_codes > 0] = n
+    chars = cell_chars(codes, mode)
+
+    x_ticks = ticks(*xlim, max(width//12, 1))
+    x_cols = _positions(x_ticks, xlim, width, invert = False)
+    y_rows = _positions(y_ticks, ylim, height, invert = True)
+
+    if grid:
+        chars = chars.copy()
+        blank = chars == ' '
+        dots = np.zeros_like(blank)
+        dots[y_rows,:] = True
+        dots[:,x_cols] = True
+        chars[blank & dots] = '·'
+
+    colors = [color for x, y, color in series]
+    for row in range(height):
+        label = y_labels[y_rows.index(row)] if row in y_rows else ''
+        axis = '┤' if row in y_rows else '│'
+        cells = _colored(chars[row], owner[row], colors)
+        lines[top+row] = f'{label:>{left-1}}{axis}{cells}{pad}'
+
+    axis = ['─']*width
+    labels = [' ']*(width + 1)
+    last = -1
+    for value, col in zip(x_ticks, x_cols):
+        axis[col] = '┬'
+        text = f'{value:g}'
+        # Index 0 of `labels` is under the corner of the axes
+        start = min(max(col + 1 - len(text)//2, 0), width + 1 - len(text))
+        if start > last:
+            labels[start:start+len(text)] = text
+            last = start + len(text)
+    lines[top+height] = ' '*(left - 1) + '└' + ''.join(axis) + pad
+    lines[top+height+1] = ' '*(left - 1) + ''.join(labels) + pad
+
+    if title:
+        lines[0] = _centered(title, left, width) + pad
+    if xlabel:
+        lines[top+height+2] = _centered(xlabel, left, width) + pad
+    if ylabel:
+        # Written downwards in the first column, centered on the plot
+        first = top + max((height - len(ylabel))//2, 0)
+        for n, char in enumerate(ylabel[:height]):
+            lines[first+n] = char + lines[first+n][1:]
+
+    return lines
+
+def plot_area(
+rows:int, cols:int, ylim:Sequence[float], title:str = '', xlabel:str = '',
+ylabel:str = '') -> Tuple:
+    '''
+        Returns the layout used by `render`: the first row and column of the
+        plot, its height and width in cells, and the y tick values and labels.
+    '''
+    top = 1 if title else 0
+    height = rows - top - 2 - (1 if xlabel else 0)
+    y_ticks = ticks(*ylim, max(height//4, 1))
+    y_labels = [f'{value:g}' for value in y_ticks]
+    left = max((len(label) for label in y_labels), default = 0) + 1
+    if ylabel:
+        left += 2
+    width = cols - left - 1
+    return top, left, height, width, y_ticks, y_labels
+
+def _positions(
+values:np.ndarray, lim:Sequence[float], size:int, invert:bool) -> List[int]:
+    '''
+        Returns the cell, out of `size`, on which each of `values` falls
+        within the range `lim`.
+    '''
+    scaled = (values - lim[0])*((size - 1)/(lim[1] - lim[0]))
+    if invert:
+        scaled = (size - 1) - scaled
+    return [int(i) for i in np.clip(np.rint(scaled), 0, size - 1)]
+
+def _colored(chars:np.ndarray, owner:np.ndarray, colors:Sequence[str]) -> str:
+    '''
+        Returns the characters of a row joined into a string, with each run of
+        cells drawn by the same series in the color of that series.
+    '''
+    bounds = np.flatnonzero(owner[1:] != owner[:-1]) + 1
+    bounds = [0] + bounds.tolist() + [len(chars)]
+    out = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        text = ''.join(chars[start:stop])
+        color = colors[owner[start]] if owner[start] >= 0 else ''
+        out.append(f'{color}{text}\033[0m' if color else text)
+    return ''.join(out)
+
+def _centered(text:str, left:int, width:int) -> str:
+    '''
+        Returns `text` centered over a plot of `width` columns starting at
+        column `left`.
+    '''
+    return ' '*left + text[:width].center(width)
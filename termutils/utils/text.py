@@ -16,10 +16,17 @@ def norm() -> str:
     '''
     return '\033[m'
 
+def cursor_str(y:int, x:int) -> str:
+    '''
+        Returns the escape sequence that moves the cursor to the designated
+        terminal coordinates (see `cursor_to`).
+    '''
+    return f'\033[{y+1};{x+1}f'
+
 def cursor_to(y:int, x:int) -> None:
     '''
         Moves the cursor to the designated terminal coordinates.
         Uses (0,0) as the origin (top-left of the terminal) with the y-axis
         pointing downwards, and the x-axis pointing to the right.
     '''
-    print(f'\033[{y+1};{x+1}f', end = '')
+    print(cursor_str(y, x), end = '')
@@ -0,0 +1,211 @@
+'''
+    Tools for measuring the number of terminal columns occupied by text.
+
+    The width of every code point is looked up in a two-level table: the high
+    bits of a code point select a 256-entry block, and identical blocks are
+    stored only once.  Each block is built from `unicodedata` the first time
+    a character within it is measured, and kept for the lifetime of the
+    process, so that text in a single script only ever builds the few blocks
+    it uses.  Strings are measured with vectorized numpy lookups rather than
+    a Python loop over characters.
+
+    Widths are 2 for East Asian Wide and Fullwidth characters, 0 for
+    combining marks, format characters (such as zero-width joiners) and
+    control characters, and 1 otherwise.  Tabs are control characters, and
+    so have a width of 0: their width depends on the column at which they
+    are displayed, so callers must expand them (e.g. with `str.expandtabs`)
+    before measuring.
+'''
+from typing import Sequence, Tuple, Union
+import threading
+import unicodedata
+
+import numpy as np
+
+# Planes 4-13 contain no assigned characters, and plane 14 only contains
+# format characters and variation selectors below U+E1000.
+_TABLE_RANGES = ((0x0, 0x40000), (0xE0000, 0xE1000))
+_BLOCK_SIZE = 256
+_N_BLOCKS = 0x110000 // _BLOCK_SIZE
+# Marks the blocks of `_index` that have not been built yet
+_UNBUILT = 0xFFFF
+
+# The row of `_data` holding the widths of each block, the deduplicated
+# blocks, and the row of each distinct block by content.  Blocks outside of
+# `_TABLE_RANGES` all share row 0, in which every width is 1.
+_index = np.zeros(_N_BLOCKS, dtype = np.uint16)
+for _start, _stop in _TABLE_RANGES:
+    _index[_start // _BLOCK_SIZE:_stop // _BLOCK_SIZE] = _UNBUILT
+_data = np.ones((1, _BLOCK_SIZE), dtype = np.int8)
+_rows = {_data[0].tobytes():0}
+_lock = threading.Lock()
+
+def _code_point_width(char:str) -> int:
+    '''
+        Returns the width of a single character according to `unicodedata`.
+    '''
+    category = unicodedata.category(char)
+    if char == '\u00ad':
+        return 1
+    elif category in ('Mn', 'Me', 'Cf', 'Cc') or unicodedata.combining(char):
+        return 0
+    elif 0x1160 <= ord(char) <= 0x11ff:
+        # Hangul Jamo medial vowels and final consonants
+        return 0
+    elif unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+def _table(numbers:np.ndarray) -> Tuple[np.ndarray]:
+    '''
+        Builds any of the blocks `numbers` that have not been built yet.
+        Returns the row of each block in the table, and the table itself.
+    '''
+    global _data
+    rows = _index[numbers]
+    if not (rows == _UNBUILT).any():
+        return rows, _data
+    with _lock:
+        built, new = [], []
+        for number in np.unique(numbers[_index[numbers] == _UNBUILT]):
+            block_start = int(number)*_BLOCK_SIZE
+            block = bytes(
+                _code_point_width(chr(cp))
+                for cp in range(block_start, block_start + _BLOCK_SIZE)
+            )
+            if block not in _rows:
+                _rows[block] = len(_rows)
+                new.append(block)
+            built.append((number, _rows[block]))
+        # The table is grown before the index refers to its new rows, so that
+        # threads reading both without the lock never see a missing row
+        if new:
+            _data = np.vstack((
+                _data,
+                np.frombuffer(b''.join(new), dtype = np.int8)
+                .reshape(len(new), _BLOCK_SIZE)
+            ))
+        for number, row in built:
+            _index[number] = row
+    return _index[numbers], _data
+
+def char_widths(string:str) -> np.ndarray:
+    '''
+        Returns an array containing the width of each character in `string`.
+    '''
+    cps = np.frombuffer(
+        string.encode('utf-32-le', 'surrogatepass'), dtype = np.uint32
+    )
+    rows, data = _table(cps >> 8)
+    return data[rows, cps & 0xff]
+
+def str_width(string:str) -> int:
+    '''
+        Returns the number of terminal columns occupied by `string`, whose
+        tabs must already be expanded.
+    '''
+    if string.isascii() and string.isprintable():
+        return len(string)
+    return int(char_widths(string).sum())
+
+def str_widths(strings:Sequence[str]) -> np.ndarray:
+    '''
+        Returns the widths of many strings at once.  Printable ASCII strings
+        are measured by their length, and all others using a single lookup
+        over their concatenation.
+    '''
+    widths = np.fromiter(
+        (len(i) for i in strings), dtype = np.int64, count = len(strings)
+    )
+    complex_idx = [
+        n for n, i in enumerate(strings)
+        if i and not (i.isascii() and i.isprintable())
+    ]
+    if not complex_idx:
+        return widths
+    complex_strings = [strings[n] for n in complex_idx]
+    offsets = np.cumsum(widths[complex_idx]) - widths[complex_idx]
+    widths[complex_idx] = np.add.reduceat(
+        char_widths(''.join(complex_strings)), offsets, dtype = np.int64
+    )
+    return widths
+
+def truncate_to_width(string:str, width:int, ellipsis:str = '') -> str:
+    '''
+        Returns the longest prefix of `string` that fits in `width` columns.
+        If `string` has to be cut, `ellipsis` is appended to the prefix and
+        counted towards `width`.  The result may be one column narrower than
+        `width` if a wide character would otherwise be split.
+    '''
+    if str_width(string) <= width:
+        return string
+    width = max(0, width - str_width(ellipsis))
+    if string.isascii() and string.isprintable():
+        return string[:width] + ellipsis
+    stop = np.searchsorted(np.cumsum(char_widths(string)), width, 'right')
+    return string[:stop] + ellipsis
+
+def column_index(string:str) -> Union[np.ndarray, None]:
+    '''
+        Returns the column at which each character of `string` ends, which
+        maps columns to character indices via binary search.  Returns None if
+        every character is one column wide, in which case columns and
+        character indices coincide.
+    '''
+    if string.isascii() and string.isprintable():
+        return None
+    widths = char_widths(string)
+    if (widths == 1).all():
+        return None
+    return np.cumsum(widths)
+
+def slice_columns(string:str, start:int, width:int) -> str:
+    '''
+        Returns the part of `string` that is displayed in the columns
+        `start` to `start + width`, padded with spaces to exactly `width`
+        columns.  Wide characters cut by either edge are replaced by spaces.
+    '''
+    return slice_indexed(string, start, width, column_index(string))
+
+def slice_indexed(
+string:str, start:int, width:int, index:Union[np.ndarray, None]) -> str:
+    '''
+        Equivalent to `slice_columns`, using a precomputed `column_index` of
+        `string` so that the cost depends only on `width`.
+    '''
+    if index is None:
+        return f'{string[start:start+width]:<{width}s}'
+    i, j, left = column_span(index, start, width)
+    return pad_to_width(' '*left + string[i:j], width)
+
+def column_span(index:np.ndarray, start:int, width:int) -> Tuple[int]:
+    '''
+        Returns the indices (i, j) of the characters displayed whole in the
+        columns `start` to `start + width`, given the `column_index` of their
+        string, and the number of columns left blank before character i by
+        a wide character cut by the left edge.
+    '''
+    # The first character whose right edge lies beyond `start`
+    i = int(np.searchsorted(index, start, 'right'))
+    left = 0
+    prev = int(index[i-1]) if i else 0
+    if i < len(index) and prev < start:
+        # A wide character straddles the left edge
+        left = int(index[i]) - start
+        i += 1
+    j = int(np.searchsorted(index, start + width, 'right'))
+    return i, max(i, j), left
+
+def pad_to_width(string:str, width:int, fmt_spec:str = '<') -> str:
+    '''
+        Pads `string` with spaces to exactly `width` columns.  `fmt_spec` can
+        take the values '<', '>', and '^'.
+    '''
+    space = width - str_width(string)
+    if space <= 0:
+        return string
+    elif fmt_spec == '>':
+        return ' '*space + string
+    elif fmt_spec == '^':
+        return ' '*(space//2) + string + ' '*(space - space//2)
+    return string + ' '*space
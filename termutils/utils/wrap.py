@@ -0,0 +1,120 @@
+'''
+    Cached text wrapping which measures the display width of the text rather
+    than its length, so that wide characters (such as CJK ideographs or emoji)
+    and zero-width characters (such as combining marks) wrap correctly.
+'''
+from typing import Tuple
+
+import numpy as np
+
+from termutils.utils.cache import sized_cache
+from termutils.utils.width import (
+    str_width as _width, char_widths, column_index
+)
+
+def _size(result:Tuple, string:str, width:int) -> int:
+    '''
+        Returns the number of characters held by a cached entry: `string`,
+        and its result, which is a tuple of strings or of offsets (each
+        counted as one character).
+    '''
+    return len(string) + sum(
+        len(i) if isinstance(i, str) else 1 for i in result
+    )
+
+def _split_word(word:str, width:int) -> Tuple[str]:
+    '''
+        Breaks a word that is wider than `width` into pieces that fit.
+    '''
+    pieces = []
+    cum = np.cumsum(char_widths(word))
+    start = 0
+    offset = 0
+    while start < len(word):
+        stop = int(np.searchsorted(cum, offset + width, 'right'))
+        # Always take at least one character, even if it is too wide.
+        stop = max(stop, start + 1)
+        pieces.append(word[start:stop])
+        offset = int(cum[stop-1])
+        start = stop
+    return tuple(pieces)
+
+@sized_cache(2**20, _size)
+def wrap_paragraph(paragraph:str, width:int) -> Tuple[str]:
+    '''
+        Wraps a single paragraph (containing no newlines) into lines no wider
+        than `width` columns.  Consecutive whitespace is collapsed, and words
+        wider than `width` are broken.
+
+        Results are cached by (paragraph, width), so rewrapping unchanged text
+        costs a dictionary lookup, within a limit on the total length of the
+        cached paragraphs.
+    '''
+    if width <= 0:
+        msg = f'Argument `width` must be a positive integer, got {width}.'
+        raise ValueError(msg)
+
+    lines = []
+    line = []
+    line_width = 0
+    for word in paragraph.split():
+        word_width = _width(word)
+        if word_width > width:
+            if line:
+                lines.append(' '.join(line))
+            pieces = _split_word(word, width)
+            lines.extend(pieces[:-1])
+            line = [pieces[-1]]
+            line_width = _width(pieces[-1])
+        elif line and line_width + 1 + word_width > width:
+            lines.append(' '.join(line))
+            line = [word]
+            line_width = word_width
+        else:
+            line_width += word_width + (1 if line else 0)
+            line.append(word)
+    if line:
+        lines.append(' '.join(line))
+    return tuple(lines)
+
+@sized_cache(2**20, _size)
+def wrap(text:str, width:int) -> Tuple[str]:
+    '''
+        Wraps `text` into lines no wider than `width` columns, treating each
+        newline as a paragraph break.  Blank paragraphs become empty lines.
+    '''
+    lines = []
+    for paragraph in text.split('\n'):
+        lines.extend(wrap_paragraph(paragraph, width) or ('',))
+    return tuple(lines)
+
+@sized_cache(2**20, _size)
+def wrap_offsets(string:str, width:int) -> Tuple[int]:
+    '''
+        Breaks `string` (containing no newlines) into rows no wider than
+        `width` columns without altering it, as an editor displays a long line,
+        and returns the index of the first character of each row.  Rows are
+        broken between any two characters; a wide character that does not fit
+        at the end of a row is moved to the next.  An empty string occupies
+        one row.
+    '''
+    if width <= 0:
+        msg = f'Argument `width` must be a positive integer, got {width}.'
+        raise ValueError(msg)
+
+    index = column_index(string)
+    if index is None:
+        return tuple(range(0, max(len(string), 1), width))
+
+    offsets = [0]
+    start = 0
+    offset = 0
+    while True:
+        stop = int(np.searchsorted(index, offset + width, 'right'))
+        # Always take at least one character, even if it is too wide.
+        stop = max(stop, start + 1)
+        if stop >= len(string):
+            return tuple(offsets)
+        offsets.append(stop)
+        offset = int(index[stop-1])
+        start = stop